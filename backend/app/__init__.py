@@ -5,7 +5,6 @@ from authlib.integrations.flask_client import OAuth
 from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
 from flask_session import Session
-import redis
 import os
 
 # Load environment variables from a .env file
@@ -33,6 +32,59 @@ def create_app():
     # Load configuration from 'config.Config' class
     app.config.from_object('config.Config')
 
+    # Take the client address from the headers of trusted proxies (see PROXY_FIX_*)
+    from app.serving import init_proxy_fix
+    init_proxy_fix(app)
+
+    # Serialize JSON responses and request bodies with msgspec
+    from app.schemas import MsgspecJSONProvider
+    app.json = MsgspecJSONProvider(app)
+
+    # Create the shared Redis connection pool (also used by Flask-Session)
+    from app.redis_client import init_redis
+    init_redis(app)
+
+    # Read-through cache on top of the shared Redis client, with batched read counts and
+    # hit/miss counters sizing TTLs by popularity
+    from app.cache import init_cache
+    from app.cache_stats import init_cache_stats
+    init_cache_stats(app)
+    init_cache(app)
+
+    # Compress responses the client accepts compressed (cached payloads are stored precompressed)
+    from app.compression import init_compression
+    init_compression(app)
+
+    # Pub/sub listener keeping per-worker state in sync, and the JWT revocation list built on it
+    from app.pubsub import init_pubsub
+    from app.revocation import init_token_blocklist
+    init_pubsub(app)
+    init_token_blocklist(app)
+
+    # Two-tier (per-worker LRU + Redis) profile cache, invalidated over pub/sub
+    from app.profile_cache import init_profile_cache
+    init_profile_cache(app)
+
+    # Cache invalidations collected per transaction and applied in one round trip once it commits
+    from app.invalidation import init_invalidation
+    init_invalidation(app)
+
+    # Per-process cache warm-up gating readiness (GET /readyz)
+    from app.warmup import init_warmup
+    init_warmup(app)
+
+    # Bounded pool for password hashing
+    from app.passwords import init_password_hasher
+    init_password_hasher(app)
+
+    # Redis-backed rate limiter used by the `rate_limit` decorator
+    from app.rate_limit import init_rate_limiter
+    init_rate_limiter(app)
+
+    # Instrument the database connection pool so checkout waits can be reported
+    from app.metrics import TimedQueuePool
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(app.config['SQLALCHEMY_ENGINE_OPTIONS'], poolclass=TimedQueuePool)
+
     # Initialize extensions with the app
     db.init_app(app)  # Bind SQLAlchemy to the app
     migrate.init_app(app, db)  # Bind Migrate to the app and database
@@ -40,17 +92,30 @@ def create_app():
     jwt.init_app(app)  # Bind JWTManager to the app
     sess.init_app(app)  # Bind Session to the app
 
+    # Embed role claims in issued JWTs for claims-based authorization and check revoked tokens
+    from app.claims import init_jwt_callbacks
+    init_jwt_callbacks(jwt)
 
+    # Google OAuth client; credentials are read from GOOGLE_CLIENT_ID / GOOGLE_CLIENT_SECRET
+    oauth.register(
+        'google',
+        authorize_url='https://accounts.google.com/o/oauth2/v2/auth',
+        access_token_url='https://oauth2.googleapis.com/token',
+        api_base_url='https://openidconnect.googleapis.com/v1/',
+        client_kwargs={'scope': 'email profile'},
+    )
 
     # Register blueprints (modular sections of the app, each handling a specific part of the API)
     from app.routes.admin_routes import admin_blueprint
     from app.routes.article_routes import article_blueprint
     from app.routes.auth_routes import auth_blueprint
     from app.routes.user_routes import user_blueprint
+    from app.routes.warmup_routes import warmup_blueprint
 
     app.register_blueprint(admin_blueprint, url_prefix='/admin')  # Admin-related routes
     app.register_blueprint(article_blueprint, url_prefix='/articles')  # Article-related routes
     app.register_blueprint(auth_blueprint, url_prefix='/auth')  # Authentication-related routes
     app.register_blueprint(user_blueprint, url_prefix='/user')  # User-related routes
+    app.register_blueprint(warmup_blueprint)  # Readiness probe and cache warm-up command
 
     return app
@@ -0,0 +1,149 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+import msgspec
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import Article, User
+
+# Longest title the `article.title` column accepts
+MAX_TITLE_LENGTH = Article.__table__.c.title.type.length
+
+
+class ArticleImportSchema(msgspec.Struct, forbid_unknown_fields=True):
+    """
+    One NDJSON record of an article import.
+    """
+    title: str
+    content: str
+    author: Optional[str] = None  # Email of the author, defaults to the importing user
+    created_at: Optional[datetime] = None
+
+
+record_decoder = msgspec.json.Decoder(ArticleImportSchema)
+
+
+class ArticleImporter:
+    """
+    Inserts articles read from NDJSON in batches.
+
+    Each batch is a single multi-row INSERT committed on its own (which invalidates the
+    article list cache), after which `after_batch` is called once (e.g. to report progress).
+    Invalid records are skipped, and a batch rejected by the database is rolled back without
+    affecting the batches before or after it. Failures are reported with their (1-based) line numbers.
+    """
+
+    def __init__(self, default_author, allow_other_authors=False, batch_size=1000, max_errors=100, after_batch=None):
+        """
+        Args:
+            default_author (User): Author of records without an `author` email.
+            allow_other_authors (bool): Whether records may name another author than `default_author`.
+            batch_size (int): Number of articles inserted per statement and transaction.
+            max_errors (int): Maximum number of failures listed in the report (all are counted).
+            after_batch (callable): Called without arguments after each committed batch.
+        """
+        self.default_author_id = default_author.id
+        self.allow_other_authors = allow_other_authors
+        self.batch_size = batch_size
+        self.after_batch = after_batch
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self._author_ids = {default_author.email: default_author.id}
+
+    def run(self, lines):
+        """
+        Imports every record of an NDJSON stream.
+
+        Args:
+            lines (Iterable[bytes]): The NDJSON lines; blank lines are ignored.
+
+        Returns:
+            dict: The import report (see `report`).
+        """
+        batch = []  # (line number, record)
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = record_decoder.decode(line)
+            except msgspec.DecodeError as e:
+                self._fail(line_number, str(e))
+                continue
+            batch.append((line_number, record))
+            if len(batch) >= self.batch_size:
+                self._insert_batch(batch)
+                batch = []
+        if batch:
+            self._insert_batch(batch)
+        return self.report()
+
+    def report(self):
+        """
+        Returns:
+            dict: Numbers of imported and failed records, and the first `max_errors` failures.
+        """
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors}
+
+    def _fail(self, line_number, error):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "error": error})
+
+    def _resolve_authors(self, batch):
+        # One query per batch for the author emails not seen yet
+        emails = {record.author for _, record in batch if record.author and record.author not in self._author_ids}
+        if emails and self.allow_other_authors:
+            self._author_ids.update(db.session.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+
+    def _insert_batch(self, batch):
+        self._resolve_authors(batch)
+        now = datetime.utcnow()
+        rows, line_numbers = [], []
+        for line_number, record in batch:
+            error = self._validate(record)
+            if error:
+                self._fail(line_number, error)
+                continue
+            created_at = record.created_at or now
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+            rows.append({
+                "title": record.title,
+                "content": record.content,
+                "author_id": self._author_ids[record.author] if record.author else self.default_author_id,
+                "created_at": created_at,
+                "updated_at": created_at,
+            })
+            line_numbers.append(line_number)
+        if not rows:
+            return
+
+        try:
+            db.session.execute(insert(Article), rows)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            message = f"Batch rejected by the database: {e.__class__.__name__}"
+            for line_number in line_numbers:
+                self._fail(line_number, message)
+            return
+
+        self.imported += len(rows)
+        if self.after_batch:
+            self.after_batch()
+
+    def _validate(self, record):
+        if not record.title.strip() or not record.content.strip():
+            return "Title and content are required"
+        if len(record.title) > MAX_TITLE_LENGTH:
+            return f"Title is longer than {MAX_TITLE_LENGTH} characters"
+        if record.author and self._author_ids.get(record.author) != self.default_author_id:
+            if not self.allow_other_authors:
+                return "Articles can only be imported as the current user"
+            if record.author not in self._author_ids:
+                return f"Unknown author {record.author}"
+        return None
@@ -0,0 +1,320 @@
+import asyncio
+import re
+from urllib.parse import parse_qsl
+
+import redis.asyncio as aioredis
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import ExpiredSignatureError, PyJWTError
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from werkzeug.datastructures import MultiDict
+from werkzeug.http import http_date
+from werkzeug.sansio.http import is_resource_modified
+
+from app.cache import AsyncReadThroughCache, CacheEntry, make_etag
+from app.compression import best_encoding, variant_etag
+from app.models import Article, User
+from app.profile_cache import HOT_PROFILES, PROFILE_KEY
+from app.revocation import REVOKED_KEY, TOKEN_ENTRY
+from app.routes.article_routes import (
+    ARTICLE_DETAIL_KEY, ARTICLE_NAMESPACE, ARTICLES_NAMESPACE, AUTHOR_EMAIL_ONLY, HOT_ARTICLE_PAGES, HOT_ARTICLES,
+    article_detail, article_page, article_page_key, article_page_query, parse_page_args
+)
+from app.schemas import ProfileSchema, encode
+
+
+def async_database_url(config):
+    """
+    Returns the database URL of the async engine: `ASYNC_DATABASE_URL`, or the app's
+    database URL with the asyncpg driver.
+
+    Args:
+        config (Config): The app configuration.
+
+    Returns:
+        URL: The SQLAlchemy URL.
+    """
+    if config['ASYNC_DATABASE_URL']:
+        return make_url(config['ASYNC_DATABASE_URL'])
+    return make_url(config['SQLALCHEMY_DATABASE_URI']).set(drivername='postgresql+asyncpg')
+
+
+class AsyncReadApp:
+    """
+    ASGI application serving the hottest reads on asyncio, in front of the Flask app.
+
+    `GET /articles`, `GET /articles/<id>` and `GET /user/profile/<email>` are answered by
+    coroutines using SQLAlchemy's async engine (asyncpg) and `redis.asyncio`, so a request
+    waiting on Postgres or Redis holds no thread. They share the models, query builders,
+    cache keys and entry format of the Flask routes, so either side reads what the other
+    cached and both honour the same invalidations. Responses are byte-for-byte those of
+    the Flask routes, including validators, 304s and precompressed variants.
+
+    At most `ASYNC_MAX_CONCURRENCY` of these reads are processed at once; further requests
+    wait for a slot. Database work is bounded by the async pool and single-flight cache
+    rebuilds, so memory stays bounded with thousands of open requests. Every other request
+    is passed to the Flask app, run on `ASYNC_WSGI_THREADS` threads.
+    """
+
+    def __init__(self, flask_app):
+        """
+        Args:
+            flask_app (Flask): The app created by `create_app`, whose configuration, token
+                blocklist and profile cache are shared.
+        """
+        config = flask_app.config
+        self.flask_app = flask_app
+        self.config = config
+        self.wsgi = WSGIMiddleware(flask_app, workers=config['ASYNC_WSGI_THREADS'])
+
+        engine_options = config['SQLALCHEMY_ENGINE_OPTIONS']
+        self.engine = create_async_engine(
+            async_database_url(config),
+            pool_size=config['ASYNC_DB_POOL_SIZE'],
+            max_overflow=config['ASYNC_DB_MAX_OVERFLOW'],
+            pool_timeout=engine_options['pool_timeout'],
+            pool_recycle=engine_options['pool_recycle'],
+            pool_pre_ping=engine_options['pool_pre_ping'],
+            connect_args={'server_settings': {'statement_timeout': str(config['DB_STATEMENT_TIMEOUT_MS'])}},
+        )
+        self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        self.redis = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool.from_url(
+            config['REDIS_URL'],
+            max_connections=config['ASYNC_REDIS_MAX_CONNECTIONS'],
+            timeout=config['REDIS_POOL_TIMEOUT'],
+            socket_timeout=config['REDIS_SOCKET_TIMEOUT'],
+            socket_connect_timeout=config['REDIS_SOCKET_CONNECT_TIMEOUT'],
+            socket_keepalive=True,
+            health_check_interval=config['REDIS_HEALTH_CHECK_INTERVAL'],
+        ))
+        self.cache = AsyncReadThroughCache(
+            self.redis,
+            ttl=config['CACHE_TTL'],
+            stale_ttl=config['CACHE_STALE_TTL'],
+            lock_timeout=config['CACHE_LOCK_TIMEOUT'],
+            wait_timeout=config['CACHE_WAIT_TIMEOUT'],
+            compress_min_size=config['COMPRESS_MIN_SIZE'],
+            stats=flask_app.extensions['cache_stats'],
+            refresh_ahead=config['CACHE_REFRESH_AHEAD'],
+            refresh_min_reads=config['CACHE_REFRESH_MIN_READS'],
+            logger=flask_app.logger,
+        )
+        self.profile_cache = flask_app.extensions['profile_cache']
+        self.token_blocklist = flask_app.extensions['token_blocklist']
+        self._slots = None  # Created on the server's event loop
+
+        self.routes = [
+            (re.compile(r'/articles'), self.get_articles),
+            (re.compile(r'/articles/(\d+)'), self.get_article),
+            (re.compile(r'/user/profile/([^/]+)'), self.get_profile),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    if self._slots is None:
+                        self._slots = asyncio.Semaphore(self.config['ASYNC_MAX_CONCURRENCY'])
+                    async with self._slots:
+                        await handler(Request(scope), send, *match.groups())
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def aclose(self):
+        """
+        Closes the async database and Redis pools.
+        """
+        await self.engine.dispose()
+        await self.redis.connection_pool.disconnect()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def get_articles(self, request, send):
+        """
+        Async counterpart of `article_routes.get_articles`.
+        """
+        try:
+            limit, fields, cursor, position = parse_page_args(request.args, self.config)
+        except ValueError as e:
+            await send_json(send, 400, {'error': str(e)})
+            return
+
+        async def build():
+            async with self.sessionmaker() as session:
+                articles = (await session.execute(article_page_query(fields, position, limit))).scalars().all()
+            return article_page(articles, fields, limit)
+
+        page_key = article_page_key(cursor, limit, fields)
+        track = (HOT_ARTICLE_PAGES, page_key) if cursor is None else None
+        entry = await self.cache.get_entry(ARTICLES_NAMESPACE, page_key, build, encoding=request.encoding, track=track)
+        await send_conditional(send, request, entry.body, entry.etag, entry.last_modified, entry.encoding)
+
+    async def get_article(self, request, send, article_id):
+        """
+        Async counterpart of `article_routes.get_article`.
+        """
+        article_id = int(article_id)
+
+        async def build():
+            async with self.sessionmaker() as session:
+                article = await session.get(Article, article_id, options=[AUTHOR_EMAIL_ONLY])
+            if article is None:
+                raise LookupError(article_id)
+            return article_detail(article)
+
+        try:
+            entry = await self.cache.get_entry(
+                ARTICLE_NAMESPACE.format(article_id=article_id), ARTICLE_DETAIL_KEY, build,
+                encoding=request.encoding, track=(HOT_ARTICLES, article_id))
+        except LookupError:
+            await send_json(send, 404, {'error': 'Article not found'})
+            return
+        await send_conditional(send, request, entry.body, entry.etag, entry.last_modified, entry.encoding)
+
+    async def get_profile(self, request, send, email):
+        """
+        Async counterpart of `user_routes.get_profile` (requires a valid access token).
+        """
+        error = await self._authenticate(request)
+        if error:
+            await send_json(send, *error)
+            return
+
+        entry = self.profile_cache.get_local(email)
+        if entry is None:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(PROFILE_KEY.format(email=email))
+                self.cache.stats.queue_read(pipe, HOT_PROFILES, email)
+                body, reads = (await pipe.execute())[:2]
+            if body is None:
+                self.profile_cache.record('misses')
+                async with self.sessionmaker() as session:
+                    user = (await session.execute(select(User).where(User.email == email))).scalars().first()
+                if user is None:
+                    await send_json(send, 404, {'error': 'User not found'})
+                    return
+                body = encode(ProfileSchema(email=user.email, role=user.role))
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    ttl = self.profile_cache.ttl_for(reads)
+                    self.profile_cache.queue_set(pipe, email, body, user.role_version, ttl)
+                    stored = (await pipe.execute())[0]
+            else:
+                self.profile_cache.record('hits')
+                stored = True
+            # A profile built from a role version invalidated meanwhile is served but not cached
+            entry = self.profile_cache.set_local(email, body) if stored else CacheEntry(body, make_etag(body), None)
+        else:
+            self.profile_cache.record('hits')
+        await send_conditional(send, request, entry.body, entry.etag)
+
+    async def _authenticate(self, request):
+        # Same checks and error responses as `jwt_required()` with the app's blocklist loader
+        authorization = request.headers.get('authorization', '')
+        if not authorization.startswith('Bearer '):
+            return 401, {'msg': 'Missing Authorization Header'}
+        try:
+            with self.flask_app.app_context():
+                claims = decode_token(authorization[len('Bearer '):])
+        except ExpiredSignatureError:
+            return 401, {'msg': 'Token has expired'}
+        except (PyJWTError, JWTExtendedException) as e:
+            return 422, {'msg': str(e)}
+        if claims.get('type') != 'access':
+            return 422, {'msg': 'Only non-refresh tokens are allowed'}
+        entry = TOKEN_ENTRY.format(jti=claims['jti'])
+        if self.token_blocklist.might_be_revoked(entry) and await self.redis.exists(REVOKED_KEY.format(entry=entry)):
+            return 401, {'msg': 'Token has been revoked'}
+        return None
+
+
+class Request:
+    """
+    The parts of an ASGI HTTP request the async routes use.
+    """
+
+    def __init__(self, scope):
+        self.headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        self.args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+        self.encoding = best_encoding(self.headers.get('accept-encoding'))
+
+
+async def send_response(send, status, headers, body=b''):
+    """
+    Sends a complete response.
+
+    Args:
+        send (callable): The ASGI send channel.
+        status (int): The HTTP status code.
+        headers (list): (name, value) string pairs.
+        body (bytes): The body.
+    """
+    headers = headers + [('content-length', str(len(body)))]
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_json(send, status, value):
+    """
+    Sends a JSON document, e.g. an error.
+    """
+    await send_response(send, status, [('content-type', 'application/json')], encode(value))
+
+
+async def send_conditional(send, request, body, etag, last_modified=None, encoding=None):
+    """
+    Async counterpart of `schemas.conditional_json_response`: sends an encoded JSON body
+    with its validators, or an empty 304 when the client's copy is current.
+    """
+    etag = variant_etag(etag, encoding)
+    headers = [('etag', etag), ('vary', 'Accept-Encoding'), ('cache-control', 'no-cache')]
+    if last_modified is not None:
+        headers.append(('last-modified', http_date(last_modified)))
+    modified = is_resource_modified(
+        http_if_modified_since=request.headers.get('if-modified-since'),
+        http_if_none_match=request.headers.get('if-none-match'),
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if not modified:
+        await send_response(send, 304, headers)
+        return
+    headers.append(('content-type', 'application/json'))
+    if encoding:
+        headers.append(('content-encoding', encoding))
+    await send_response(send, 200, headers, body)
+
+
+def create_asgi_app(flask_app=None):
+    """
+    Creates the ASGI application, around a new Flask app unless one is given.
+
+    Args:
+        flask_app (Flask): The Flask app to serve the other routes.
+
+    Returns:
+        AsyncReadApp: The ASGI application.
+    """
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app()
+    return AsyncReadApp(flask_app)
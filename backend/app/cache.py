@@ -0,0 +1,692 @@
+import asyncio
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+import redis
+from flask import current_app, has_app_context
+
+from app.compression import compress_variants
+from app.schemas import encode
+
+# A cached payload with its validators: `etag` is a strong ETag (quoted content hash of the
+# uncompressed payload), `last_modified` an aware UTC datetime or None for entries stored
+# without one, and `encoding` the content coding `body` is compressed with (None for identity)
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'last_modified', 'encoding'], defaults=(None,))
+
+# Reads an entry's metadata and the body in the preferred content coding in one round trip,
+# falling back to the uncompressed body when that variant was not stored.
+# KEYS[1] = entry hash, ARGV[1] = content coding ('' for identity)
+# Returns {fresh_until, etag, last_modified, body, encoding, ttl}, or nil for a missing entry
+READ_ENTRY_SCRIPT = """
+local meta = redis.call('HMGET', KEYS[1], 'fresh_until', 'etag', 'last_modified', 'ttl')
+if not meta[1] then
+    return nil
+end
+local encoding = ARGV[1]
+local body = false
+if encoding ~= '' then
+    body = redis.call('HGET', KEYS[1], encoding)
+end
+if not body then
+    encoding = ''
+    body = redis.call('HGET', KEYS[1], 'body')
+end
+return {meta[1], meta[2], meta[3], body, encoding, meta[4]}
+"""
+
+# Builders may return a CacheValue to set the entry's Last-Modified (e.g. the row's
+# `updated_at`); otherwise the entry is stamped with its build time
+CacheValue = namedtuple('CacheValue', ['value', 'last_modified'])
+
+# Redis keys: a namespace's generation counter, the entries of its current generation and
+# their rebuild locks
+GENERATION_KEY = '{namespace}:gen'
+ENTRY_KEY = '{namespace}:v{generation}:{key}'
+LOCK_KEY = '{entry_key}:lock'
+
+# Sorted set counting the recent reads of each entry of a family (article pages, articles,
+# profiles), used to size TTLs (see app/cache_stats.py) and rank warm-ups (see app/warmup.py)
+HOT_KEY = 'hot:{family}'
+
+
+def make_etag(body):
+    """
+    Returns the strong ETag of an encoded payload.
+
+    Args:
+        body (bytes): The payload.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def build_entry(value):
+    """
+    Encodes a builder's result into a cache entry with its validators.
+
+    Args:
+        value: The value to cache, optionally wrapped in a `CacheValue`.
+
+    Returns:
+        CacheEntry: The uncompressed entry.
+    """
+    if isinstance(value, CacheValue):
+        value, last_modified = value
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)  # Naive columns hold UTC
+    else:
+        last_modified = datetime.now(timezone.utc)
+    body = encode(value)
+    return CacheEntry(body, make_etag(body), last_modified)
+
+
+def entry_fields(entry, ttl, variants):
+    """
+    Returns the fields of the Redis hash storing an entry.
+
+    Args:
+        entry (CacheEntry): The uncompressed entry.
+        ttl (int): Seconds the entry is fresh.
+        variants (dict): Compressed bodies by content coding.
+
+    Returns:
+        dict: The hash fields.
+    """
+    return {
+        'body': entry.body,
+        'etag': entry.etag,
+        'last_modified': entry.last_modified.timestamp(),
+        'fresh_until': time.time() + ttl,
+        'ttl': ttl,
+        **variants,
+    }
+
+
+def parse_entry(fields):
+    """
+    Parses the reply of `READ_ENTRY_SCRIPT`.
+
+    Returns:
+        tuple: The time until which the entry is fresh, the seconds it was stored fresh
+        for (0 if unknown) and the `CacheEntry`, or (0, 0, None) for a missing entry.
+    """
+    if not fields:
+        return 0, 0, None
+    fresh_until, etag, last_modified, body, encoding, ttl = fields
+    ttl = float(ttl) if ttl else 0
+    if etag is None:
+        # Stored before validators were kept alongside the body
+        return float(fresh_until), ttl, CacheEntry(body, make_etag(body), None)
+    last_modified = datetime.fromtimestamp(float(last_modified), timezone.utc)
+    return float(fresh_until), ttl, CacheEntry(body, etag.decode(), last_modified, encoding.decode() or None)
+
+
+def refresh_due(remaining, fresh_for, reads, refresh_ahead, min_reads):
+    """
+    Tells whether a fresh entry should be refreshed ahead of going stale.
+
+    Args:
+        remaining (float): Seconds the entry stays fresh.
+        fresh_for (float): Seconds the entry was stored fresh for (0 if unknown).
+        reads (float): Recent reads of the entry, or None.
+        refresh_ahead (float): Fraction of the freshness in which hot entries are refreshed.
+        min_reads (float): Recent reads making an entry hot.
+
+    Returns:
+        bool: True for a hot entry in the last `refresh_ahead` of its freshness.
+    """
+    return refresh_ahead > 0 and (reads or 0) >= min_reads and remaining < fresh_for * refresh_ahead
+
+
+class ReadThroughCache:
+    """
+    Read-through Redis cache with generation keys, single-flight rebuilds and
+    stale-while-revalidate.
+
+    Entries live under versioned keys (`{namespace}:v{generation}:{key}`). Writers call
+    `bump` to move a namespace to a new generation instead of deleting keys, so old
+    entries simply age out. Each entry is a Redis hash holding the encoded body, its ETag
+    and Last-Modified time (so conditional requests are answered without the body being
+    rebuilt or re-hashed), precompressed variants of bodies of at least `compress_min_size`
+    bytes (so compressed responses cost no compression per request) and the time until
+    which it is considered fresh:
+
+    - Fresh entry: returned as is.
+    - Stale entry (past `ttl` but within `stale_ttl`): returned as is while a single
+      caller, holding the rebuild lock, refreshes it.
+    - Missing entry: one caller takes the lock and rebuilds it; concurrent callers wait
+      for that result instead of querying the database themselves.
+
+    Reads of tracked entries (see `get_entry`) are counted by `stats`, which sizes their
+    TTL by popularity. A hot entry (at least `refresh_min_reads` recent reads) read in
+    the last `refresh_ahead` fraction of its freshness is rebuilt on a background thread
+    while readers keep getting the current one, so it never goes stale.
+    """
+
+    def __init__(self, redis_client, ttl=3600, stale_ttl=300, lock_timeout=10, wait_timeout=5, poll_interval=0.02,
+                 compress_min_size=0, stats=None, refresh_ahead=0.0, refresh_min_reads=10, refresh_threads=2,
+                 logger=None):
+        """
+        Args:
+            redis_client (Redis): Client used for all cache operations.
+            ttl (int): Seconds an untracked entry is served as fresh.
+            stale_ttl (int): Extra seconds a stale entry may be served while it is rebuilt.
+            lock_timeout (float): Seconds after which an abandoned rebuild lock expires.
+            wait_timeout (float): Seconds a caller waits for another caller's rebuild
+                before building the value itself.
+            poll_interval (float): Seconds between checks while waiting for a rebuild.
+            compress_min_size (int): Bodies of at least this many bytes are also stored
+                compressed with every supported coding; 0 disables precompression.
+            stats (CacheStats): Counts reads and outcomes of tracked entries and sizes
+                their TTLs; without it, tracking is ignored.
+            refresh_ahead (float): Fraction of a hot entry's freshness, before it goes
+                stale, in which a read refreshes it in the background; 0 disables it.
+            refresh_min_reads (float): Recent reads making an entry hot.
+            refresh_threads (int): Threads running background refreshes.
+            logger (Logger): Logger for failed background refreshes.
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.compress_min_size = compress_min_size
+        self.stats = stats
+        self.refresh_ahead = refresh_ahead
+        self.refresh_min_reads = refresh_min_reads
+        self.refresh_threads = refresh_threads
+        self.logger = logger
+        self._read_entry = redis_client.register_script(READ_ENTRY_SCRIPT)
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_threads, thread_name_prefix='cache-refresh')
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def generation(self, namespace):
+        """
+        Returns the current generation of a namespace (0 if it was never bumped).
+        """
+        generation = self.redis.get(GENERATION_KEY.format(namespace=namespace))
+        return int(generation) if generation else 0
+
+    def bump(self, namespace):
+        """
+        Invalidates every entry of a namespace by moving it to a new generation.
+        """
+        return self.redis.incr(GENERATION_KEY.format(namespace=namespace))
+
+    def entry_key(self, namespace, key):
+        """
+        Returns the Redis key of an entry in the namespace's current generation.
+        """
+        return ENTRY_KEY.format(namespace=namespace, generation=self.generation(namespace), key=key)
+
+    def get_or_build(self, namespace, key, builder, ttl=None):
+        """
+        Returns the encoded entry for `key`, building it with `builder` on a miss.
+
+        Args:
+            namespace (str): Invalidation namespace of the entry (see `bump`).
+            key (str): Key of the entry within the namespace.
+            builder (callable): Returns the value to cache (a msgspec Struct or any
+                JSON-serializable value, optionally wrapped in a `CacheValue`). Exceptions
+                (e.g. a 404 abort) propagate and nothing is cached.
+            ttl (int): Seconds the entry is served as fresh, if not the cache's `ttl`.
+
+        Returns:
+            bytes: The JSON-encoded value.
+        """
+        return self.get_entry(namespace, key, builder, ttl).body
+
+    def get_entry(self, namespace, key, builder, ttl=None, encoding=None, track=None):
+        """
+        Like `get_or_build`, but returns the entry with its ETag and Last-Modified time.
+
+        Args:
+            encoding (str): Preferred content coding of the returned body ('gzip', 'br'),
+                or None for the uncompressed body.
+            track (tuple): (family, member) of the entry's read count (see `HOT_KEY`).
+                Tracked entries have adaptive TTLs unless `ttl` is given, are refreshed
+                ahead when hot, and their outcomes are counted per family.
+
+        Returns:
+            CacheEntry: The cached entry; its body is only compressed if a variant in the
+            preferred coding exists.
+        """
+        if not self.stats:
+            track = None
+        entry_key, reads = self._tracked_entry_key(namespace, key, track)
+        if track and ttl is None:
+            ttl = self.stats.ttl(reads)
+        fresh_until, fresh_for, entry = self._read(entry_key, encoding)
+
+        if entry:
+            remaining = fresh_until - time.time()
+            if remaining > 0:
+                if track and refresh_due(remaining, fresh_for, reads, self.refresh_ahead, self.refresh_min_reads):
+                    self._refresh(entry_key, builder, ttl, track[0])
+                self._record(track, 'hits')
+                return entry
+            # Stale: refresh it if nobody else is, otherwise serve the stale body
+            lock = self._acquire_lock(entry_key)
+            if not lock:
+                self._record(track, 'stale')
+                return entry
+            self._record(track, 'misses')
+            try:
+                return self._build(entry_key, builder, ttl, encoding)
+            finally:
+                self._release_lock(entry_key, lock)
+
+        self._record(track, 'misses')
+        while True:
+            lock = self._acquire_lock(entry_key)
+            if lock:
+                try:
+                    return self._build(entry_key, builder, ttl, encoding)
+                finally:
+                    self._release_lock(entry_key, lock)
+
+            entry = self._wait_for_rebuild(entry_key, encoding)
+            if entry is not None:
+                return entry
+            if self.redis.exists(LOCK_KEY.format(entry_key=entry_key)):
+                # The rebuild is taking longer than we are willing to wait
+                return self._build(entry_key, builder, ttl, encoding)
+            # The lock holder failed without storing a value, try to take over
+
+    def shutdown(self, wait=True):
+        """
+        Stops the background refreshes, after the running ones (which hold rebuild locks).
+
+        Args:
+            wait (bool): Whether to block until they are done.
+        """
+        self._refresher.shutdown(wait=wait)
+
+    def _tracked_entry_key(self, namespace, key, track):
+        # Returns the entry key and the entry's recent reads (None if untracked)
+        if not track:
+            return self.entry_key(namespace, key), None
+        family, member = track
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(GENERATION_KEY.format(namespace=namespace))
+        self.stats.queue_read(pipe, family, member)
+        generation, reads = pipe.execute()[:2]
+        return ENTRY_KEY.format(namespace=namespace, generation=int(generation) if generation else 0, key=key), reads
+
+    def _refresh(self, entry_key, builder, ttl, family):
+        # Rebuilds a fresh entry in the background, unless someone already is
+        lock = self._acquire_lock(entry_key)
+        if not lock:
+            return
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def refresh():
+            try:
+                with app.app_context() if app else nullcontext():
+                    self._build(entry_key, builder, ttl)
+            except Exception:
+                if self.logger:
+                    self.logger.exception("Background refresh of %s failed", entry_key)
+            finally:
+                self._release_lock(entry_key, lock)
+
+        try:
+            self._refresher.submit(refresh)
+        except RuntimeError:
+            # Shutting down; the entry goes stale and is rebuilt by a reader
+            self._release_lock(entry_key, lock)
+            return
+        self.stats.record(family, 'refreshes')
+
+    def _record(self, track, outcome):
+        if track:
+            self.stats.record(track[0], outcome)
+
+    def _reset_after_fork(self):
+        # Pool threads are not copied into the child
+        self._refresher = ThreadPoolExecutor(max_workers=self.refresh_threads, thread_name_prefix='cache-refresh')
+
+    def _read(self, entry_key, encoding):
+        return parse_entry(self._read_entry(keys=[entry_key], args=[encoding or '']))
+
+    def _build(self, entry_key, builder, ttl=None, encoding=None):
+        entry = build_entry(builder())
+        variants = self.compress(entry)
+        self.store(entry_key, entry, ttl, variants)
+        if encoding in variants:
+            return entry._replace(body=variants[encoding], encoding=encoding)
+        return entry
+
+    def compress(self, entry):
+        """
+        Returns the compressed variants of an entry's body worth storing (see `compress_min_size`).
+        """
+        return compress_variants(entry.body, self.compress_min_size)
+
+    def store(self, entry_key, entry, ttl=None, variants=None):
+        """
+        Writes an entry, fresh for `ttl` seconds (the cache's `ttl` by default) and kept
+        for `stale_ttl` more.
+
+        Args:
+            entry_key (str): The versioned key (see `entry_key`).
+            entry (CacheEntry): The entry, with its uncompressed body.
+            ttl (int): Seconds the entry is fresh.
+            variants (dict): Compressed bodies by content coding.
+        """
+        self.store_many([(entry_key, entry, variants, ttl)])
+
+    def store_many(self, entries):
+        """
+        Writes several entries in a single round trip (see `store`).
+
+        Args:
+            entries (Iterable[tuple]): (entry_key, entry, variants, ttl) of each entry.
+        """
+        pipe = self.redis.pipeline()
+        for entry_key, entry, variants, ttl in entries:
+            ttl = ttl or self.ttl
+            pipe.delete(entry_key)  # Drop variants of the previous body
+            pipe.hset(entry_key, mapping=entry_fields(entry, ttl, variants or {}))
+            pipe.expire(entry_key, int(ttl + self.stale_ttl))
+        pipe.execute()
+
+    def _acquire_lock(self, entry_key):
+        token = uuid.uuid4().hex
+        if self.redis.set(LOCK_KEY.format(entry_key=entry_key), token, nx=True, px=int(self.lock_timeout * 1000)):
+            return token
+        return None
+
+    def _release_lock(self, entry_key, token):
+        # Only delete the lock if it is still ours (it may have expired and been re-taken)
+        lock_key = LOCK_KEY.format(entry_key=entry_key)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(lock_key)
+                if pipe.get(lock_key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+            except redis.WatchError:
+                # Another client touched the lock in between; it will expire on its own
+                pass
+
+    def _wait_for_rebuild(self, entry_key, encoding=None):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self._read(entry_key, encoding)[2]
+            if entry is not None:
+                return entry
+            if not self.redis.exists(LOCK_KEY.format(entry_key=entry_key)):
+                return self._read(entry_key, encoding)[2]
+        return None
+
+
+class AsyncReadThroughCache:
+    """
+    asyncio counterpart of `ReadThroughCache` for `redis.asyncio` clients, used by the
+    async read path (see app/asgi.py).
+
+    Entries, generations and locks use the same keys and hash layout as `ReadThroughCache`,
+    so both read and rebuild the same entries, and a `bump` by either invalidates them for
+    both. Builders are coroutine functions, and hot entries are refreshed ahead in tasks.
+    """
+
+    def __init__(self, redis_client, ttl=3600, stale_ttl=300, lock_timeout=10, wait_timeout=5, poll_interval=0.02,
+                 compress_min_size=0, stats=None, refresh_ahead=0.0, refresh_min_reads=10, logger=None):
+        """
+        Args:
+            redis_client (redis.asyncio.Redis): Client used for all cache operations.
+
+        See `ReadThroughCache` for the other arguments.
+        """
+        self.redis = redis_client
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.compress_min_size = compress_min_size
+        self.stats = stats
+        self.refresh_ahead = refresh_ahead
+        self.refresh_min_reads = refresh_min_reads
+        self.logger = logger
+        self._read_entry = redis_client.register_script(READ_ENTRY_SCRIPT)
+        self._refreshes = set()  # Running refresh tasks, referenced until they finish
+
+    async def entry_key(self, namespace, key, track=None):
+        """
+        Returns the Redis key of an entry in the namespace's current generation and, for a
+        tracked entry (see `ReadThroughCache.get_entry`), its recent reads, counting the
+        read in the same round trip.
+
+        Returns:
+            tuple: The entry key and the recent reads (None if untracked).
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(GENERATION_KEY.format(namespace=namespace))
+            if track:
+                self.stats.queue_read(pipe, *track)
+            replies = await pipe.execute()
+        generation, reads = replies[0], replies[1] if track else None
+        return ENTRY_KEY.format(namespace=namespace, generation=int(generation) if generation else 0, key=key), reads
+
+    async def get_entry(self, namespace, key, builder, ttl=None, encoding=None, track=None):
+        """
+        Returns the entry for `key`, awaiting `builder()` to build it on a miss.
+
+        See `ReadThroughCache.get_entry`.
+        """
+        if not self.stats:
+            track = None
+        entry_key, reads = await self.entry_key(namespace, key, track)
+        if track and ttl is None:
+            ttl = self.stats.ttl(reads)
+        fresh_until, fresh_for, entry = await self._read(entry_key, encoding)
+
+        if entry:
+            remaining = fresh_until - time.time()
+            if remaining > 0:
+                if track and refresh_due(remaining, fresh_for, reads, self.refresh_ahead, self.refresh_min_reads):
+                    await self._refresh(entry_key, builder, ttl, track[0])
+                self._record(track, 'hits')
+                return entry
+            lock = await self._acquire_lock(entry_key)
+            if not lock:
+                self._record(track, 'stale')
+                return entry
+            self._record(track, 'misses')
+            try:
+                return await self._build(entry_key, builder, ttl, encoding)
+            finally:
+                await self._release_lock(entry_key, lock)
+
+        self._record(track, 'misses')
+        while True:
+            lock = await self._acquire_lock(entry_key)
+            if lock:
+                try:
+                    return await self._build(entry_key, builder, ttl, encoding)
+                finally:
+                    await self._release_lock(entry_key, lock)
+
+            entry = await self._wait_for_rebuild(entry_key, encoding)
+            if entry is not None:
+                return entry
+            if await self.redis.exists(LOCK_KEY.format(entry_key=entry_key)):
+                return await self._build(entry_key, builder, ttl, encoding)
+
+    async def _read(self, entry_key, encoding):
+        return parse_entry(await self._read_entry(keys=[entry_key], args=[encoding or '']))
+
+    async def _build(self, entry_key, builder, ttl=None, encoding=None):
+        entry = build_entry(await builder())
+        variants = compress_variants(entry.body, self.compress_min_size)
+        ttl = ttl or self.ttl
+        async with self.redis.pipeline() as pipe:
+            pipe.delete(entry_key)
+            pipe.hset(entry_key, mapping=entry_fields(entry, ttl, variants))
+            pipe.expire(entry_key, int(ttl + self.stale_ttl))
+            await pipe.execute()
+        if encoding in variants:
+            return entry._replace(body=variants[encoding], encoding=encoding)
+        return entry
+
+    async def _refresh(self, entry_key, builder, ttl, family):
+        lock = await self._acquire_lock(entry_key)
+        if not lock:
+            return
+
+        async def refresh():
+            try:
+                await self._build(entry_key, builder, ttl)
+            except Exception:
+                if self.logger:
+                    self.logger.exception("Background refresh of %s failed", entry_key)
+            finally:
+                await self._release_lock(entry_key, lock)
+
+        task = asyncio.create_task(refresh())
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+        self.stats.record(family, 'refreshes')
+
+    def _record(self, track, outcome):
+        if track:
+            self.stats.record(track[0], outcome)
+
+    async def _acquire_lock(self, entry_key):
+        token = uuid.uuid4().hex
+        if await self.redis.set(LOCK_KEY.format(entry_key=entry_key), token, nx=True,
+                                px=int(self.lock_timeout * 1000)):
+            return token
+        return None
+
+    async def _release_lock(self, entry_key, token):
+        lock_key = LOCK_KEY.format(entry_key=entry_key)
+        async with self.redis.pipeline() as pipe:
+            try:
+                await pipe.watch(lock_key)
+                if await pipe.get(lock_key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    await pipe.execute()
+            except redis.WatchError:
+                pass
+
+    async def _wait_for_rebuild(self, entry_key, encoding=None):
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            entry = (await self._read(entry_key, encoding))[2]
+            if entry is not None:
+                return entry
+            if not await self.redis.exists(LOCK_KEY.format(entry_key=entry_key)):
+                return (await self._read(entry_key, encoding))[2]
+        return None
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire `ttl` seconds after being stored.
+
+    Meant as a per-worker tier in front of Redis for small, hot values; entries must be
+    invalidated explicitly (e.g. over pub/sub) when they can change before expiring.
+    """
+
+    def __init__(self, maxsize=10000, ttl=30):
+        """
+        Args:
+            maxsize (int): Maximum number of entries; the least recently used are evicted first.
+            ttl (float): Seconds an entry is kept.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (monotonic expiry, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the value stored under `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries beyond `maxsize`.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Removes an entry if present.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def init_cache(app):
+    """
+    Creates the app's read-through cache on top of the shared Redis client, with the
+    app's cache statistics (see `init_cache_stats`).
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['cache'] = ReadThroughCache(
+        app.extensions['redis'],
+        ttl=app.config['CACHE_TTL'],
+        stale_ttl=app.config['CACHE_STALE_TTL'],
+        lock_timeout=app.config['CACHE_LOCK_TIMEOUT'],
+        wait_timeout=app.config['CACHE_WAIT_TIMEOUT'],
+        compress_min_size=app.config['COMPRESS_MIN_SIZE'],
+        stats=app.extensions['cache_stats'],
+        refresh_ahead=app.config['CACHE_REFRESH_AHEAD'],
+        refresh_min_reads=app.config['CACHE_REFRESH_MIN_READS'],
+        refresh_threads=app.config['CACHE_REFRESH_THREADS'],
+        logger=app.logger,
+    )
+
+
+def get_cache():
+    """
+    Returns the read-through cache of the current Flask app.
+
+    Returns:
+        ReadThroughCache: The app's cache.
+    """
+    return current_app.extensions['cache']
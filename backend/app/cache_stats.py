@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from collections import Counter
+
+from flask import current_app
+
+from app.cache import HOT_KEY
+
+# Redis hash of the deployment-wide cache outcome counters, one `{family}:{outcome}` field each
+CACHE_STATS_KEY = 'cache:stats'
+
+# Set while a family's read counts were aged recently, so that they are aged at most once
+# per decay interval across all workers
+HOT_DECAY_KEY = 'hot:{family}:decayed'
+
+# Ages a family's read counts unless they were aged within the interval: halves every count
+# (so recent popularity dominates), drops members read less than once since and keeps the
+# most read ones only.
+# KEYS[1] = read counts, KEYS[2] = decay marker, ARGV[1] = interval, ARGV[2] = members kept
+DECAY_SCRIPT = """
+if not redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[1]) then
+    return 0
+end
+redis.call('ZUNIONSTORE', KEYS[1], 1, KEYS[1], 'WEIGHTS', 0.5)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(0.5')
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -tonumber(ARGV[2]) - 1)
+return 1
+"""
+
+# Outcomes of a cached read: served fresh, served stale while another request rebuilds it,
+# built by the reader (miss) and refreshed ahead of its expiry in the background
+OUTCOMES = ('hits', 'stale', 'misses', 'refreshes')
+
+
+class CacheStats:
+    """
+    Per-worker buffer of cache read counts and hit/miss counters, flushed to Redis in batches.
+
+    Reads are counted in process memory and added to the `HOT_KEY` sorted sets (which rank
+    warm-ups and size TTLs) at most once per `flush_interval`, or once `max_pending` distinct
+    members are buffered, instead of one `ZINCRBY` per read. Flushes ride along in the
+    pipeline of a read that is going to Redis anyway (see `queue_read`), so they cost no
+    extra round trip. Outcome counters are summed across workers in `CACHE_STATS_KEY`.
+
+    Flushes also age the counts of every family this worker counted: they are halved at
+    most once per `decay_interval` (whichever worker flushes first does it) and trimmed to
+    the `max_tracked` most read members, so counts reflect recent reads and stay bounded.
+
+    Entries are fresh for `min_ttl` seconds plus `min_ttl` more per recent read, capped at
+    `max_ttl`: cold entries leave Redis soon, hot ones are rebuilt rarely.
+    """
+
+    def __init__(self, redis_client, min_ttl=300, max_ttl=86400, flush_interval=5, max_pending=1000,
+                 decay_interval=3600, max_tracked=10000):
+        """
+        Args:
+            redis_client (Redis): Client used by `flush` and `totals`.
+            min_ttl (int): Seconds an entry without recent reads is fresh.
+            max_ttl (int): Maximum seconds an entry is fresh.
+            flush_interval (float): Seconds counts are buffered before being flushed.
+            max_pending (int): Buffered read counters forcing an early flush.
+            decay_interval (int): Minimum seconds between two agings of a family's counts.
+            max_tracked (int): Members kept per family.
+        """
+        self.redis = redis_client
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.decay_interval = decay_interval
+        self.max_tracked = max_tracked
+        self._families = set()  # Families counted by this worker, aged on every flush
+        self._lock = threading.Lock()
+        self._reads = Counter()  # (family, member) -> reads
+        self._outcomes = Counter()  # (family, outcome) -> count
+        self._flushed_at = time.monotonic()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def ttl(self, reads):
+        """
+        Returns the adaptive TTL of an entry.
+
+        Args:
+            reads (float): Recent reads of the entry (its `HOT_KEY` score), or None.
+
+        Returns:
+            int: Seconds the entry is fresh.
+        """
+        return int(min(self.max_ttl, self.min_ttl * (1 + (reads or 0))))
+
+    def record(self, family, outcome):
+        """
+        Counts the outcome of a cached read (one of `OUTCOMES`).
+        """
+        with self._lock:
+            self._outcomes[family, outcome] += 1
+
+    def queue_read(self, pipe, family, member):
+        """
+        Counts a read of `member` and queues commands on a pipeline about to be executed:
+        the `ZSCORE` of the member (its recent reads, for `ttl`) first, then the buffered
+        counts if a flush is due.
+
+        Args:
+            pipe (Pipeline): A sync or asyncio Redis pipeline; the score is the reply of the
+                first command queued here.
+            family (str): The entry's read-count family.
+            member: The entry's member in the family.
+        """
+        pipe.zscore(HOT_KEY.format(family=family), member)
+        with self._lock:
+            self._reads[family, str(member)] += 1
+            self._families.add(family)
+            due = (len(self._reads) >= self.max_pending
+                   or time.monotonic() - self._flushed_at >= self.flush_interval)
+            if due:
+                reads, outcomes = self._drain()
+        if due:
+            self._queue_flush(pipe, reads, outcomes)
+
+    def flush(self):
+        """
+        Writes the buffered counts to Redis, e.g. before reporting them or when the worker exits.
+        """
+        with self._lock:
+            reads, outcomes = self._drain()
+        if reads or outcomes or self._families:
+            pipe = self.redis.pipeline(transaction=False)
+            self._queue_flush(pipe, reads, outcomes)
+            pipe.execute()
+
+    def totals(self):
+        """
+        Returns the outcome counters of every worker, including this worker's buffered ones.
+
+        Returns:
+            dict: Family -> outcome -> count, with every outcome of `OUTCOMES`.
+        """
+        self.flush()
+        totals = {}
+        for field, count in self.redis.hgetall(CACHE_STATS_KEY).items():
+            family, _, outcome = field.decode().rpartition(':')
+            totals.setdefault(family, dict.fromkeys(OUTCOMES, 0))[outcome] = int(count)
+        return totals
+
+    def _drain(self):
+        # Called with the lock held
+        reads, outcomes = self._reads, self._outcomes
+        self._reads, self._outcomes = Counter(), Counter()
+        self._flushed_at = time.monotonic()
+        return reads, outcomes
+
+    def _queue_flush(self, pipe, reads, outcomes):
+        # Counts are aged before this flush's reads are added, which keep their full weight.
+        # EVAL rather than a registered script, so it queues on sync and asyncio pipelines alike.
+        for family in sorted(self._families):
+            pipe.eval(DECAY_SCRIPT, 2, HOT_KEY.format(family=family), HOT_DECAY_KEY.format(family=family),
+                      self.decay_interval, self.max_tracked)
+        for (family, member), count in reads.items():
+            pipe.zincrby(HOT_KEY.format(family=family), count, member)
+        for (family, outcome), count in outcomes.items():
+            pipe.hincrby(CACHE_STATS_KEY, f'{family}:{outcome}', count)
+
+    def _reset_after_fork(self):
+        # Counts buffered before the fork belong to the parent
+        self._lock = threading.Lock()
+        self._reads = Counter()
+        self._outcomes = Counter()
+        self._flushed_at = time.monotonic()
+
+
+def init_cache_stats(app):
+    """
+    Creates the app's cache statistics from the `CACHE_*` settings.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['cache_stats'] = CacheStats(
+        app.extensions['redis'],
+        min_ttl=app.config['CACHE_MIN_TTL'],
+        max_ttl=app.config['CACHE_MAX_TTL'],
+        flush_interval=app.config['CACHE_STATS_FLUSH_INTERVAL'],
+        max_pending=app.config['CACHE_STATS_MAX_PENDING'],
+        decay_interval=app.config['CACHE_HOT_DECAY_INTERVAL'],
+        max_tracked=app.config['CACHE_HOT_KEYS_MAX'],
+    )
+
+
+def get_cache_stats():
+    """
+    Returns the cache statistics of the current Flask app.
+
+    Returns:
+        CacheStats: The app's cache statistics.
+    """
+    return current_app.extensions['cache_stats']
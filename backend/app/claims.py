@@ -0,0 +1,68 @@
+from flask import current_app
+from app.models import User
+from app.revocation import ROLE_VERSION_ENTRY, TOKEN_ENTRY, get_token_blocklist
+
+# Names of the custom claims embedded in every access token
+ROLE_CLAIM = 'role'
+ROLE_VERSION_CLAIM = 'rv'
+
+
+def init_jwt_callbacks(jwt):
+    """
+    Registers the JWTManager callbacks that embed the user's role in issued tokens and
+    reject revoked tokens.
+
+    Tokens can be created either from a `User` instance (preferred, no extra query)
+    or from an email string, in which case the user is looked up once at issue time.
+
+    Args:
+        jwt (JWTManager): The JWT manager bound to the app.
+    """
+    @jwt.user_identity_loader
+    def user_identity_lookup(identity):
+        # The token subject is always the user's email
+        if isinstance(identity, User):
+            return identity.email
+        return identity
+
+    @jwt.additional_claims_loader
+    def add_role_claims(identity):
+        user = identity if isinstance(identity, User) else User.query.filter_by(email=identity).first()
+        if not user:
+            return {}
+        return {ROLE_CLAIM: user.role, ROLE_VERSION_CLAIM: user.role_version or 0}
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return get_token_blocklist().is_revoked(TOKEN_ENTRY.format(jti=jwt_payload['jti']))
+
+
+def is_role_version_stale(email, version):
+    """
+    Tells whether tokens carrying a role version were issued before a later role change.
+
+    Stale versions are recorded in the token blocklist, so for current tokens this is
+    answered by the in-process Bloom filter without a Redis round trip.
+
+    Args:
+        email (str): The user's email (the JWT subject).
+        version (int): The role version claim of the token.
+
+    Returns:
+        bool: True if the token's role claim is outdated.
+    """
+    return get_token_blocklist().is_revoked(ROLE_VERSION_ENTRY.format(email=email, version=version))
+
+
+def revoke_role_versions(users):
+    """
+    Marks the previous role version of users as stale, so access tokens issued before
+    their role change are rejected. Call after committing the role changes.
+
+    Args:
+        users (Iterable[User]): Users whose role was just changed (with `User.set_role` or a bulk
+            update), or rows with their `email` and new `role_version`.
+    """
+    entries = [ROLE_VERSION_ENTRY.format(email=user.email, version=(user.role_version or 0) - 1) for user in users]
+    # Tokens with the old version cannot outlive the access token lifetime
+    get_token_blocklist().revoke(entries, current_app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
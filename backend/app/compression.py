@@ -0,0 +1,129 @@
+import gzip
+
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Compression settings. Cached payloads are compressed once per rebuild, so these favour
+# ratio over speed a little more than typical on-the-fly defaults
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+
+# Supported content codings, in order of preference
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+# Only these response types are worth compressing
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/plain')
+
+
+def compress(body, encoding):
+    """
+    Compresses a payload with a content coding.
+
+    Args:
+        body (bytes): The payload.
+        encoding (str): 'gzip' or 'br'.
+
+    Returns:
+        bytes: The compressed payload.
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output deterministic for identical bodies
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_variants(body, min_size):
+    """
+    Compresses a payload with every supported content coding.
+
+    Args:
+        body (bytes): The payload.
+        min_size (int): Payloads smaller than this are not compressed; 0 disables compression.
+
+    Returns:
+        dict: Content coding -> compressed payload, for the codings that made it smaller.
+    """
+    if not min_size or len(body) < min_size:
+        return {}
+    variants = {}
+    for encoding in ENCODINGS:
+        compressed = compress(body, encoding)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+def negotiate_encoding():
+    """
+    Picks the content coding of the response from the request's `Accept-Encoding`.
+
+    Returns:
+        str | None: The preferred supported coding the client accepts, or None for identity.
+    """
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def best_encoding(accept_encoding):
+    """
+    Picks the content coding of a response from a raw `Accept-Encoding` header, outside
+    of a Flask request (see app/asgi.py).
+
+    Args:
+        accept_encoding (str): The header value, or None.
+
+    Returns:
+        str | None: The preferred supported coding the client accepts, or None for identity.
+    """
+    return parse_accept_header(accept_encoding).best_match(ENCODINGS)
+
+
+def variant_etag(etag, encoding):
+    """
+    Derives the strong ETag of an encoded variant: each representation needs its own.
+
+    Args:
+        etag (str): The quoted ETag of the uncompressed payload.
+        encoding (str): The content coding, or None for identity.
+
+    Returns:
+        str: The quoted ETag of the variant.
+    """
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def init_compression(app):
+    """
+    Compresses dynamic responses the client accepts compressed, unless they are smaller
+    than `COMPRESS_MIN_SIZE` bytes. Cached payloads are stored precompressed instead (see
+    `ReadThroughCache`). Responses that already carry a `Content-Encoding` or an ETag
+    (conditional responses negotiate their own encoding, see `conditional_json_response`)
+    and streamed responses are sent as is.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    @app.after_request
+    def compress_response(response):
+        min_size = app.config['COMPRESS_MIN_SIZE']
+        if (not min_size or response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or 'ETag' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate_encoding()
+        body = response.get_data()
+        if not encoding or len(body) < min_size:
+            return response
+        compressed = compress(body, encoding)
+        if len(compressed) >= len(body):
+            return response
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,117 @@
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import GENERATION_KEY
+
+# Session.info key collecting the cache invalidations of the current transaction
+PENDING_INVALIDATIONS = 'cache_invalidations'
+
+
+class PendingInvalidations:
+    """
+    Cache invalidations collected during a unit of work, applied once it commits.
+    """
+
+    def __init__(self):
+        self.namespaces = set()  # Read-through cache namespaces to bump (see `ReadThroughCache.bump`)
+        self.keys = set()  # Redis keys to unlink
+        self.profiles = {}  # Email -> new role version of the profiles to drop from both tiers of the profile cache
+
+    def __bool__(self):
+        return bool(self.namespaces or self.keys or self.profiles)
+
+
+class CacheInvalidator:
+    """
+    Applies the invalidations of a committed unit of work in a single Redis round trip.
+
+    Namespaces are moved to a new generation (so their entries are never read again and
+    age out), keys are unlinked (freed off Redis' main thread) and profiles are dropped
+    from Redis and, over pub/sub, from every worker's local tier.
+    """
+
+    def __init__(self, redis_client, profile_cache):
+        """
+        Args:
+            redis_client (Redis): Client holding the cache.
+            profile_cache (ProfileCache): The profile cache.
+        """
+        self.redis = redis_client
+        self.profile_cache = profile_cache
+
+    def flush(self, pending):
+        """
+        Applies collected invalidations.
+
+        Args:
+            pending (PendingInvalidations): The invalidations.
+        """
+        if not pending:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for namespace in sorted(pending.namespaces):
+            pipe.incr(GENERATION_KEY.format(namespace=namespace))
+        if pending.keys:
+            pipe.unlink(*pending.keys)
+        self.profile_cache.queue_invalidation(pipe, pending.profiles)
+        pipe.execute()
+
+
+def invalidate_on_commit(session, namespaces=(), keys=(), profiles=()):
+    """
+    Records cache invalidations to apply once the session's transaction commits; they
+    are dropped if it rolls back.
+
+    Args:
+        session (Session): The session of the unit of work (`db.session` in requests).
+        namespaces (Iterable[str]): Read-through cache namespaces to bump.
+        keys (Iterable[str]): Redis keys to unlink.
+        profiles (Mapping[str, int]): Email -> new `role_version` of the profiles to invalidate.
+    """
+    pending = session.info.get(PENDING_INVALIDATIONS)
+    if pending is None:
+        pending = session.info[PENDING_INVALIDATIONS] = PendingInvalidations()
+    pending.namespaces.update(namespaces)
+    pending.keys.update(keys)
+    for email, role_version in dict(profiles).items():
+        pending.profiles[email] = max(role_version, pending.profiles.get(email, role_version))
+
+
+@event.listens_for(Session, 'after_commit')
+def flush_invalidations(session):
+    """
+    Applies the invalidations recorded by `invalidate_on_commit` after a commit.
+    """
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    if pending and has_app_context():
+        get_invalidator().flush(pending)
+
+
+@event.listens_for(Session, 'after_rollback')
+def discard_invalidations(session):
+    """
+    Forgets the recorded invalidations when the transaction is rolled back, since the
+    cached data is still current.
+    """
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def init_invalidation(app):
+    """
+    Creates the app's cache invalidator.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['invalidator'] = CacheInvalidator(app.extensions['redis'], app.extensions['profile_cache'])
+
+
+def get_invalidator():
+    """
+    Returns the cache invalidator of the current Flask app.
+
+    Returns:
+        CacheInvalidator: The app's invalidator.
+    """
+    return current_app.extensions['invalidator']
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """
+    SQLAlchemy QueuePool that records how long checkouts wait for a connection
+    (including opening a new one when the pool is not full yet).
+
+    Long waits only happen once `pool_size + max_overflow` connections are checked out, so
+    growing wait times (or timeouts) mean the pool is undersized for the load.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_time = 0.0  # Total seconds spent waiting for connections
+        self.max_wait_time = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_time += waited
+                self.max_wait_time = max(self.max_wait_time, waited)
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool usage.
+
+        Returns:
+            dict: Pool size and connection counts plus checkout wait statistics.
+        """
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self.checkouts,
+                "checkout_wait_seconds": round(self.wait_time, 6),
+                "checkout_wait_seconds_max": round(self.max_wait_time, 6),
+                "checkout_timeouts": self.timeouts,
+            }
+
+
+def render_prometheus(metrics):
+    """
+    Renders metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics (list): (name, type, help, value) tuples; the value is either a number or a
+            list of (labels (dict), number) samples.
+
+    Returns:
+        str: The metrics document.
+    """
+    lines = []
+    for name, metric_type, help_text, value in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if isinstance(value, list):
+            for labels, sample in value:
+                label_text = ",".join(f'{label}="{label_value}"' for label, label_value in labels.items())
+                lines.append(f"{name}{{{label_text}}} {sample}")
+        else:
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def collect_cache_metrics(totals):
+    """
+    Builds the cache outcome metrics of the whole deployment.
+
+    Args:
+        totals (dict): See `CacheStats.totals`.
+
+    Returns:
+        list: (name, type, help, value) tuples for `render_prometheus`.
+    """
+    reads = [({"family": family, "outcome": outcome}, count)
+             for family, outcomes in sorted(totals.items()) for outcome, count in outcomes.items()]
+    ratios = []
+    for family, outcomes in sorted(totals.items()):
+        served = outcomes["hits"] + outcomes["stale"] + outcomes["misses"]
+        if served:
+            ratios.append(({"family": family}, round((outcomes["hits"] + outcomes["stale"]) / served, 6)))
+    return [
+        ("cache_reads_total", "counter",
+         "Cached reads by key family and outcome (hits, stale, misses, refreshes ahead).", reads),
+        ("cache_hit_ratio", "gauge", "Share of reads served from the cache, fresh or stale, by key family.", ratios),
+    ]
+
+
+def collect_pool_metrics(db_pool_stats, redis_pool_stats):
+    """
+    Builds the connection pool metrics of this worker process.
+
+    Args:
+        db_pool_stats (dict): See `TimedQueuePool.stats`.
+        redis_pool_stats (dict): See `InstrumentedConnectionPool.stats`.
+
+    Returns:
+        list: (name, type, help, value) tuples for `render_prometheus`.
+    """
+    return [
+        ("db_pool_size", "gauge", "Configured number of persistent database connections.", db_pool_stats["size"]),
+        ("db_pool_checked_out", "gauge", "Database connections currently in use.", db_pool_stats["checked_out"]),
+        ("db_pool_checked_in", "gauge", "Idle database connections in the pool.", db_pool_stats["checked_in"]),
+        ("db_pool_overflow", "gauge", "Database connections open beyond the pool size.", db_pool_stats["overflow"]),
+        ("db_pool_checkouts_total", "counter", "Database connection checkouts.", db_pool_stats["checkouts"]),
+        ("db_pool_checkout_wait_seconds_total", "counter", "Time spent waiting for a database connection.",
+         db_pool_stats["checkout_wait_seconds"]),
+        ("db_pool_checkout_wait_seconds_max", "gauge", "Longest wait for a database connection.",
+         db_pool_stats["checkout_wait_seconds_max"]),
+        ("db_pool_checkout_timeouts_total", "counter", "Checkouts that timed out waiting for a database connection.",
+         db_pool_stats["checkout_timeouts"]),
+        ("redis_pool_max_connections", "gauge", "Configured maximum of Redis connections.",
+         redis_pool_stats["max_connections"]),
+        ("redis_pool_in_use", "gauge", "Redis connections currently in use.", redis_pool_stats["in_use"]),
+        ("redis_pool_idle", "gauge", "Idle Redis connections in the pool.", redis_pool_stats["idle"]),
+        ("redis_pool_waits_total", "counter", "Redis checkouts that had to wait for a connection.",
+         redis_pool_stats["waits"]),
+        ("redis_pool_wait_seconds_total", "counter", "Time spent waiting for a Redis connection.",
+         redis_pool_stats["wait_time_seconds"]),
+    ]
@@ -1,6 +1,7 @@
 from app import db
 from datetime import datetime
-from werkzeug.security import generate_password_hash
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from app.passwords import get_password_hasher
 
 class User(db.Model):
     """
@@ -10,6 +11,10 @@ class User(db.Model):
     """
     
     __tablename__ = 'users'  # Explicitly set table name to 'users'
+    __table_args__ = (
+        db.Index('ix_users_role_id', 'role', 'id'),  # Admin listings filtered by role, paginated on id
+        db.Index('ix_users_email_pattern', 'email', postgresql_ops={'email': 'varchar_pattern_ops'}),  # Email prefix filters (LIKE 'x%')
+    )
 
     # Define columns
     id = db.Column(db.Integer, primary_key=True)  # Unique ID for each user
@@ -17,15 +22,42 @@ class User(db.Model):
     password = db.Column(db.String(255), nullable=True)  # User password (nullable for Google users)
     is_google_user = db.Column(db.Boolean, default=False)  # Flag to check if user registered via Google
     role = db.Column(db.String(20), nullable=False, default='user')  # Role of the user (default to 'user')
+    role_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Bumped on every role change to invalidate issued JWTs
 
     def set_password(self, password):
         """
         Hashes the password and stores it securely.
+        Hashing runs on the app's bounded password hashing pool with the configured cost.
         
         Args:
             password (str): The plaintext password to be hashed.
         """
-        self.password = generate_password_hash(password)
+        self.password = get_password_hasher().hash(password)
+
+    def check_password(self, password):
+        """
+        Checks a plaintext password against the stored hash.
+        
+        Args:
+            password (str): The plaintext password to check.
+        
+        Returns:
+            bool: True if the password matches; always False for users without a password (Google users).
+        """
+        if not self.password:
+            return False
+        return get_password_hasher().verify(self.password, password)
+
+    def set_role(self, role):
+        """
+        Changes the user's role and bumps the role version so that JWTs issued
+        with the previous role claim are rejected by `role_required`.
+
+        Args:
+            role (str): The new role to assign to the user.
+        """
+        self.role = role
+        self.role_version = (self.role_version or 0) + 1
 
     def __repr__(self):
         """
@@ -38,14 +70,26 @@ class Article(db.Model):
     Article model representing articles posted by users. This model stores information
     about the article title, content, and the user who authored it.
     """
-    
+
+    __table_args__ = (
+        db.Index('ix_article_created_at_id', 'created_at', 'id'),  # Keyset pagination of the article list
+        db.Index('ix_article_search_vector', 'search_vector', postgresql_using='gin'),  # Full-text search
+    )
+
     # Define columns
     id = db.Column(db.Integer, primary_key=True)  # Unique ID for each article
     title = db.Column(db.String(255), nullable=False)  # Title of the article
     content = db.Column(db.Text, nullable=False)  # Content of the article
-    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Link to the User who authored the article
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)  # Link to the User who authored the article
     created_at = db.Column(db.DateTime, default=datetime.utcnow)  # Creation timestamp
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Update timestamp
+    # Full-text search document kept up to date by Postgres; title matches rank above content matches.
+    # Deferred so loading an article does not fetch it
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(content, '')), 'B')",
+        persisted=True
+    )))
 
     # Define relationship to the User model
     author = db.relationship('User', backref='articles')
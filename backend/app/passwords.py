@@ -0,0 +1,250 @@
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app
+from sqlalchemy import update
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# Lowest costs `calibrate` will recommend, whatever the latency budget
+MIN_SCRYPT_N = 2 ** 14
+MIN_PBKDF2_ITERATIONS = 100000
+
+
+def normalize_method(method):
+    """
+    Expands a werkzeug hashing method to the full form stored in hashes, filling in
+    werkzeug's default parameters (e.g. 'scrypt' -> 'scrypt:32768:8:1').
+
+    Args:
+        method (str): The hashing method, with or without parameters.
+
+    Returns:
+        str: The method with every parameter spelled out.
+    """
+    algorithm, *params = method.split(':')
+    if algorithm == 'scrypt':
+        defaults = ['32768', '8', '1']
+    elif algorithm == 'pbkdf2':
+        defaults = ['sha256', str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        return method
+    return ':'.join([algorithm] + params + defaults[len(params):])
+
+
+def calibrate(algorithm, budget_ms):
+    """
+    Picks the highest hashing cost that fits a per-login latency budget on this machine.
+
+    Args:
+        algorithm (str): 'scrypt' or 'pbkdf2'.
+        budget_ms (float): Target duration of a single hash, in milliseconds.
+
+    Returns:
+        tuple: (method, measured duration in ms) of the recommended setting. The cost never
+        goes below `MIN_SCRYPT_N` / `MIN_PBKDF2_ITERATIONS`, even if that exceeds the budget.
+    """
+    def measure(method):
+        start = time.perf_counter()
+        generate_password_hash('calibration-password', method)
+        return (time.perf_counter() - start) * 1000
+
+    if algorithm == 'scrypt':
+        # Cost doubles with n: keep doubling while the next step still fits the budget
+        n = MIN_SCRYPT_N
+        duration = measure(f"scrypt:{n}:8:1")
+        while duration * 2 <= budget_ms:
+            n *= 2
+            duration = measure(f"scrypt:{n}:8:1")
+        return f"scrypt:{n}:8:1", duration
+
+    if algorithm == 'pbkdf2':
+        # Cost is linear in the iteration count: scale a sample measurement
+        sample = 50000
+        per_iteration = measure(f"pbkdf2:sha256:{sample}") / sample
+        iterations = max(MIN_PBKDF2_ITERATIONS, int(budget_ms / per_iteration) // 10000 * 10000)
+        method = f"pbkdf2:sha256:{iterations}"
+        return method, measure(method)
+
+    raise ValueError(f"Unknown hashing algorithm: {algorithm}")
+
+
+class HasherBusyError(Exception):
+    """
+    Raised when the password hashing pool is saturated and cannot accept more work, or
+    did not get to a hash within the caller's timeout.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a bounded worker pool.
+
+    Key derivation (scrypt, pbkdf2) is deliberately CPU-expensive. hashlib releases the
+    GIL while deriving, so running it on a few dedicated threads caps how many cores
+    hashing can take at once; the remaining request threads keep serving other routes.
+    At most `max_pending` hashes may be queued or running; beyond that callers get a
+    `HasherBusyError` immediately instead of piling up behind the pool. Callers whose hash
+    is not done within `timeout` seconds get one too.
+    """
+
+    def __init__(self, method, workers=2, max_pending=32, timeout=10):
+        """
+        Args:
+            method (str): werkzeug hashing method and cost, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'.
+            workers (int): Number of hashing threads.
+            max_pending (int): Maximum hashes queued or running at once.
+            timeout (float): Seconds a caller waits for its hash before giving up.
+        """
+        self.method = normalize_method(method)
+        self.timeout = timeout
+        self.workers = workers
+        self.max_pending = max_pending
+        self._dummy_hash = None  # Hash of a random password, created on first use by `verify_dummy`
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def shutdown(self, wait=True):
+        """
+        Stops the pool after the queued hashes (e.g. background rehashes) have run.
+
+        Args:
+            wait (bool): Whether to block until they are done.
+        """
+        self._executor.shutdown(wait=wait)
+
+    def _reset_after_fork(self):
+        # Pool threads are not copied into the child, nor are the slots they held
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HasherBusyError("Password hashing pool is saturated")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drop the hash if it has not started yet, nobody is waiting for it any more
+            future.cancel()
+            raise HasherBusyError(f"Password hashing took longer than {self.timeout}s") from None
+
+    def hash(self, password):
+        """
+        Hashes a password with the configured method and cost.
+
+        Args:
+            password (str): The plaintext password.
+
+        Returns:
+            str: The werkzeug password hash ('method$salt$hash').
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """
+        Checks a password against a stored hash, whatever method and cost it was created with.
+
+        Args:
+            pwhash (str): The stored werkzeug password hash.
+            password (str): The plaintext password to check.
+
+        Returns:
+            bool: True if the password matches.
+        """
+        return self._run(check_password_hash, pwhash, password)
+
+    def verify_dummy(self, password):
+        """
+        Checks a password against a fixed hash of the configured method and cost, so that
+        rejecting an email without an account takes as long as rejecting a wrong password.
+
+        Args:
+            password (str): The plaintext password given for the unknown account.
+        """
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(secrets.token_urlsafe())
+        self.verify(self._dummy_hash, password)
+
+    def needs_rehash(self, pwhash):
+        """
+        Tells whether a stored hash was created with another method or cost than the configured one.
+
+        Args:
+            pwhash (str): The stored werkzeug password hash.
+
+        Returns:
+            bool: True if the hash should be upgraded.
+        """
+        return pwhash.split('$', 1)[0] != self.method
+
+    def rehash_in_background(self, app, user_id, old_hash, password):
+        """
+        Re-hashes a just-verified password with the configured method without delaying the login.
+
+        The new hash is only stored if the user's hash has not changed in the meantime. When
+        the pool is saturated the upgrade is skipped; it will be retried on the next login.
+
+        Args:
+            app (Flask): The app whose database stores the user.
+            user_id (int): The ID of the user.
+            old_hash (str): The hash the password was verified against.
+            password (str): The verified plaintext password.
+
+        Returns:
+            Future | None: The background task, or None if it was skipped.
+        """
+        from app import db
+        from app.models import User
+
+        def rehash():
+            try:
+                new_hash = generate_password_hash(password, self.method)
+                with app.app_context():
+                    db.session.execute(
+                        update(User).where(User.id == user_id, User.password == old_hash).values(password=new_hash)
+                    )
+                    db.session.commit()
+            finally:
+                self._slots.release()
+
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            return self._executor.submit(rehash)
+        except BaseException:
+            self._slots.release()
+            raise
+
+
+def init_password_hasher(app):
+    """
+    Creates the app's password hashing pool from the `PASSWORD_HASH_*` settings.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['password_hasher'] = PasswordHasher(
+        app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+    )
+
+
+def get_password_hasher():
+    """
+    Returns the password hashing pool of the current Flask app.
+
+    Returns:
+        PasswordHasher: The app's password hasher.
+    """
+    return current_app.extensions['password_hasher']
@@ -0,0 +1,270 @@
+from flask import current_app
+from sqlalchemy import event, inspect
+
+from app.cache import CacheEntry, LocalTTLCache, make_etag
+from app.invalidation import invalidate_on_commit
+from app.models import User
+
+# Redis key of a cached profile
+PROFILE_KEY = 'profile:{email}'
+
+# Redis key of the role version a profile was last invalidated for: profiles built from an
+# older version (read before the role change committed) are not cached any more
+PROFILE_VERSION_KEY = 'profile:{email}:rv'
+
+# Caches a profile unless it was built from a role version older than the last invalidation.
+# KEYS[1] = profile, KEYS[2] = invalidated version, ARGV[1] = body, ARGV[2] = TTL,
+# ARGV[3] = role version the profile was built from
+SET_PROFILE_SCRIPT = """
+local invalidated = redis.call('GET', KEYS[2])
+if invalidated and tonumber(invalidated) > tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# Drops a profile and records the role version it was invalidated for, keeping the newest.
+# KEYS[1] = profile, KEYS[2] = invalidated version, ARGV[1] = new role version, ARGV[2] = TTL
+INVALIDATE_PROFILE_SCRIPT = """
+local invalidated = redis.call('GET', KEYS[2])
+if not invalidated or tonumber(invalidated) < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+end
+redis.call('UNLINK', KEYS[1])
+return 1
+"""
+
+# Read-count family (see `HOT_KEY`) of profiles, used to size TTLs and rank warm-ups. Only
+# reads missing the local tier are counted, since they are the ones going to Redis
+HOT_PROFILES = 'profiles'
+
+# Pub/sub channel announcing profiles to drop from the per-worker caches
+PROFILE_INVALIDATION_CHANNEL = 'profile_invalidations'
+
+
+class ProfileCache:
+    """
+    Two-tier cache of encoded user profiles: a bounded per-worker `LocalTTLCache` in
+    front of Redis. The local tier keeps each profile with its ETag.
+
+    Hot profiles are served from process memory. When a profile changes it is deleted
+    from Redis and every worker drops its local copy on the pub/sub message; the local
+    TTL bounds staleness should a message be lost, and the local tier is cleared
+    whenever the listener (re)connects.
+
+    Profiles are stored together with the role version they were built from, and only if
+    no newer version was invalidated meanwhile: a rebuild that read the user before a role
+    change committed cannot put the old role back after the invalidation.
+
+    With `stats`, profiles are kept in Redis for an adaptive TTL (see `CacheStats.ttl`)
+    of at most `ttl` seconds.
+    """
+
+    def __init__(self, redis_client, listener, ttl=3600, local_size=10000, local_ttl=30, stats=None):
+        """
+        Args:
+            redis_client (Redis): Client storing the shared tier.
+            listener (PubSubListener): Listener delivering invalidations from other workers.
+            ttl (int): Maximum seconds a profile is kept in Redis.
+            local_size (int): Maximum number of profiles kept per worker.
+            local_ttl (float): Seconds a profile is kept per worker.
+            stats (CacheStats): Counts profile reads and outcomes (family `HOT_PROFILES`).
+        """
+        self.redis = redis_client
+        self.listener = listener
+        self.ttl = ttl
+        self.stats = stats
+        self.local = LocalTTLCache(maxsize=local_size, ttl=local_ttl)
+        listener.subscribe(PROFILE_INVALIDATION_CHANNEL, self._on_invalidation, on_connect=self.local.clear)
+
+    def get(self, email):
+        """
+        Returns the encoded profile of a user, or None if it is not cached.
+
+        Args:
+            email (str): The user's email.
+
+        Returns:
+            CacheEntry | None: The encoded profile and its ETag.
+        """
+        entry = self.get_local(email)
+        if entry is None:
+            body = self.redis.get(PROFILE_KEY.format(email=email))
+            if body is not None:
+                entry = self.set_local(email, body)
+        return entry
+
+    def get_or_build(self, email, builder):
+        """
+        Returns the encoded profile of a user, building and caching it on a miss.
+
+        Reads going to Redis are counted in the same round trip as the lookup, and the
+        counts size the TTL of a rebuilt profile.
+
+        Args:
+            email (str): The user's email.
+            builder (callable): Returns the encoded profile and the user's `role_version`,
+                or None if the user does not exist.
+
+        Returns:
+            CacheEntry | None: The encoded profile and its ETag, or None for an unknown user.
+        """
+        entry = self.get_local(email)
+        if entry is not None:
+            self.record('hits')
+            return entry
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(PROFILE_KEY.format(email=email))
+        if self.stats:
+            self.stats.queue_read(pipe, HOT_PROFILES, email)
+        replies = pipe.execute()
+        body, reads = replies[0], replies[1] if self.stats else None
+        if body is not None:
+            self.record('hits')
+            return self.set_local(email, body)
+
+        self.record('misses')
+        built = builder()
+        if built is None:
+            return None
+        body, role_version = built
+        return self.set(email, body, role_version, self.ttl_for(reads))
+
+    def ttl_for(self, reads):
+        """
+        Returns the seconds a profile with `reads` recent reads is kept in Redis.
+        """
+        return min(self.ttl, self.stats.ttl(reads)) if self.stats else self.ttl
+
+    def record(self, outcome):
+        """
+        Counts the outcome of a profile read (see `CacheStats.record`).
+        """
+        if self.stats:
+            self.stats.record(HOT_PROFILES, outcome)
+
+    def get_local(self, email):
+        """
+        Returns the profile of a user from this worker's tier only.
+
+        Returns:
+            CacheEntry | None: The encoded profile and its ETag.
+        """
+        self.listener.start()
+        return self.local.get(email)
+
+    def set_local(self, email, body):
+        """
+        Caches the encoded profile of a user in this worker's tier only, e.g. after reading
+        it from Redis with another client.
+
+        Returns:
+            CacheEntry: The encoded profile and its ETag.
+        """
+        entry = CacheEntry(body, make_etag(body), None)
+        self.local.set(email, entry)
+        return entry
+
+    def set(self, email, body, role_version, ttl=None):
+        """
+        Caches the encoded profile of a user in both tiers, unless it is stale (see `queue_set`).
+
+        Args:
+            email (str): The user's email.
+            body (bytes): The encoded profile.
+            role_version (int): The user's `role_version` the profile was built from.
+            ttl (int): Seconds the profile is kept in Redis, if not `ttl`.
+
+        Returns:
+            CacheEntry: The encoded profile and its ETag.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        self.queue_set(pipe, email, body, role_version, ttl)
+        if pipe.execute()[0]:
+            return self.set_local(email, body)
+        return CacheEntry(body, make_etag(body), None)
+
+    def queue_set(self, pipe, email, body, role_version, ttl=None):
+        """
+        Queues storing the encoded profile of a user in Redis on a pipeline. The reply is 0
+        (and nothing is stored) if the profile was invalidated for a newer role version.
+
+        Args:
+            pipe (Pipeline): A sync or asyncio Redis pipeline.
+            email (str): The user's email.
+            body (bytes): The encoded profile.
+            role_version (int): The user's `role_version` the profile was built from.
+            ttl (int): Seconds the profile is kept in Redis, if not `ttl`.
+        """
+        # EVAL rather than a registered script, so it queues on sync and asyncio pipelines alike
+        pipe.eval(SET_PROFILE_SCRIPT, 2, PROFILE_KEY.format(email=email), PROFILE_VERSION_KEY.format(email=email),
+                  body, ttl or self.ttl, role_version or 0)
+
+    def invalidate(self, profiles):
+        """
+        Drops profiles from Redis and from the local tier of every worker.
+
+        Args:
+            profiles (Mapping[str, int]): Email -> new `role_version` of the changed users.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        self.queue_invalidation(pipe, profiles)
+        pipe.execute()
+
+    def queue_invalidation(self, pipe, profiles):
+        """
+        Like `invalidate`, but queues the Redis commands on a pipeline (e.g. with other
+        invalidations) and drops the profiles from this worker's tier right away.
+
+        Args:
+            pipe (Pipeline): The pipeline to queue the commands on.
+            profiles (Mapping[str, int]): Email -> new `role_version` of the changed users.
+        """
+        for email, role_version in profiles.items():
+            # The version outlives any rebuild that may have read the previous one
+            pipe.eval(INVALIDATE_PROFILE_SCRIPT, 2, PROFILE_KEY.format(email=email),
+                      PROFILE_VERSION_KEY.format(email=email), role_version or 0, self.ttl)
+            pipe.publish(PROFILE_INVALIDATION_CHANNEL, email)
+            self.local.delete(email)
+
+    def _on_invalidation(self, email):
+        self.local.delete(email.decode())
+
+
+@event.listens_for(User, 'after_update')
+def collect_profile_changes(mapper, connection, target):
+    """
+    Records users whose role was changed by a flush; their cached profiles are
+    invalidated once the transaction commits.
+    """
+    if inspect(target).attrs.role.history.has_changes():
+        invalidate_on_commit(inspect(target).session, profiles={target.email: target.role_version})
+
+
+def init_profile_cache(app):
+    """
+    Creates the app's profile cache from the `PROFILE_*` settings.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['profile_cache'] = ProfileCache(
+        app.extensions['redis'],
+        app.extensions['pubsub'],
+        ttl=app.config['PROFILE_CACHE_TTL'],
+        local_size=app.config['PROFILE_LOCAL_CACHE_SIZE'],
+        local_ttl=app.config['PROFILE_LOCAL_CACHE_TTL'],
+        stats=app.extensions['cache_stats'],
+    )
+
+
+def get_profile_cache():
+    """
+    Returns the profile cache of the current Flask app.
+
+    Returns:
+        ProfileCache: The app's profile cache.
+    """
+    return current_app.extensions['profile_cache']
@@ -0,0 +1,155 @@
+import os
+import threading
+
+import redis
+from flask import current_app
+
+
+class PubSubListener:
+    """
+    Background thread delivering Redis pub/sub messages to in-process handlers.
+
+    Each worker process runs one listener (on its own Redis connection) shared by every
+    component keeping in-process state in sync across workers. The thread is started
+    lazily and restarted in forked children, since threads do not survive `fork()`.
+
+    Messages published while the listener is disconnected are lost, so components register
+    an `on_connect` callback to resynchronize their state whenever it (re)subscribes.
+    """
+
+    def __init__(self, redis_client, reconnect_delay=1.0, logger=None):
+        """
+        Args:
+            redis_client (Redis): Client whose pool provides the subscriber connection.
+            reconnect_delay (float): Seconds to wait before reconnecting after an error.
+            logger (Logger): Logger for connection errors.
+        """
+        self.redis = redis_client
+        self.reconnect_delay = reconnect_delay
+        self.logger = logger
+        self._handlers = {}  # channel -> [handler(message bytes)]
+        self._on_connect = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._connected = threading.Event()
+        self._thread = None
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def subscribe(self, channel, handler, on_connect=None):
+        """
+        Registers a handler for a channel. Must be called before the listener is started.
+
+        Args:
+            channel (str): The channel name.
+            handler (callable): Called with the message payload (bytes) from the listener thread.
+            on_connect (callable): Called (without arguments) after every (re)subscription.
+        """
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("Cannot subscribe after the listener has started")
+            self._handlers.setdefault(channel, []).append(handler)
+            if on_connect:
+                self._on_connect.append(on_connect)
+
+    def publish(self, channel, message):
+        """
+        Publishes a message to every listener, including this process's own.
+
+        Args:
+            channel (str): The channel name.
+            message (str | bytes): The payload.
+        """
+        self.redis.publish(channel, message)
+
+    def start(self):
+        """
+        Starts the listener thread unless it is already running in this process.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None or not self._handlers:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='pubsub-listener', daemon=True)
+            self._thread.start()
+
+    def wait_connected(self, timeout=None):
+        """
+        Blocks until the listener has subscribed and run its `on_connect` callbacks.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if the listener is connected.
+        """
+        return self._connected.wait(timeout)
+
+    def stop(self):
+        """
+        Stops the listener thread.
+        """
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(*self._handlers)
+                for callback in self._on_connect:
+                    callback()
+                self._connected.set()
+                while not self._stopped.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._dispatch(message)
+            except redis.RedisError:
+                if self.logger:
+                    self.logger.warning("Pub/sub listener disconnected, reconnecting", exc_info=True)
+                self._connected.clear()
+                self._stopped.wait(self.reconnect_delay)
+            finally:
+                pubsub.close()
+        self._connected.clear()
+
+    def _dispatch(self, message):
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(message['data'])
+            except Exception:
+                if self.logger:
+                    self.logger.exception("Pub/sub handler failed for channel %s", channel)
+
+    def _reset_after_fork(self):
+        # The thread was not copied into the child; the lock may have been held by it
+        self._lock = threading.Lock()
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+
+def init_pubsub(app):
+    """
+    Creates the app's pub/sub listener on top of the shared Redis client.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['pubsub'] = PubSubListener(app.extensions['redis'], logger=app.logger)
+
+
+def get_pubsub():
+    """
+    Returns the pub/sub listener of the current Flask app.
+
+    Returns:
+        PubSubListener: The app's listener.
+    """
+    return current_app.extensions['pubsub']
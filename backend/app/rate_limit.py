@@ -0,0 +1,232 @@
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+import redis
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+# Outcome of a rate limit check; `reset` is the number of seconds until the client may retry
+# (when denied) or until the quota is fully restored (when allowed)
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'reset'])
+
+# Token bucket: the bucket holds up to `capacity` tokens and refills continuously at
+# `capacity / period` tokens per second. Each request takes one token.
+# KEYS[1] = bucket hash, ARGV = capacity, period (ms)
+# Returns {allowed, remaining, reset (ms)}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local rate = capacity / period
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], period)
+
+local reset
+if allowed == 1 then
+    reset = math.ceil((capacity - tokens) / rate)
+else
+    reset = math.ceil((1 - tokens) / rate)
+end
+return {allowed, math.floor(tokens), reset}
+"""
+
+# Sliding log: a sorted set of request timestamps within the last `period` ms.
+# KEYS[1] = log sorted set, ARGV = limit, period (ms)
+# Returns {allowed, remaining, reset (ms)}
+SLIDING_LOG_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - period)
+local count = redis.call('ZCARD', KEYS[1])
+
+local allowed = 0
+if count < limit then
+    -- Microseconds keep members unique for requests within the same millisecond
+    redis.call('ZADD', KEYS[1], now, time[1] .. time[2] .. ':' .. count)
+    redis.call('PEXPIRE', KEYS[1], period)
+    count = count + 1
+    allowed = 1
+end
+
+local reset = period
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + period - now
+end
+return {allowed, limit - count, reset}
+"""
+
+
+class RateLimiter:
+    """
+    Redis-backed rate limiter. Each check is a single Lua script call, so it is atomic
+    under concurrency and costs one round trip.
+
+    An optional in-process pre-filter remembers clients that were denied and rejects
+    them locally until their reset time, without contacting Redis.
+    """
+
+    ALGORITHMS = ('token_bucket', 'sliding_log')
+
+    def __init__(self, redis_client, prefilter_size=10000):
+        """
+        Args:
+            redis_client (Redis): Client used to run the scripts.
+            prefilter_size (int): Maximum number of denied clients remembered in process;
+                0 disables the pre-filter.
+        """
+        self.scripts = {
+            'token_bucket': redis_client.register_script(TOKEN_BUCKET_SCRIPT),
+            'sliding_log': redis_client.register_script(SLIDING_LOG_SCRIPT),
+        }
+        self.prefilter_size = prefilter_size
+        self._denied = OrderedDict()  # key -> (monotonic deadline, limit)
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, period, algorithm='sliding_log'):
+        """
+        Records a request for `key` and tells whether it is within the limit.
+
+        Args:
+            key (str): Redis key identifying the client and route.
+            limit (int): Requests allowed per period (bucket capacity for token_bucket).
+            period (float): Length of the window in seconds.
+            algorithm (str): 'sliding_log' or 'token_bucket'.
+
+        Returns:
+            RateLimitResult: Whether the request is allowed and the quota state.
+        """
+        denied = self._check_prefilter(key)
+        if denied:
+            return denied
+
+        allowed, remaining, reset_ms = self.scripts[algorithm](keys=[key], args=[limit, int(period * 1000)])
+        result = RateLimitResult(bool(allowed), limit, max(int(remaining), 0), reset_ms / 1000)
+        if not result.allowed:
+            self._remember_denied(key, result)
+        return result
+
+    def _check_prefilter(self, key):
+        if not self.prefilter_size:
+            return None
+        with self._lock:
+            entry = self._denied.get(key)
+            if not entry:
+                return None
+            deadline, limit = entry
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                del self._denied[key]
+                return None
+        return RateLimitResult(False, limit, 0, remaining_time)
+
+    def _remember_denied(self, key, result):
+        if not self.prefilter_size:
+            return
+        with self._lock:
+            self._denied[key] = (time.monotonic() + result.reset, result.limit)
+            self._denied.move_to_end(key)
+            while len(self._denied) > self.prefilter_size:
+                self._denied.popitem(last=False)
+
+
+def init_rate_limiter(app):
+    """
+    Creates the app's rate limiter on top of the shared Redis client.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    prefilter_size = app.config['RATELIMIT_PREFILTER_SIZE'] if app.config['RATELIMIT_PREFILTER'] else 0
+    app.extensions['rate_limiter'] = RateLimiter(app.extensions['redis'], prefilter_size=prefilter_size)
+
+
+def get_identity(key_by):
+    """
+    Returns the identity a rate limit applies to.
+
+    Args:
+        key_by (str): 'ip' for the client address, 'user' for the JWT subject
+            (falling back to the client address for anonymous requests).
+
+    Returns:
+        str: The identity, prefixed with its kind.
+    """
+    if key_by == 'user':
+        verify_jwt_in_request(optional=True)
+        subject = get_jwt_identity()
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{request.remote_addr}"
+
+
+def rate_limit(max_attempts, window_seconds, algorithm='sliding_log', key_by='ip', scope=None):
+    """
+    A decorator to enforce a rate limit policy on a route.
+
+    Limits are tracked per route (or per shared `scope`) and per identity. Responses
+    carry `RateLimit-Limit`, `RateLimit-Remaining` and `RateLimit-Reset` headers, and
+    denied requests get a 429 with `Retry-After`. If Redis is unavailable the request
+    is let through rather than failing.
+
+    Args:
+        max_attempts (int | str): Maximum number of requests allowed (bucket capacity for
+            token_bucket), or the name of the config setting holding it.
+        window_seconds (int | str): Time window in seconds (time to refill the bucket for
+            token_bucket), or the name of the config setting holding it.
+        algorithm (str): 'sliding_log' (exact window) or 'token_bucket' (allows bursts).
+        key_by (str): 'ip' or 'user' (JWT subject).
+        scope (str): Name shared by routes that should count against the same limit;
+            defaults to the route's endpoint.
+
+    Returns:
+        Function: The decorated function that applies rate limiting.
+    """
+    if algorithm not in RateLimiter.ALGORITHMS:
+        raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            if not current_app.config['RATELIMIT_ENABLED']:
+                return f(*args, **kwargs)
+
+            key = f"rate_limit:{algorithm}:{scope or request.endpoint}:{get_identity(key_by)}"
+            limit, period = (current_app.config[value] if isinstance(value, str) else value
+                             for value in (max_attempts, window_seconds))
+            try:
+                result = current_app.extensions['rate_limiter'].hit(key, limit, period, algorithm)
+            except redis.RedisError:
+                current_app.logger.warning("Rate limiter unavailable, allowing request", exc_info=True)
+                return f(*args, **kwargs)
+
+            reset = math.ceil(result.reset)
+            if not result.allowed:
+                response = make_response(jsonify({"error": "Too many requests"}), 429)
+                response.headers['Retry-After'] = str(reset)
+            else:
+                response = make_response(f(*args, **kwargs))
+            response.headers['RateLimit-Limit'] = str(result.limit)
+            response.headers['RateLimit-Remaining'] = str(result.remaining)
+            response.headers['RateLimit-Reset'] = str(reset)
+            return response
+        return wrapped
+    return decorator
@@ -1,18 +1,105 @@
+import threading
+import time
+
 import redis
 from flask import current_app
 
-def get_redis_client():
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Blocking Redis connection pool that records how often, and for how long, callers
+    had to wait for a free connection.
+
+    Blocking (rather than erroring) once `max_connections` are checked out keeps bursts
+    bounded, and the wait statistics show when the pool is too small for the load.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.waits = 0  # Number of checkouts that found no idle connection
+        self.wait_time = 0.0  # Total seconds spent waiting for a connection
+
+    def get_connection(self, command_name, *keys, **options):
+        # An empty queue means every connection is checked out and the caller will block
+        if not self.pool.empty():
+            return super().get_connection(command_name, *keys, **options)
+
+        start = time.perf_counter()
+        try:
+            return super().get_connection(command_name, *keys, **options)
+        finally:
+            with self._stats_lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool usage.
+
+        Returns:
+            dict: Max, open, in-use and idle connection counts plus wait statistics.
+        """
+        with self.pool.mutex:
+            open_connections = len(self._connections)
+            idle = sum(1 for connection in self.pool.queue if connection is not None)
+        return {
+            "max_connections": self.max_connections,
+            "open": open_connections,
+            "in_use": open_connections - idle,
+            "idle": idle,
+            "waits": self.waits,
+            "wait_time_seconds": round(self.wait_time, 6),
+        }
+
+
+def init_redis(app):
     """
-    Initializes and returns a Redis client instance.
+    Creates the process-wide Redis client for the app, backed by a single shared
+    connection pool configured from the `REDIS_*` settings.
+
+    The client is stored in `app.extensions['redis']` and returned by `get_redis_client`.
+    It also backs Flask-Session, so this must run before the session extension is bound.
 
-    The function uses the current Flask app's configuration to connect to Redis.
-    It defaults to the 'redis' host and port 6379 if no custom configuration is provided.
+    Args:
+        app (Flask): The Flask app instance.
 
     Returns:
-        StrictRedis: A Redis client instance ready to interact with the Redis server.
+        Redis: The shared Redis client.
     """
-    return redis.StrictRedis(
-        host=current_app.config.get('REDIS_HOST', 'redis'),  # Defaults to 'redis' if not configured
-        port=current_app.config.get('REDIS_PORT', 6379),     # Defaults to port 6379
-        decode_responses=True                                # Ensures the responses are returned as Python strings
+    pool = InstrumentedConnectionPool.from_url(
+        app.config['REDIS_URL'],
+        max_connections=app.config['REDIS_MAX_CONNECTIONS'],
+        timeout=app.config['REDIS_POOL_TIMEOUT'],  # Seconds to wait for a free connection
+        socket_timeout=app.config['REDIS_SOCKET_TIMEOUT'],
+        socket_connect_timeout=app.config['REDIS_SOCKET_CONNECT_TIMEOUT'],
+        socket_keepalive=True,
+        health_check_interval=app.config['REDIS_HEALTH_CHECK_INTERVAL'],  # PING idle connections before reuse
     )
+    client = redis.Redis(connection_pool=pool)
+    app.extensions['redis'] = client
+    app.config['SESSION_REDIS'] = client
+    return client
+
+
+def get_redis_client():
+    """
+    Returns the shared Redis client of the current Flask app.
+
+    All callers share one connection pool, so no TCP handshake is made per request.
+    Responses are returned as bytes; decode them where strings are needed.
+
+    Returns:
+        Redis: The Redis client bound to the app's connection pool.
+    """
+    return current_app.extensions['redis']
+
+
+def get_redis_pool_stats():
+    """
+    Returns usage statistics of the current app's Redis connection pool.
+
+    Returns:
+        dict: See `InstrumentedConnectionPool.stats`.
+    """
+    return get_redis_client().connection_pool.stats()
@@ -0,0 +1,225 @@
+import hashlib
+import math
+import os
+import threading
+import time
+
+from flask import current_app
+
+# Redis key marking a revoked entry (a token's jti or a stale role version) until it expires
+REVOKED_KEY = 'revoked:{entry}'
+
+# Pub/sub channel announcing new revocations to the other workers
+REVOKED_CHANNEL = 'revoked'
+
+# Blocklist entries of revoked tokens and of role versions whose tokens are stale
+TOKEN_ENTRY = 'jti:{jti}'
+ROLE_VERSION_ENTRY = 'rv:{email}:{version}'
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter: membership tests never miss an added key, and wrongly
+    report an absent key as present with probability `error_rate` at `capacity` keys.
+
+    Adds are serialized, since setting a bit is a read-modify-write of its byte that would
+    lose a concurrent add's bits; membership tests take no lock.
+    """
+
+    def __init__(self, capacity, error_rate):
+        """
+        Args:
+            capacity (int): Number of keys the filter is sized for.
+            error_rate (float): False positive probability at `capacity` keys.
+        """
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, key):
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self.bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenBlocklist:
+    """
+    Revocation list of JWTs (and of stale role versions) stored in Redis, fronted by an
+    in-process Bloom filter.
+
+    Every revoked entry is a Redis key expiring together with the tokens it affects. Each
+    worker mirrors the entries in a Bloom filter, kept in sync over pub/sub and rebuilt
+    from Redis whenever the listener (re)connects. Lookups of entries absent from the
+    filter, i.e. almost every valid token, are answered in process; only filter hits (true
+    revocations and rare false positives) are confirmed with Redis. Until the filter is
+    loaded, every lookup goes to Redis.
+
+    Entries never leave a Bloom filter, so after `capacity` further entries were added the
+    filter is rebuilt from the keys still alive in Redis. Entries revoked while a rebuild
+    scans Redis are recorded and added to the new filter before it replaces the old one,
+    since the scan may have passed their keys already.
+    """
+
+    def __init__(self, redis_client, listener, capacity=100000, error_rate=0.001):
+        """
+        Args:
+            redis_client (Redis): Client storing the revoked entries.
+            listener (PubSubListener): Listener delivering revocations from other workers.
+            capacity (int): Number of live entries the Bloom filter is sized for.
+            error_rate (float): False positive rate of the Bloom filter at `capacity` entries.
+        """
+        self.redis = redis_client
+        self.listener = listener
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = None  # None until loaded from Redis
+        self._rebuild_at = capacity  # Entry count of the filter triggering a rebuild
+        self._reload_lock = threading.Lock()  # Serializes rebuilds
+        self._lock = threading.Lock()  # Guards adds, `_reloading` and the swap of `_bloom`
+        self._reloading = None  # Entries added during a rebuild, None when not rebuilding
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+        listener.subscribe(REVOKED_CHANNEL, self._on_revoked, on_connect=self.reload)
+
+    def revoke(self, entries, ttl):
+        """
+        Revokes entries for `ttl` seconds, in this worker immediately and in the others
+        as soon as the pub/sub message arrives.
+
+        Args:
+            entries (Iterable[str]): Entries to revoke, see `TOKEN_ENTRY` and `ROLE_VERSION_ENTRY`.
+            ttl (float): Seconds until the revoked tokens expire anyway.
+        """
+        entries = list(entries)
+        if not entries:
+            return
+        ttl = max(int(math.ceil(ttl)), 1)
+        pipe = self.redis.pipeline(transaction=False)
+        for entry in entries:
+            pipe.set(REVOKED_KEY.format(entry=entry), 1, ex=ttl)
+            pipe.publish(REVOKED_CHANNEL, entry)
+        pipe.execute()
+        for entry in entries:
+            self._add(entry)
+
+    def revoke_token(self, claims):
+        """
+        Revokes a single token until its expiry.
+
+        Args:
+            claims (dict): The decoded token.
+        """
+        self.revoke([TOKEN_ENTRY.format(jti=claims['jti'])], claims['exp'] - time.time())
+
+    def is_revoked(self, entry):
+        """
+        Tells whether an entry is revoked.
+
+        Args:
+            entry (str): The entry to check.
+
+        Returns:
+            bool: True if the entry is revoked.
+        """
+        if not self.might_be_revoked(entry):
+            return False
+        return bool(self.redis.exists(REVOKED_KEY.format(entry=entry)))
+
+    def might_be_revoked(self, entry):
+        """
+        Checks an entry against the in-process Bloom filter only. Callers confirm a True
+        answer by checking `REVOKED_KEY` in Redis (as `is_revoked` does), e.g. with an
+        asyncio client.
+
+        Args:
+            entry (str): The entry to check.
+
+        Returns:
+            bool: False if the entry is certainly not revoked.
+        """
+        bloom = self._bloom
+        if bloom is None:
+            self.listener.start()
+            return True
+        return entry in bloom
+
+    def reload(self):
+        """
+        Rebuilds the Bloom filter from the revoked entries currently stored in Redis.
+        """
+        with self._reload_lock:
+            with self._lock:
+                self._reloading = []
+            try:
+                bloom = BloomFilter(self.capacity, self.error_rate)
+                prefix = len(REVOKED_KEY.format(entry=''))
+                for key in self.redis.scan_iter(match=REVOKED_KEY.format(entry='*'), count=1000):
+                    bloom.add(key[prefix:].decode())
+                with self._lock:
+                    for entry in self._reloading:
+                        bloom.add(entry)
+                    self._rebuild_at = bloom.count + self.capacity
+                    self._bloom = bloom
+            finally:
+                with self._lock:
+                    self._reloading = None
+
+    def _reset_after_fork(self):
+        # The child has no listener thread yet, so its copy of the filter would go stale
+        self._bloom = None
+        self._reload_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._reloading = None
+
+    def _on_revoked(self, entry):
+        self._add(entry.decode())
+
+    def _add(self, entry):
+        with self._lock:
+            if self._reloading is not None:
+                self._reloading.append(entry)
+            bloom = self._bloom
+            if bloom is None:
+                return
+            bloom.add(entry)
+            full = bloom.count > self._rebuild_at
+        if full:
+            self.reload()
+
+
+def init_token_blocklist(app):
+    """
+    Creates the app's token blocklist from the `TOKEN_BLOCKLIST_*` settings.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['token_blocklist'] = TokenBlocklist(
+        app.extensions['redis'],
+        app.extensions['pubsub'],
+        capacity=app.config['TOKEN_BLOCKLIST_CAPACITY'],
+        error_rate=app.config['TOKEN_BLOCKLIST_ERROR_RATE'],
+    )
+
+
+def get_token_blocklist():
+    """
+    Returns the token blocklist of the current Flask app.
+
+    Returns:
+        TokenBlocklist: The app's blocklist.
+    """
+    return current_app.extensions['token_blocklist']
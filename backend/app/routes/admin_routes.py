@@ -1,35 +1,166 @@
-from flask import jsonify, request, Blueprint
+import csv
+import io
+from flask import jsonify, request, Blueprint, Response, current_app, stream_with_context
+from sqlalchemy import String, column, select, update, values
 from app import db
 from app.models import User
-from app.utils import role_required
-from flask_jwt_extended import jwt_required
+from app.utils import role_required, ROLE_LEVELS
+from app.claims import revoke_role_versions
+from app.invalidation import invalidate_on_commit
+from app.redis_client import get_redis_pool_stats
+from app.schemas import UserListItemSchema, UserPageSchema, encode
+from app.cache_stats import get_cache_stats
+from app.metrics import collect_cache_metrics, collect_pool_metrics, render_prometheus
 
 # Blueprint for admin-related routes
 admin_blueprint = Blueprint('admin', __name__)
 
+# Columns selected by the user listing and export, in output order
+USER_COLUMNS = {
+    'id': User.id,
+    'email': User.email,
+    'role': User.role,
+    'is_google_user': User.is_google_user,
+}
+
+def parse_user_filters(args):
+    """
+    Build the WHERE conditions of a user listing from its query parameters.
+
+    Args:
+        args (MultiDict): The request's query parameters.
+
+    Returns:
+        list: SQLAlchemy conditions.
+
+    Raises:
+        ValueError: If a filter value is invalid.
+    """
+    conditions = []
+    role = args.get('role')
+    if role is not None:
+        if role not in ROLE_LEVELS:
+            raise ValueError('Unknown role')
+        conditions.append(User.role == role)
+    email_prefix = args.get('email_prefix')
+    if email_prefix:
+        # Served by the varchar_pattern_ops index on email
+        conditions.append(User.email.startswith(email_prefix, autoescape=True))
+    google = args.get('google')
+    if google is not None:
+        if google not in ('true', 'false'):
+            raise ValueError("google must be 'true' or 'false'")
+        conditions.append(User.is_google_user.is_(google == 'true'))
+    return conditions
+
+def user_page_query(conditions, cursor, limit):
+    """
+    Build the query of a page of the user listing, selecting only the listed columns.
+    One extra row is selected to tell whether a next page exists.
+
+    Args:
+        conditions (list): Filters, as returned by `parse_user_filters`.
+        cursor (int): The ID to continue after, or None for the first page.
+        limit (int): The page size.
+
+    Returns:
+        Select: The query, returning rows of `USER_COLUMNS`.
+    """
+    if cursor is not None:
+        conditions = [*conditions, User.id > cursor]
+    return select(*USER_COLUMNS.values()).where(*conditions).order_by(User.id).limit(limit + 1)
+
 @admin_blueprint.route('/users', methods=['GET'])
-@jwt_required()
 @role_required('admin')
 def list_users():
     """
-    Route to list all users in the system.
+    Route to list a page of users, ordered by ID.
     Accessible only by users with the 'admin' role.
-    
+
+    Pages use keyset pagination on `id` and only the listed columns are selected,
+    so every page costs the same whatever the number of accounts.
+
+    Query Parameters:
+        - limit (int): Number of users per page (default `USERS_PAGE_SIZE`, capped at `USERS_MAX_PAGE_SIZE`).
+        - cursor (str): The `next_cursor` returned by the previous page.
+        - role (str): Only list users with this role.
+        - email_prefix (str): Only list users whose email starts with this prefix.
+        - google (str): 'true' for Google accounts only, 'false' for password accounts only.
+
     Returns:
-        JSON response with a list of all users and their roles.
+        JSON response with the page of users and the cursor of the next page (null on the last page).
     """
-    # Query all users from the database
-    users = User.query.all()
+    limit = request.args.get('limit', str(current_app.config['USERS_PAGE_SIZE']))
+    if not limit.isdigit() or int(limit) < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    limit = min(int(limit), current_app.config['USERS_MAX_PAGE_SIZE'])
+    cursor = request.args.get('cursor')
+    if cursor is not None and not cursor.isdigit():
+        return jsonify({"error": "Invalid cursor"}), 400
+    try:
+        conditions = parse_user_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Convert the list of user objects into a dictionary
-    user_list = [{"email": user.email, "role": user.role} for user in users]
+    # One extra row tells whether another page exists
+    query = user_page_query(conditions, int(cursor) if cursor is not None else None, limit)
+    rows = db.session.execute(query).all()
 
-    # Return the user list with a 200 OK status
-    return jsonify(user_list), 200
+    users = [UserListItemSchema(*row) for row in rows[:limit]]
+    next_cursor = str(rows[limit - 1].id) if len(rows) > limit else None
+    return jsonify(UserPageSchema(users=users, next_cursor=next_cursor)), 200
+
+
+@admin_blueprint.route('/users/export', methods=['GET'])
+@role_required('admin')
+def export_users():
+    """
+    Route to stream every user matching the filters, for audits.
+    Accessible only by users with the 'admin' role.
+
+    Rows are read from a server-side cursor in batches of `EXPORT_BATCH_SIZE` and written
+    out as they arrive, so memory use stays flat regardless of the number of accounts.
+
+    Query Parameters:
+        - format (str): 'csv' (default) or 'ndjson'.
+        - role, email_prefix, google: Filters, as for `GET /admin/users`.
+
+    Returns:
+        Streamed response with the exported users.
+    """
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+    try:
+        conditions = parse_user_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    query = (select(*USER_COLUMNS.values()).where(*conditions).order_by(User.id)
+             .execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE']))
+
+    def generate_ndjson():
+        for row in db.session.execute(query):
+            yield encode(UserListItemSchema(*row)) + b'\n'
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(USER_COLUMNS)
+        for partition in db.session.execute(query).partitions():
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    if export_format == 'ndjson':
+        return Response(stream_with_context(generate_ndjson()), mimetype='application/x-ndjson')
+    return Response(stream_with_context(generate_csv()), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=users.csv'})
 
 
 @admin_blueprint.route('/promote', methods=['POST'])
-@jwt_required()
 @role_required('admin')
 def promote_user():
     """
@@ -53,9 +184,142 @@ def promote_user():
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    # Update the user's role and commit the change to the database
-    user.role = data['role']
+    # Reject roles outside the known hierarchy
+    if data['role'] not in ROLE_LEVELS:
+        return jsonify({"error": "Unknown role"}), 400
+
+    # Update the user's role (bumping its version) and commit the change to the database
+    user.set_role(data['role'])
     db.session.commit()
 
+    # Revoke access tokens carrying the previous role
+    revoke_role_versions([user])
+
     # Return a success message with a 200 OK status
     return jsonify({"message": f"User {user.email} promoted to {user.role}!"}), 200
+
+
+def read_role_assignments():
+    """
+    Read the email/role pairs of a bulk role assignment from the request.
+
+    Accepts a JSON list of `{"email", "role"}` objects (optionally wrapped as
+    `{"assignments": [...]}`), a CSV body (`Content-Type: text/csv`) or a CSV file uploaded
+    as the `file` form field. CSV input needs an `email,role` header row.
+
+    Returns:
+        list: The assignments as dicts.
+
+    Raises:
+        ValueError: If the body cannot be read.
+    """
+    if 'file' in request.files:
+        return list(csv.DictReader(io.TextIOWrapper(request.files['file'].stream, encoding='utf-8-sig')))
+    if request.mimetype == 'text/csv':
+        return list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('assignments')
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("Expected a list of {email, role} objects or a CSV upload")
+    return data
+
+@admin_blueprint.route('/promote/bulk', methods=['POST'])
+@role_required('admin')
+def promote_users_bulk():
+    """
+    Route to assign roles to many users at once.
+    Accessible only by users with the 'admin' role.
+
+    Every valid row is applied by a single `UPDATE ... FROM (VALUES ...)` statement in one
+    transaction. Afterwards the affected profiles are invalidated and the access tokens
+    carrying the previous roles are revoked, in one batch each.
+
+    Request Body:
+        A JSON list of `{"email", "role"}` objects, or CSV with an `email,role` header
+        (see `read_role_assignments`), at most `BULK_PROMOTE_MAX_ROWS` rows.
+
+    Returns:
+        JSON response with the number of updated users and the outcome of every row:
+        'updated', 'not_found', 'invalid' (missing or non-string email, unknown role) or 'duplicate'.
+    """
+    try:
+        assignments = read_role_assignments()
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({"error": str(e)}), 400
+    if not assignments:
+        return jsonify({"error": "No role assignments given"}), 400
+    if len(assignments) > current_app.config['BULK_PROMOTE_MAX_ROWS']:
+        return jsonify({"error": f"At most {current_app.config['BULK_PROMOTE_MAX_ROWS']} rows per request"}), 400
+
+    results, pending = [], {}  # pending: email -> result of the rows sent to the database
+    for item in assignments:
+        email, role = item.get('email') or '', item.get('role') or ''
+        # JSON rows may hold any value: only strings are stripped, anything else is invalid
+        email = email.strip() if isinstance(email, str) else email
+        role = role.strip() if isinstance(role, str) else role
+        result = {"email": email, "role": role}
+        if not isinstance(email, str) or not email or not isinstance(role, str) or role not in ROLE_LEVELS:
+            result["status"] = "invalid"
+        elif email in pending:
+            result["status"] = "duplicate"
+        else:
+            pending[email] = result
+        results.append(result)
+
+    updated = []
+    if pending:
+        assignment_rows = values(column('email', String), column('role', String), name='assignment').data(
+            [(email, result["role"]) for email, result in pending.items()]
+        )
+        statement = (
+            update(User)
+            .where(User.email == assignment_rows.c.email)
+            .values(role=assignment_rows.c.role, role_version=User.role_version + 1)
+            .returning(User.email, User.role_version)
+        )
+        updated = db.session.execute(statement, execution_options={'synchronize_session': False}).all()
+        # Bulk statements bypass the ORM events, so record the changed profiles explicitly;
+        # they are invalidated in one batch once the transaction commits
+        invalidate_on_commit(db.session, profiles={row.email: row.role_version for row in updated})
+        db.session.commit()
+        revoke_role_versions(updated)
+
+    updated_emails = {row.email for row in updated}
+    for email, result in pending.items():
+        result["status"] = "updated" if email in updated_emails else "not_found"
+
+    return jsonify({"updated": len(updated), "results": results}), 200
+
+
+@admin_blueprint.route('/redis/pool', methods=['GET'])
+@role_required('admin')
+def redis_pool_stats():
+    """
+    Route to inspect the shared Redis connection pool of this worker process.
+    Accessible only by users with the 'admin' role.
+
+    Returns:
+        JSON response with in-use/idle connection counts and how often callers
+        had to wait for a free connection.
+    """
+    return jsonify(get_redis_pool_stats()), 200
+
+
+@admin_blueprint.route('/metrics', methods=['GET'])
+@role_required('admin')
+def metrics():
+    """
+    Route exposing the database and Redis connection pool metrics of this worker
+    process, and the cache hit/miss counts of the whole deployment per key family
+    (as of the workers' last flush), in the Prometheus text format.
+    Accessible only by users with the 'admin' role.
+
+    Returns:
+        Plain text response with the metrics.
+    """
+    metrics = collect_pool_metrics(db.engine.pool.stats(), get_redis_pool_stats())
+    metrics += collect_cache_metrics(get_cache_stats().totals())
+    body = render_prometheus(metrics)
+    return Response(body, mimetype='text/plain; version=0.0.4')
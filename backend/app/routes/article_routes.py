@@ -1,33 +1,290 @@
-import json
-from flask import jsonify, request, Blueprint
+import base64
+import binascii
+import hashlib
+import click
+from flask import jsonify, request, Blueprint, Response, current_app, stream_with_context
+from sqlalchemy import cast, event, func, inspect, select, tuple_
+from sqlalchemy.dialects.postgresql import REAL
+from sqlalchemy.orm import Session, joinedload, load_only
 from app import db
 from app.models import Article, User
-from app.utils import role_required
+from app.article_import import ArticleImporter
+from app.utils import role_required, rate_limit
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from app.redis_client import get_redis_client
+from app.cache import CacheValue, get_cache
+from app.compression import negotiate_encoding
+from app.invalidation import invalidate_on_commit
+from app.schemas import ArticlePageSchema, ArticleSchema, conditional_json_response, encode
 
 # Blueprint for article-related routes
-article_blueprint = Blueprint('article', __name__)
+article_blueprint = Blueprint('article', __name__, cli_group='articles')
 
-# Helper function to convert datetime objects to string
-def serialize_datetime(dt):
+# Cache namespace of the article list; bumped whenever any article changes
+ARTICLES_NAMESPACE = 'articles'
+
+# Cache namespace and key of a single article; the namespace is bumped when the article changes
+ARTICLE_NAMESPACE = 'article:{article_id}'
+ARTICLE_DETAIL_KEY = 'detail'
+
+# Read-count families (see `HOT_KEY`) of article list pages and single articles, used to rank warm-ups
+HOT_ARTICLE_PAGES = 'article_pages'
+HOT_ARTICLES = 'articles'
+
+# Cache namespace of search results; entries expire after `SEARCH_CACHE_TTL` instead of being invalidated
+SEARCH_NAMESPACE = 'search'
+
+# Longest accepted search query, in characters
+MAX_SEARCH_QUERY_LENGTH = 200
+
+# Eagerly join the author of each article, loading only the email needed for serialization.
+# Without it every `article.author.email` lazy-loads the author: N+1 queries for N articles.
+AUTHOR_EMAIL_ONLY = joinedload(Article.author).load_only(User.email)
+
+# Fields an article can be serialized with, in output order
+ARTICLE_FIELDS = ('id', 'title', 'content', 'author', 'created_at')
+
+def serialize_article(article, fields):
+    """
+    Convert an article into a schema containing only the requested fields.
+    
+    Args:
+        article (Article): The article to serialize.
+        fields (tuple): Names of the fields to include (see `ARTICLE_FIELDS`).
+    
+    Returns:
+        ArticleSchema: The serialized article.
+    """
+    values = {
+        "id": lambda: article.id,
+        "title": lambda: article.title,
+        "content": lambda: article.content,
+        "author": lambda: article.author.email,
+        "created_at": lambda: article.created_at
+    }
+    return ArticleSchema(**{field: values[field]() for field in fields})
+
+def parse_fields(value):
+    """
+    Parse the `fields` query parameter into a normalized tuple of field names.
+    
+    Args:
+        value (str): Comma-separated field names, or None for all fields.
+    
+    Returns:
+        tuple: The requested fields in `ARTICLE_FIELDS` order.
+    
+    Raises:
+        ValueError: If an unknown field is requested.
+    """
+    if not value:
+        return ARTICLE_FIELDS
+    requested = {field.strip() for field in value.split(',') if field.strip()}
+    unknown = requested - set(ARTICLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in ARTICLE_FIELDS if field in requested)
+
+def encode_cursor(article):
+    """
+    Encode the keyset position of an article into an opaque pagination cursor.
+    
+    Args:
+        article (Article): The last article of a page.
+    
+    Returns:
+        str: URL-safe cursor pointing after the article.
+    """
+    raw = f"{article.created_at.isoformat()}|{article.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
     """
-    Convert datetime objects to ISO 8601 formatted string.
+    Decode a pagination cursor produced by `encode_cursor`.
     
     Args:
-        dt (datetime): A datetime object.
+        cursor (str): The cursor from the `cursor` query parameter.
     
     Returns:
-        str: ISO 8601 formatted string.
+        tuple: The (created_at, id) position to continue after.
+    
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, article_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(article_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError('Invalid cursor')
+
+def parse_page_args(args, config):
+    """
+    Parse and validate the query parameters of an article list page.
+
+    Args:
+        args (MultiDict): The query parameters.
+        config (Config): The app configuration (page size limits).
+
+    Returns:
+        tuple: The (limit, fields, cursor, position) of the page; cursor and position are
+        None for the first page.
+
+    Raises:
+        ValueError: If a parameter is invalid.
     """
-    if isinstance(dt, datetime):
-        return dt.isoformat()
-    return dt
+    limit = args.get('limit', str(config['ARTICLES_PAGE_SIZE']))
+    if not limit.isdigit() or int(limit) < 1:
+        raise ValueError('limit must be a positive integer')
+    fields = parse_fields(args.get('fields'))
+    cursor = args.get('cursor')
+    position = decode_cursor(cursor) if cursor else None
+    return min(int(limit), config['ARTICLES_MAX_PAGE_SIZE']), fields, cursor, position
+
+def article_page_key(cursor, limit, fields):
+    """
+    Return the cache key of an article list page within `ARTICLES_NAMESPACE`.
+    """
+    return f"page:{cursor or 'first'}:{limit}:{','.join(fields)}"
+
+def parse_article_page_key(page_key):
+    """
+    Parse a key produced by `article_page_key`, e.g. to rebuild the page during warm-up.
+
+    Args:
+        page_key (str): The cache key.
+
+    Returns:
+        tuple: The (limit, fields, cursor, position) of the page, as `parse_page_args`.
+
+    Raises:
+        ValueError: If the key is malformed.
+    """
+    prefix, cursor, limit, fields = page_key.split(':')
+    if prefix != 'page' or not limit.isdigit():
+        raise ValueError(f'Invalid page key {page_key}')
+    cursor = None if cursor == 'first' else cursor
+    fields = parse_fields(fields)
+    return int(limit), fields, cursor, decode_cursor(cursor) if cursor else None
+
+def article_page_query(fields, position, limit):
+    """
+    Build the query of an article list page, loading only the columns the requested
+    fields and the cursor need. One extra row is selected to tell whether a next page exists.
+
+    Args:
+        fields (tuple): The requested fields.
+        position (tuple): The (created_at, id) to continue after, or None.
+        limit (int): The page size.
+
+    Returns:
+        Select: The query, returning Article entities.
+    """
+    columns = [Article.id, Article.created_at]
+    columns += [getattr(Article, field) for field in fields if field in ('title', 'content')]
+    query = select(Article)
+    if 'author' in fields:
+        columns.append(Article.author_id)
+        query = query.options(AUTHOR_EMAIL_ONLY)
+    query = query.options(load_only(*columns))
+    if position:
+        query = query.where(tuple_(Article.created_at, Article.id) < position)
+    return query.order_by(Article.created_at.desc(), Article.id.desc()).limit(limit + 1)
+
+def article_page(articles, fields, limit):
+    """
+    Serialize the result of `article_page_query` into a page.
+
+    Args:
+        articles (list): The selected articles (up to `limit + 1`).
+        fields (tuple): The requested fields.
+        limit (int): The page size.
+
+    Returns:
+        ArticlePageSchema: The page and the cursor of the next one.
+    """
+    # The extra row only tells whether another page exists
+    next_cursor = encode_cursor(articles[limit - 1]) if len(articles) > limit else None
+    return ArticlePageSchema(
+        articles=[serialize_article(article, fields) for article in articles[:limit]],
+        next_cursor=next_cursor
+    )
+
+def article_detail(article):
+    """
+    Serialize a single article for the cache, with its last change as Last-Modified.
+
+    Args:
+        article (Article): The article, with its author loaded.
+
+    Returns:
+        CacheValue: The serialized article and its modification time.
+    """
+    return CacheValue(serialize_article(article, ARTICLE_FIELDS), article.updated_at or article.created_at)
+
+def encode_search_cursor(rank, article_id):
+    """
+    Encode the position of a search result into an opaque pagination cursor.
+
+    Args:
+        rank (float): The rank of the last result of a page.
+        article_id (int): The ID of that result.
+
+    Returns:
+        str: URL-safe cursor pointing after the result.
+    """
+    raw = f"{rank!r}|{article_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_search_cursor(cursor):
+    """
+    Decode a search cursor produced by `encode_search_cursor`.
+
+    Args:
+        cursor (str): The cursor from the `cursor` query parameter.
+
+    Returns:
+        tuple: The (rank, id) position to continue after.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        rank, article_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return float(rank), int(article_id)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise ValueError('Invalid cursor')
+
+def article_search_query(search_query, fields, position, limit):
+    """
+    Build the query of a page of search results, best matches first, loading only the
+    columns the requested fields need. One extra row is selected to tell whether a next page exists.
+
+    Args:
+        search_query (str): The normalized search query (web search syntax).
+        fields (tuple): The requested fields.
+        position (tuple): The (rank, id) to continue after, or None.
+        limit (int): The page size.
+
+    Returns:
+        Select: The query, returning (Article, rank) rows.
+    """
+    ts_query = func.websearch_to_tsquery('english', search_query)
+    rank = func.ts_rank(Article.search_vector, ts_query)
+    columns = [Article.id] + [getattr(Article, field) for field in fields if field in ('title', 'content', 'created_at')]
+    query = select(Article, rank.label('rank')).where(Article.search_vector.op('@@')(ts_query))
+    if 'author' in fields:
+        columns.append(Article.author_id)
+        query = query.options(AUTHOR_EMAIL_ONLY)
+    query = query.options(load_only(*columns))
+    if position:
+        # ts_rank returns a real: compare in the same precision as the rank the cursor came from
+        query = query.where(tuple_(rank, Article.id) < tuple_(cast(position[0], REAL), position[1]))
+    return query.order_by(rank.desc(), Article.id.desc()).limit(limit + 1)
 
 # Create an article (only accessible by users with 'editor' or 'admin' roles)
-@article_blueprint.route('/', methods=['POST'])
-@jwt_required()
+@article_blueprint.route('', methods=['POST'])
 @role_required('editor')  # Only editors can create articles
 def create_article():
     """
@@ -49,79 +306,239 @@ def create_article():
     if not data.get('title') or not data.get('content'):
         return jsonify({'error': 'Title and content are required'}), 400
 
-    # Create a new article
+    # Create a new article (the cached article list is invalidated once it is committed)
     article = Article(title=data['title'], content=data['content'], author=user)
     db.session.add(article)
     db.session.commit()
 
-    # Clear the articles cache when a new article is added
-    redis_client = get_redis_client
-    redis_client.delete('articles')
+    return jsonify({'message': 'Article created successfully!', 'id': article.id}), 201
 
-    return jsonify({'message': 'Article created successfully!'}), 201
+@event.listens_for(Article, 'after_insert')
+def collect_new_article(mapper, connection, target):
+    """
+    Records that a flush added an article; the cached article list is invalidated once
+    the transaction commits.
+    """
+    invalidate_on_commit(inspect(target).session, namespaces=[ARTICLES_NAMESPACE])
+
+@event.listens_for(Article, 'after_update')
+@event.listens_for(Article, 'after_delete')
+def collect_article_changes(mapper, connection, target):
+    """
+    Records articles changed or deleted by a flush; their cached copies and the article
+    list are invalidated once the transaction commits.
+    """
+    invalidate_on_commit(
+        inspect(target).session, namespaces=[ARTICLE_NAMESPACE.format(article_id=target.id), ARTICLES_NAMESPACE]
+    )
 
-# Get all articles (publicly accessible) with Redis caching
-@article_blueprint.route('/', methods=['GET'])
+@event.listens_for(Session, 'do_orm_execute')
+def collect_bulk_article_inserts(orm_execute_state):
+    """
+    Records bulk INSERTs of articles (e.g. imports), which bypass the mapper events.
+    Bulk UPDATEs and DELETEs do not tell which articles they hit; their callers must
+    record the affected articles with `invalidate_on_commit` themselves.
+    """
+    if orm_execute_state.is_insert and orm_execute_state.bind_mapper is inspect(Article):
+        invalidate_on_commit(orm_execute_state.session, namespaces=[ARTICLES_NAMESPACE])
+
+# Import articles in batches from an NDJSON body (requires 'editor' or 'admin' role)
+@article_blueprint.route('/bulk', methods=['POST'])
+@role_required('editor')
+def import_articles():
+    """
+    Create many articles from a streamed NDJSON body, authored by the current user.
+    Only accessible by users with 'editor' or 'admin' roles.
+
+    The body is read line by line and inserted in batches of `ARTICLES_IMPORT_BATCH_SIZE`,
+    each committed on its own; the article list cache is invalidated once per committed batch.
+
+    Request Body (NDJSON):
+        One object per line with `title` and `content`, and optionally `created_at`
+        (and `author`, which must be the current user's email).
+
+    Returns:
+        JSON response with the numbers of imported and failed articles and the failing lines.
+    """
+    user = User.query.filter_by(email=get_jwt_identity()).first()
+    if not user:
+        return jsonify({'error': 'User not found'}), 401
+
+    importer = ArticleImporter(user, batch_size=current_app.config['ARTICLES_IMPORT_BATCH_SIZE'])
+    return jsonify(importer.run(request.stream)), 200
+
+# Get a page of articles (publicly accessible) with Redis caching
+@article_blueprint.route('', methods=['GET'])
 def get_articles():
     """
-    Retrieve all articles. 
-    Articles are cached in Redis to improve performance.
+    Retrieve a page of articles, newest first.
+    Pages use keyset pagination on (created_at, id), so every page costs the same
+    regardless of how deep it is. Each page is cached under its own key, together with
+    its ETag and build time (sent as Last-Modified); conditional requests get a 304.
+    
+    Query Parameters:
+        - limit (int): Number of articles per page (default `ARTICLES_PAGE_SIZE`, capped at `ARTICLES_MAX_PAGE_SIZE`).
+        - cursor (str): Opaque cursor returned as `next_cursor` by the previous page.
+        - fields (str): Comma-separated fields to return (default: all of `ARTICLE_FIELDS`).
+    
+    Returns:
+        JSON response with the page of articles and the cursor of the next page (null on the last page).
+    """
+    try:
+        limit, fields, cursor, position = parse_page_args(request.args, current_app.config)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def build():
+        articles = db.session.execute(article_page_query(fields, position, limit)).scalars().all()
+        return article_page(articles, fields, limit)
+
+    page_key = article_page_key(cursor, limit, fields)
+    # Only first pages have their reads counted: cursors come from clients, so counting them
+    # would let anyone grow the read counts without bound
+    track = (HOT_ARTICLE_PAGES, page_key) if cursor is None else None
+    # The cached bytes are sent as is, without decoding and re-encoding them
+    entry = get_cache().get_entry(ARTICLES_NAMESPACE, page_key, build, encoding=negotiate_encoding(), track=track)
+    return conditional_json_response(entry.body, entry.etag, entry.last_modified, entry.encoding)
+
+# Search articles by title and content (publicly accessible), with short-lived result caching
+@article_blueprint.route('/search', methods=['GET'])
+def search_articles():
+    """
+    Full-text search over article titles and contents, best matches first.
+    Matches are found through the GIN index on `Article.search_vector` and ranked with
+    `ts_rank` (title matches weigh more). Pages use keyset pagination on (rank, id), and
+    each page is cached for `SEARCH_CACHE_TTL` seconds.
+
+    Query Parameters:
+        - q (str): The search query (web search syntax: "quoted phrases", OR, -excluded).
+        - limit (int): Number of results per page (default `ARTICLES_PAGE_SIZE`, capped at `ARTICLES_MAX_PAGE_SIZE`).
+        - cursor (str): Opaque cursor returned as `next_cursor` by the previous page.
+        - fields (str): Comma-separated fields to return (default: all of `ARTICLE_FIELDS`).
+
+    Returns:
+        JSON response with the page of matching articles and the cursor of the next page (null on the last page).
+    """
+    # Normalize the query so equivalent searches share cache entries
+    search_query = ' '.join(request.args.get('q', '').lower().split())
+    if not search_query:
+        return jsonify({'error': 'q is required'}), 400
+    if len(search_query) > MAX_SEARCH_QUERY_LENGTH:
+        return jsonify({'error': f'q must be at most {MAX_SEARCH_QUERY_LENGTH} characters'}), 400
+    limit = request.args.get('limit', str(current_app.config['ARTICLES_PAGE_SIZE']))
+    if not limit.isdigit() or int(limit) < 1:
+        return jsonify({'error': 'limit must be a positive integer'}), 400
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        cursor = request.args.get('cursor')
+        position = decode_search_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    limit = min(int(limit), current_app.config['ARTICLES_MAX_PAGE_SIZE'])
+
+    def build():
+        rows = db.session.execute(article_search_query(search_query, fields, position, limit)).all()
+
+        # The extra row only tells whether another page exists
+        next_cursor = None
+        if len(rows) > limit:
+            last_article, last_rank = rows[limit - 1]
+            next_cursor = encode_search_cursor(last_rank, last_article.id)
+        return ArticlePageSchema(
+            articles=[serialize_article(article, fields) for article, _ in rows[:limit]],
+            next_cursor=next_cursor
+        )
+
+    # Hash the query to bound the key length
+    query_hash = hashlib.blake2b(search_query.encode(), digest_size=16).hexdigest()
+    page_key = f"{query_hash}:{cursor or 'first'}:{limit}:{','.join(fields)}"
+    entry = get_cache().get_entry(
+        SEARCH_NAMESPACE, page_key, build, ttl=current_app.config['SEARCH_CACHE_TTL'], encoding=negotiate_encoding())
+    return conditional_json_response(entry.body, entry.etag, entry.last_modified, entry.encoding)
+
+# Export all articles as a streamed JSON array or NDJSON (requires authentication)
+@article_blueprint.route('/export', methods=['GET'])
+@jwt_required()
+@rate_limit(10, 60, algorithm='token_bucket', key_by='user')  # Exports are expensive: 10 per minute per user
+def export_articles():
+    """
+    Stream every article to the client.
+    Rows are read from a server-side cursor in batches of `EXPORT_BATCH_SIZE` and encoded
+    one at a time, so memory use stays flat regardless of the number of articles.
+    
+    Query Parameters:
+        - format (str): 'ndjson' (one JSON object per line) or 'json' (a JSON array, default).
+        - fields (str): Comma-separated fields to export (default: all of `ARTICLE_FIELDS`).
     
     Returns:
-        JSON response with a list of all articles.
+        Streamed response with the exported articles.
     """
-    redis_client = get_redis_client
+    export_format = request.args.get('format', 'json')
+    if export_format not in ('json', 'ndjson'):
+        return jsonify({'error': "format must be 'json' or 'ndjson'"}), 400
+    try:
+        fields = parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    # Check if articles are cached in Redis
-    cached_articles = redis_client.get('articles')
-    if cached_articles:
-        return jsonify(json.loads(cached_articles)), 200
+    # Select plain columns instead of hydrating ORM objects
+    columns = {
+        'id': Article.id,
+        'title': Article.title,
+        'content': Article.content,
+        'author': User.email,
+        'created_at': Article.created_at
+    }
+    query = select(*(columns[field].label(field) for field in fields)).order_by(Article.id)
+    if 'author' in fields:
+        query = query.join(User, Article.author_id == User.id)
+    query = query.execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE'])
 
-    # If not cached, fetch articles from the database
-    articles = Article.query.all()
-    result = [
-        {"title": article.title, "content": article.content, "author": article.author.email, "created_at": serialize_datetime(article.created_at)}
-        for article in articles
-    ]
+    def encode_row(row):
+        return encode(ArticleSchema(**dict(zip(fields, row))))
 
-    # Cache the articles in Redis for 1 hour (3600 seconds)
-    redis_client.set('articles', json.dumps(result), ex=3600)
+    def generate():
+        rows = db.session.execute(query)
+        if export_format == 'ndjson':
+            for row in rows:
+                yield encode_row(row) + b'\n'
+            return
+        yield b'['
+        for index, row in enumerate(rows):
+            yield (b',' if index else b'') + encode_row(row)
+        yield b']'
 
-    return jsonify(result), 200
+    mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
 
 # Get a single article by ID (publicly accessible) with Redis caching
 @article_blueprint.route('/<int:article_id>', methods=['GET'])
 def get_article(article_id):
     """
     Retrieve a single article by its ID.
-    Articles are cached in Redis to improve performance.
+    Articles are served through the read-through cache, with an ETag and a Last-Modified
+    time (the article's `updated_at`) stored alongside the cached body.
     
     Args:
         article_id (int): The ID of the article.
     
     Returns:
-        JSON response with the article data.
+        JSON response with the article data, an empty 304 if `If-None-Match` /
+        `If-Modified-Since` show the client's copy is current, or a JSON 404 error.
     """
-    redis_client = get_redis_client
-
-    # Check if the article is cached in Redis
-    cached_article = redis_client.get(f'article:{article_id}')
-    if cached_article:
-        return jsonify(json.loads(cached_article)), 200
-
-    # If not cached, fetch article from the database
-    article = Article.query.get_or_404(article_id)
-    result = {
-        "title": article.title,
-        "content": article.content,
-        "author": article.author.email,
-        "created_at": serialize_datetime(article.created_at)
-    }
-
-    # Cache the article in Redis for 1 hour
-    redis_client.set(f'article:{article_id}', json.dumps(result), ex=3600)
+    def build():
+        article = db.session.get(Article, article_id, options=[AUTHOR_EMAIL_ONLY])
+        if article is None:
+            raise LookupError(article_id)
+        return article_detail(article)
 
-    return jsonify(result), 200
+    try:
+        entry = get_cache().get_entry(
+            ARTICLE_NAMESPACE.format(article_id=article_id), ARTICLE_DETAIL_KEY, build,
+            encoding=negotiate_encoding(), track=(HOT_ARTICLES, article_id))
+    except LookupError:
+        return jsonify({'error': 'Article not found'}), 404
+    return conditional_json_response(entry.body, entry.etag, entry.last_modified, entry.encoding)
 
 # Update an article (only accessible by the article's author or admins)
 @article_blueprint.route('/<int:article_id>', methods=['PUT'])
@@ -146,4 +563,71 @@ def update_article(article_id):
     user = User.query.filter_by(email=current_user_email).first()
 
     # Fetch the article to be updated
-   
+    article = Article.query.get_or_404(article_id)
+
+    # Only the article's author or admins can update the article (compare ids to avoid loading the author)
+    if article.author_id != user.id and user.role != 'admin':
+        return jsonify({'error': 'Access forbidden: You are not the author or an admin'}), 403
+
+    # Update article details if provided
+    if data.get('title'):
+        article.title = data['title']
+    if data.get('content'):
+        article.content = data['content']
+
+    # The cached article and the article list are invalidated once the change is committed
+    db.session.commit()
+
+    return jsonify({'message': 'Article updated successfully!'}), 200
+
+# Delete an article (only accessible by admins)
+@article_blueprint.route('/<int:article_id>', methods=['DELETE'])
+@role_required('admin')
+def delete_article(article_id):
+    """
+    Delete an existing article by its ID.
+    Only accessible by users with 'admin' role.
+    
+    Args:
+        article_id (int): The ID of the article to be deleted.
+    
+    Returns:
+        JSON response with success message.
+    """
+    # Fetch the article to be deleted
+    article = Article.query.get_or_404(article_id)
+    db.session.delete(article)
+    # The cached article and the article list are invalidated once the deletion is committed
+    db.session.commit()
+
+    return jsonify({'message': 'Article deleted successfully!'}), 200
+
+# Import articles from an NDJSON file: `flask articles import FILE --author EMAIL`
+@article_blueprint.cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--author', 'author_email', required=True, help="Email of the author of records without an `author` field.")
+@click.option('--batch-size', type=click.IntRange(min=1), default=None,
+              help="Articles per INSERT and transaction (defaults to ARTICLES_IMPORT_BATCH_SIZE).")
+def import_articles_command(source, author_email, batch_size):
+    """
+    Import articles from an NDJSON file ('-' for stdin). Records may name their author by email.
+    """
+    author = User.query.filter_by(email=author_email).first()
+    if not author:
+        raise click.BadParameter(f"No user with email {author_email}", param_hint='--author')
+
+    def report_batch():
+        click.echo(f"Imported {importer.imported} articles ({importer.failed} failed)", err=True)
+
+    importer = ArticleImporter(
+        author,
+        allow_other_authors=True,
+        batch_size=batch_size or current_app.config['ARTICLES_IMPORT_BATCH_SIZE'],
+        after_batch=report_batch
+    )
+    report = importer.run(source)
+    for error in report['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    click.echo(f"{report['imported']} imported, {report['failed']} failed")
+    if report['failed']:
+        raise click.exceptions.Exit(1)
@@ -1,195 +1,289 @@
-import json
-from flask import jsonify, request, Blueprint
-from app import db
-from app.models import Article, User
-from app.utils import role_required
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+import time
+import click
+from flask import jsonify, request, Blueprint, current_app, url_for
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token, get_jwt, get_jwt_identity, jwt_required
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app import db, oauth
+from app.models import User
+from app.passwords import HasherBusyError, calibrate, get_password_hasher
 from app.redis_client import get_redis_client
+from app.claims import revoke_role_versions
+from app.revocation import get_token_blocklist
+from app.utils import rate_limit
 
-# Blueprint for article-related routes
-article_blueprint = Blueprint('article', __name__)
+# Blueprint for authentication routes
+auth_blueprint = Blueprint('auth', __name__)
 
-# Helper function to convert datetime objects to string
-def serialize_datetime(dt):
+# Redis key remembering that no account exists for an email (negative lookup cache)
+UNKNOWN_EMAIL_KEY = 'auth:unknown:{email}'
+
+# Redis key marking a refresh token as used; refresh tokens are single use
+USED_REFRESH_TOKEN_KEY = 'auth:refresh_used:{jti}'
+
+# Postgres advisory lock serializing first-admin bootstraps (see `create_user`)
+BOOTSTRAP_ADMIN_LOCK_ID = 7301
+
+def issue_tokens(identity):
     """
-    Convert datetime objects to ISO 8601 formatted string.
-    
+    Create a new access/refresh token pair.
+
     Args:
-        dt (datetime): A datetime object.
-    
+        identity (User | str): The user (or their email) the tokens are issued for.
+
     Returns:
-        str: ISO 8601 formatted string.
+        dict: The access and refresh tokens.
     """
-    if isinstance(dt, datetime):
-        return dt.isoformat()
-    return dt
+    return {
+        "access_token": create_access_token(identity=identity),
+        "refresh_token": create_refresh_token(identity=identity)
+    }
 
-# Create an article (only accessible by users with 'editor' or 'admin' roles)
-@article_blueprint.route('/', methods=['POST'])
-@jwt_required()
-@role_required('editor')  # Only editors can create articles
-def create_article():
+def forget_unknown_email(email):
     """
-    Create a new article.
-    Only accessible by users with 'editor' or 'admin' roles.
-    
-    Request Body (JSON):
-        - title (str): The title of the article.
-        - content (str): The content of the article.
-    
+    Drop an email from the negative lookup cache once an account exists for it.
+
+    Args:
+        email (str): The email of the new account.
+    """
+    get_redis_client().delete(UNKNOWN_EMAIL_KEY.format(email=email))
+
+def create_user(**fields):
+    """
+    Create a user, making the very first account an admin when `BOOTSTRAP_FIRST_ADMIN` is enabled
+    (tests and local setups; production admins are seeded with `flask auth create-admin`).
+
+    The check holds a transaction-scoped advisory lock until the caller commits, so concurrent
+    first registrations cannot both become admin.
+
+    Args:
+        **fields: Column values of the new user.
+
     Returns:
-        JSON response with success message or error message.
+        User: The new (uncommitted) user.
     """
-    data = request.get_json()
-    current_user_email = get_jwt_identity()
-    user = User.query.filter_by(email=current_user_email).first()
+    user = User(**fields)
+    if current_app.config['BOOTSTRAP_FIRST_ADMIN']:
+        db.session.execute(select(func.pg_advisory_xact_lock(BOOTSTRAP_ADMIN_LOCK_ID)))
+        if not db.session.query(User.query.exists()).scalar():
+            user.role = 'admin'
+    db.session.add(user)
+    return user
 
-    # Check if both title and content are provided
-    if not data.get('title') or not data.get('content'):
-        return jsonify({'error': 'Title and content are required'}), 400
+@auth_blueprint.errorhandler(HasherBusyError)
+def hasher_busy(error):
+    """
+    Shed load when the password hashing pool is saturated instead of queueing requests.
+    """
+    response = jsonify({"error": "Authentication is temporarily overloaded, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
-    # Create a new article
-    article = Article(title=data['title'], content=data['content'], author=user)
-    db.session.add(article)
-    db.session.commit()
+@auth_blueprint.route('/register', methods=['POST'])
+@rate_limit('AUTH_REGISTER_RATE_LIMIT', 'AUTH_REGISTER_RATE_WINDOW')  # Per client IP: hashing is expensive
+def register():
+    """
+    Register a new user with an email and password.
 
-    # Clear the articles cache when a new article is added
-    redis_client = get_redis_client
-    redis_client.delete('articles')
+    Request Body (JSON):
+        - email (str): The user's email.
+        - password (str): The user's password.
 
-    return jsonify({'message': 'Article created successfully!'}), 201
+    Returns:
+        JSON response with a success message (201), or an error if the data is missing (400)
+        or the email is already registered (409).
+    """
+    data = request.get_json() or {}
+    email, password = data.get('email'), data.get('password')
+
+    if not email or not password:
+        return jsonify({"error": "Email and password are required"}), 400
+    if User.query.filter_by(email=email).first():
+        return jsonify({"error": "User already exists"}), 409
+
+    user = create_user(email=email)
+    user.set_password(password)  # Hashed on the bounded hashing pool
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent registration of the same email committed first
+        db.session.rollback()
+        return jsonify({"error": "User already exists"}), 409
+    forget_unknown_email(email)
+
+    return jsonify({"message": "User registered successfully!"}), 201
 
-# Get all articles (publicly accessible) with Redis caching
-@article_blueprint.route('/', methods=['GET'])
-def get_articles():
+@auth_blueprint.route('/login', methods=['POST'])
+@rate_limit('AUTH_LOGIN_RATE_LIMIT', 'AUTH_LOGIN_RATE_WINDOW')  # Per client IP: hashing is expensive
+def login():
     """
-    Retrieve all articles. 
-    Articles are cached in Redis to improve performance.
-    
+    Log in with an email and password.
+
+    Emails without an account are remembered in Redis for `AUTH_NEGATIVE_CACHE_TTL` seconds,
+    so repeated attempts against unknown emails are rejected without a database query. The
+    first attempt still checks the password against a dummy hash, so that the response time
+    does not tell whether the account exists.
+
+    Request Body (JSON):
+        - email (str): The user's email.
+        - password (str): The user's password.
+
     Returns:
-        JSON response with a list of all articles.
+        JSON response with an access token and a refresh token, or a 401 error.
     """
-    redis_client = get_redis_client
+    data = request.get_json() or {}
+    email, password = data.get('email'), data.get('password')
+    if not email or not password:
+        return jsonify({"error": "Email and password are required"}), 400
+
+    redis_client = get_redis_client()
+    unknown_key = UNKNOWN_EMAIL_KEY.format(email=email)
+    if redis_client.exists(unknown_key):
+        return jsonify({"error": "Invalid credentials"}), 401
 
-    # Check if articles are cached in Redis
-    cached_articles = redis_client.get('articles')
-    if cached_articles:
-        return jsonify(json.loads(cached_articles)), 200
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        get_password_hasher().verify_dummy(password)
+        redis_client.set(unknown_key, 1, ex=current_app.config['AUTH_NEGATIVE_CACHE_TTL'])
+        return jsonify({"error": "Invalid credentials"}), 401
 
-    # If not cached, fetch articles from the database
-    articles = Article.query.all()
-    result = [
-        {"title": article.title, "content": article.content, "author": article.author.email, "created_at": serialize_datetime(article.created_at)}
-        for article in articles
-    ]
+    if not user.check_password(password):
+        return jsonify({"error": "Invalid credentials"}), 401
 
-    # Cache the articles in Redis for 1 hour (3600 seconds)
-    redis_client.set('articles', json.dumps(result), ex=3600)
+    # Upgrade hashes created with an outdated method or cost now that the password is known
+    hasher = get_password_hasher()
+    if hasher.needs_rehash(user.password):
+        hasher.rehash_in_background(current_app._get_current_object(), user.id, user.password, password)
 
-    return jsonify(result), 200
+    return jsonify(issue_tokens(user)), 200
 
-# Get a single article by ID (publicly accessible) with Redis caching
-@article_blueprint.route('/<int:article_id>', methods=['GET'])
-def get_article(article_id):
+@auth_blueprint.route('/refresh', methods=['POST'])
+@jwt_required(refresh=True)
+def refresh():
     """
-    Retrieve a single article by its ID.
-    Articles are cached in Redis to improve performance.
-    
-    Args:
-        article_id (int): The ID of the article.
-    
+    Exchange a refresh token for a new access/refresh token pair (refresh token rotation).
+
+    Each refresh token can be used once: it is marked as used in Redis until it expires,
+    and presenting it again is rejected. The new access token carries the user's current
+    role, so clients pick up role changes without logging in again.
+
     Returns:
-        JSON response with the article data.
-    """
-    redis_client = get_redis_client
-
-    # Check if the article is cached in Redis
-    cached_article = redis_client.get(f'article:{article_id}')
-    if cached_article:
-        return jsonify(json.loads(cached_article)), 200
-
-    # If not cached, fetch article from the database
-    article = Article.query.get_or_404(article_id)
-    result = {
-        "title": article.title,
-        "content": article.content,
-        "author": article.author.email,
-        "created_at": serialize_datetime(article.created_at)
-    }
+        JSON response with a new access token and refresh token, or a 401 error.
+    """
+    claims = get_jwt()
+    ttl = max(int(claims['exp'] - time.time()), 1)  # Remember the token until it expires anyway
+    first_use = get_redis_client().set(USED_REFRESH_TOKEN_KEY.format(jti=claims['jti']), 1, nx=True, ex=ttl)
+    if not first_use:
+        return jsonify({"error": "Refresh token has already been used"}), 401
 
-    # Cache the article in Redis for 1 hour
-    redis_client.set(f'article:{article_id}', json.dumps(result), ex=3600)
+    email = get_jwt_identity()
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        return jsonify({"error": "User not found"}), 401
 
-    return jsonify(result), 200
+    return jsonify(issue_tokens(user)), 200
 
-# Update an article (only accessible by the article's author or admins)
-@article_blueprint.route('/<int:article_id>', methods=['PUT'])
+@auth_blueprint.route('/logout', methods=['POST'])
 @jwt_required()
-def update_article(article_id):
+def logout():
     """
-    Update an existing article by its ID.
-    Only accessible by the article's author or users with 'admin' role.
-    
-    Args:
-        article_id (int): The ID of the article to be updated.
-    
-    Request Body (JSON):
-        - title (str): The new title of the article (optional).
-        - content (str): The new content of the article (optional).
-    
+    Log out by revoking the access token, and the refresh token if one is given.
+
+    Revoked tokens are rejected by every worker until they expire.
+
+    Request Body (JSON, optional):
+        - refresh_token (str): The refresh token issued with the access token.
+
     Returns:
-        JSON response with success or error message.
+        JSON response with a success message, or a 400 error if the refresh token is invalid.
     """
-    data = request.get_json()
-    current_user_email = get_jwt_identity()
-    user = User.query.filter_by(email=current_user_email).first()
+    claims = get_jwt()
+    revoked = [claims]
 
-    # Fetch the article to be updated
-    article = Article.query.get_or_404(article_id)
+    refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+    if refresh_token:
+        try:
+            refresh_claims = decode_token(refresh_token)
+        except (PyJWTError, JWTExtendedException):
+            return jsonify({"error": "Invalid refresh token"}), 400
+        if refresh_claims.get('type') != 'refresh' or refresh_claims['sub'] != claims['sub']:
+            return jsonify({"error": "Invalid refresh token"}), 400
+        revoked.append(refresh_claims)
 
-    # Only the article's author or admins can update the article
-    if article.author != user and user.role != 'admin':
-        return jsonify({'error': 'Access forbidden: You are not the author or an admin'}), 403
+    blocklist = get_token_blocklist()
+    for token_claims in revoked:
+        blocklist.revoke_token(token_claims)
 
-    # Update article details if provided
-    if data.get('title'):
-        article.title = data['title']
-    if data.get('content'):
-        article.content = data['content']
+    return jsonify({"message": "Logged out"}), 200
 
-    db.session.commit()
-
-    # Clear the cache for the updated article and the article list
-    redis_client = get_redis_client
-    redis_client.delete(f'article:{article_id}')
-    redis_client.delete('articles')
+@auth_blueprint.route('/google', methods=['GET'])
+def google_login():
+    """
+    Start the Google OAuth login by redirecting to Google's consent page.
 
-    return jsonify({'message': 'Article updated successfully!'}), 200
+    Returns:
+        A redirect to Google.
+    """
+    redirect_uri = url_for('auth.google_callback', _external=True)
+    return oauth.google.authorize_redirect(redirect_uri)
 
-# Delete an article (only accessible by admins)
-@article_blueprint.route('/<int:article_id>', methods=['DELETE'])
-@jwt_required()
-@role_required('admin')
-def delete_article(article_id):
+@auth_blueprint.route('/google/callback', methods=['GET'])
+def google_callback():
     """
-    Delete an existing article by its ID.
-    Only accessible by users with 'admin' role.
-    
-    Args:
-        article_id (int): The ID of the article to be deleted.
-    
+    Complete the Google OAuth login, creating the user on their first login.
+
     Returns:
-        JSON response with success message.
+        JSON response with an access token and a refresh token.
     """
-    # Fetch the article to be deleted
-    article = Article.query.get_or_404(article_id)
-    db.session.delete(article)
-    db.session.commit()
+    token = oauth.google.authorize_access_token()
+    email = oauth.google.get('userinfo', token=token).json()['email']
+
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        user = create_user(email=email, is_google_user=True)
+        db.session.commit()
+        forget_unknown_email(email)
 
-    # Clear the cache for the deleted article and the article list
-    redis_client = get_redis_client
-    redis_client.delete(f'article:{article_id}')
-    redis_client.delete('articles')
+    return jsonify(issue_tokens(user)), 200
 
-    return jsonify({'message': 'Article deleted successfully!'}), 200
+@auth_blueprint.cli.command('calibrate-hash')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default='scrypt', show_default=True)
+@click.option('--budget-ms', type=float, default=None, help="Target hashing time per login (defaults to PASSWORD_HASH_BUDGET_MS).")
+def calibrate_hash(algorithm, budget_ms):
+    """
+    Measure password hashing on this machine and print the `PASSWORD_HASH_METHOD` fitting the latency budget.
+    """
+    budget_ms = budget_ms or current_app.config['PASSWORD_HASH_BUDGET_MS']
+    method, duration = calibrate(algorithm, budget_ms)
+    if duration > budget_ms:
+        click.echo(f"Warning: the minimum cost takes {duration:.0f} ms, above the {budget_ms:.0f} ms budget", err=True)
+    click.echo(f"# {duration:.0f} ms per hash (budget {budget_ms:.0f} ms)")
+    click.echo(f"PASSWORD_HASH_METHOD={method}")
+
+@auth_blueprint.cli.command('create-admin')
+@click.argument('email')
+@click.password_option(help="Password of a new account (prompted for if omitted).")
+def create_admin(email, password):
+    """
+    Create an admin account, or promote the existing account of EMAIL to admin.
+    """
+    user = User.query.filter_by(email=email).first()
+    if user:
+        if user.role == 'admin':
+            click.echo(f"{email} is already an admin")
+            return
+        # Bump the role version so tokens issued with the previous role are rejected
+        user.set_role('admin')
+        db.session.commit()
+        revoke_role_versions([user])
+        click.echo(f"Promoted {email} to admin")
+        return
+
+    user = User(email=email, role='admin')
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    forget_unknown_email(email)
+    click.echo(f"Created admin {email}")
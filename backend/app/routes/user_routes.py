@@ -2,47 +2,44 @@ from flask import jsonify, request, Blueprint
 from app import db
 from app.models import User
 from flask_jwt_extended import jwt_required
-import redis
-import json
+from app.profile_cache import get_profile_cache
+from app.schemas import ProfileSchema, conditional_json_response, encode
 
 # Define Blueprint for user-related routes
 user_blueprint = Blueprint('user', __name__)
 
-# Initialize Redis connection (assumes Redis is running on the same network)
-r = redis.from_url('redis://redis:6379')
-
 @user_blueprint.route('/profile/<email>', methods=['GET'])
 @jwt_required()
 def get_profile(email):
     """
     Retrieves the profile of a user by their email.
     
-    This route first checks if the user's profile is cached in Redis. If cached, the profile is returned directly
-    from Redis. If not, it queries the database to fetch the user's profile, caches it in Redis, and returns the data.
+    This route first checks the profile cache: the worker's in-process tier, then Redis. If cached, the profile
+    is returned directly. If not, it queries the database to fetch the user's profile, caches it in both tiers
+    (in Redis for a TTL growing with the profile's popularity), and returns the data. Cached profiles are
+    invalidated in every worker when the user's role changes.
+    Responses carry an ETag; a matching `If-None-Match` is answered with an empty 304.
 
     Args:
         email (str): The email of the user whose profile is being retrieved.
     
     Returns:
         JSON: The user's profile information (email and role).
+        304: If the client's copy is current.
         404: If the user does not exist.
     """
-    # Check if the profile is cached in Redis
-    cached_profile = r.get(f"profile:{email}")
-    if cached_profile:
-        # Return cached profile if found
-        return jsonify(json.loads(cached_profile)), 200
+    def build():
+        # Query the database for the user's profile and its role version (None if the user does not exist)
+        user = User.query.filter_by(email=email).first()
+        return (encode(ProfileSchema(email=user.email, role=user.role)), user.role_version) if user else None
 
-    # Query the database for the user's profile
-    user = User.query.filter_by(email=email).first()
+    # Check the profile cache (in memory, then Redis), caching the profile on a miss for a TTL
+    # growing with its popularity
+    profile = get_profile_cache().get_or_build(email, build)
 
     # If user is not found, return a 404 error
-    if not user:
+    if profile is None:
         return jsonify({"error": "User not found"}), 404
 
-    # Cache the user's profile in Redis (expires in 1 hour)
-    profile_data = {"email": user.email, "role": user.role}
-    r.set(f"profile:{email}", json.dumps(profile_data), ex=3600)
-
-    # Return the user's profile
-    return jsonify(profile_data), 200
+    # Return the cached profile bytes as is (or a 304)
+    return conditional_json_response(profile.body, profile.etag)
@@ -0,0 +1,49 @@
+import json
+import click
+from flask import jsonify, Blueprint, current_app
+from sqlalchemy import text
+from app import db
+from app.redis_client import get_redis_client
+from app.warmup import create_cache_warmer, get_warmup
+
+# Blueprint for readiness and cache warm-up (CLI group `flask cache`)
+warmup_blueprint = Blueprint('warmup', __name__, cli_group='cache')
+
+# Readiness probe of the platform (e.g. Cloud Run startup probe)
+@warmup_blueprint.route('/readyz', methods=['GET'])
+def readyz():
+    """
+    Tell whether this worker should receive traffic.
+
+    A worker is ready once its startup warm-up (`CACHE_WARMUP_ON_STARTUP`) is done or has
+    exceeded `CACHE_WARMUP_DEADLINE`, and Postgres and Redis answer.
+
+    Returns:
+        200: JSON with status "ready" and the warm-up report, if any.
+        503: JSON with status "warming" or "unavailable".
+    """
+    warmup = get_warmup()
+    if not warmup.ready():
+        return jsonify({"status": "warming"}), 503
+    try:
+        db.session.execute(text('SELECT 1'))
+        get_redis_client().ping()
+    except Exception:
+        current_app.logger.warning("Readiness check failed", exc_info=True)
+        return jsonify({"status": "unavailable"}), 503
+    return jsonify({"status": "ready", "warmup": warmup.report}), 200
+
+# Warm the caches from the command line, e.g. as a post-deploy step
+@warmup_blueprint.cli.command('warm')
+@click.option('--deadline', type=float, default=None, help='Seconds the warm-up may take (default CACHE_WARMUP_DEADLINE)')
+def warm_command(deadline):
+    """
+    Precompute the most read article pages, articles and profiles.
+
+    Entries are ranked by their recorded read counts; the first article page is always
+    warmed. Prints the warm-up report as JSON.
+    """
+    if deadline is None:
+        deadline = current_app.config['CACHE_WARMUP_DEADLINE']
+    report = create_cache_warmer(current_app).run(deadline)
+    click.echo(json.dumps(report))
@@ -0,0 +1,137 @@
+from datetime import datetime
+from typing import List, Optional, Union
+
+import msgspec
+from flask import current_app, request
+from flask.json.provider import JSONProvider, _default
+
+from app.compression import variant_etag
+
+
+class ArticleSchema(msgspec.Struct, omit_defaults=True):
+    """
+    Serialized article. Fields left UNSET (not requested through `fields=`) are omitted.
+    """
+    id: Union[int, msgspec.UnsetType] = msgspec.UNSET
+    title: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    content: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    author: Union[str, msgspec.UnsetType] = msgspec.UNSET
+    created_at: Union[datetime, msgspec.UnsetType] = msgspec.UNSET
+
+
+class ArticlePageSchema(msgspec.Struct):
+    """
+    A page of the article list and the cursor of the following page.
+    """
+    articles: List[ArticleSchema]
+    next_cursor: Optional[str] = None
+
+
+class ProfileSchema(msgspec.Struct):
+    """
+    Public profile of a user.
+    """
+    email: str
+    role: str
+
+
+class UserListItemSchema(msgspec.Struct):
+    """
+    Entry of the admin user listing and export.
+    """
+    id: int
+    email: str
+    role: str
+    is_google_user: Optional[bool]
+
+
+class UserPageSchema(msgspec.Struct):
+    """
+    A page of the admin user listing and the cursor of the following page.
+    """
+    users: List[UserListItemSchema]
+    next_cursor: Optional[str] = None
+
+
+# Shared encoder; unknown types fall back to Flask's default conversions (dates, dataclasses, ...)
+encoder = msgspec.json.Encoder(enc_hook=_default)
+
+
+def encode(obj):
+    """
+    Encodes a Struct (or any JSON-compatible value) to JSON bytes.
+
+    Args:
+        obj: The value to encode.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return encoder.encode(obj)
+
+
+def json_bytes_response(body, status=200):
+    """
+    Builds a JSON response from an already encoded body, e.g. a cache hit, without
+    decoding and re-encoding it.
+
+    Args:
+        body (bytes): The encoded JSON document.
+        status (int): The HTTP status code.
+
+    Returns:
+        Response: The Flask response.
+    """
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def conditional_json_response(body, etag, last_modified=None, encoding=None):
+    """
+    Builds a JSON response from an already encoded body and its validators, answering
+    `If-None-Match` / `If-Modified-Since` with an empty 304 when the client's copy is current.
+
+    Responses are marked `Cache-Control: no-cache`, so clients may keep them but revalidate
+    on every use.
+
+    Args:
+        body (bytes): The encoded JSON document, compressed with `encoding` if given.
+        etag (str): The strong, quoted ETag of the uncompressed document.
+        last_modified (datetime): When the underlying data last changed, if known.
+        encoding (str): Content coding of `body` ('gzip', 'br'), or None.
+
+    Returns:
+        Response: The Flask response (200 or 304).
+    """
+    response = json_bytes_response(body)
+    # Every encoding of the document is a distinct representation with its own ETag
+    response.headers['ETag'] = variant_etag(etag, encoding)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+class MsgspecJSONProvider(JSONProvider):
+    """
+    Flask JSON provider backed by msgspec, used by `jsonify` and `request.get_json`.
+
+    Struct instances are encoded natively; keys of plain dicts keep their insertion
+    order instead of being sorted.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return encoder.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        try:
+            return msgspec.json.decode(s)
+        except msgspec.DecodeError as e:
+            # Flask turns ValueError into a 400 Bad Request for invalid request bodies
+            raise ValueError(str(e)) from e
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(encoder.encode(obj), mimetype='application/json')
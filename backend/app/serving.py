@@ -0,0 +1,60 @@
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from app import db
+
+
+def init_proxy_fix(app):
+    """
+    Trusts the `X-Forwarded-For` / `X-Forwarded-Proto` headers set by the `PROXY_FIX_*`
+    proxies in front of the app (e.g. Cloud Run's front end), so `request.remote_addr` is
+    the client's address rather than the proxy's. Per-address rate limits depend on it.
+
+    Each setting is the number of proxies appending to the header; only that many values,
+    counted from the right, are trusted, so clients cannot spoof their address. With 0
+    (the default) the header is ignored.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    x_for, x_proto = app.config['PROXY_FIX_X_FOR'], app.config['PROXY_FIX_X_PROTO']
+    if x_for or x_proto:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=x_for, x_proto=x_proto, x_host=0, x_port=0, x_prefix=0)
+
+
+def reset_after_fork(app):
+    """
+    Drops the connections a forked worker inherited from the process that created the app.
+
+    Sockets copied by `fork()` are shared with the parent and the sibling workers, so
+    using them would interleave the traffic of several processes on one connection. The
+    database pool is replaced without closing the parent's connections, and the Redis
+    pool is emptied so every worker opens its own. The pub/sub listener, token blocklist,
+    password hasher, cache refresher and cache statistics reset their threads and buffers
+    themselves (see `os.register_at_fork`).
+
+    Args:
+        app (Flask): The app created before the fork.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    app.extensions['redis'].connection_pool.reset()
+
+
+def shutdown(app):
+    """
+    Releases the app's background threads and connections when a worker exits, after
+    the in-flight requests have completed.
+
+    Queued background work (password rehashes, cache refreshes) is finished first, since
+    it still needs the database, and the buffered cache statistics are flushed to Redis.
+
+    Args:
+        app (Flask): The app served by the exiting worker.
+    """
+    app.extensions['password_hasher'].shutdown(wait=True)
+    app.extensions['cache'].shutdown(wait=True)
+    app.extensions['cache_stats'].flush()
+    app.extensions['pubsub'].stop()
+    with app.app_context():
+        db.engine.dispose()
+    app.extensions['redis'].connection_pool.disconnect()
@@ -1,47 +1,38 @@
 from functools import wraps
-from flask import request, jsonify
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask import jsonify, current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
 from app.models import User
-from app.redis_client import get_redis_client
+from app.rate_limit import rate_limit  # noqa: F401 (re-exported: routes import their decorators from utils)
+from app.claims import ROLE_CLAIM, ROLE_VERSION_CLAIM, is_role_version_stale
 
-def rate_limit(max_attempts, window_seconds):
+# Role hierarchy: a role grants access to every route requiring the same or a lower level
+ROLE_LEVELS = {'user': 0, 'editor': 1, 'admin': 2}
+
+def has_role(user_role, required_role):
     """
-    A decorator to enforce rate limiting based on the number of allowed requests in a time window.
-    
+    Checks whether a role satisfies a required role, honouring the role hierarchy
+    (admin > editor > user).
+
     Args:
-        max_attempts (int): Maximum number of requests allowed.
-        window_seconds (int): Time window in seconds for the rate limit.
-        
+        user_role (str): The role held by the user.
+        required_role (str): The role required by the route.
+
     Returns:
-        Function: The decorated function that applies rate limiting.
+        bool: True if the user's role is at least the required role.
     """
-    def decorator(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            # Get the client's IP address to use as the rate limit key
-            ip = request.remote_addr
-            key = f"rate_limit:{ip}"
-            redis_client = get_redis_client()  # Initialize Redis client
-
-            # Check the number of current attempts made by the IP
-            current_attempts = redis_client.get(key)
-
-            # If attempts exceed the limit, return a 429 Too Many Requests error
-            if current_attempts and int(current_attempts) >= max_attempts:
-                return jsonify({"error": "Too many requests"}), 429
-
-            # Increment the number of attempts and set an expiration for the time window
-            redis_client.incr(key)
-            redis_client.expire(key, window_seconds)
-            
-            return f(*args, **kwargs)
-        return wrapped
-    return decorator
+    return ROLE_LEVELS.get(user_role, -1) >= ROLE_LEVELS.get(required_role, len(ROLE_LEVELS))
 
 def role_required(role):
     """
     A decorator to enforce role-based access control (RBAC) on routes.
 
+    In 'claims' mode (the default, see `RBAC_AUTHZ_MODE`) the role and role version are
+    read from the JWT claims and no database query is made. Tokens whose role version was
+    marked stale by a later role change are rejected (see `app.claims`). Tokens
+    without role claims, and the 'database' mode, fall back to a user lookup.
+
+    The decorator applies `jwt_required()` itself, so routes must not stack it again.
+
     Args:
         role (str): The role required to access the decorated route.
 
@@ -54,10 +45,19 @@ def role_required(role):
         def decorated_view(*args, **kwargs):
             # Get the current user's email from the JWT token
             current_user_email = get_jwt_identity()
-            user = User.query.filter_by(email=current_user_email).first()
+            claims = get_jwt()
+
+            if current_app.config['RBAC_AUTHZ_MODE'] == 'claims' and ROLE_CLAIM in claims:
+                # Reject tokens minted before the user's latest role change
+                if is_role_version_stale(current_user_email, claims.get(ROLE_VERSION_CLAIM)):
+                    return jsonify({"error": "Token is stale, please log in again"}), 401
+                user_role = claims[ROLE_CLAIM]
+            else:
+                user = User.query.filter_by(email=current_user_email).first()
+                user_role = user.role if user else None
 
-            # If the user doesn't exist or their role doesn't match, return a 403 Forbidden error
-            if not user or user.role != role:
+            # If the user doesn't exist or their role is insufficient, return a 403 Forbidden error
+            if not user_role or not has_role(user_role, role):
                 return jsonify({"error": "Access forbidden: Insufficient permissions"}), 403
 
             return fn(*args, **kwargs)
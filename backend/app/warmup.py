@@ -0,0 +1,321 @@
+import os
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from app import db
+from app.cache import ENTRY_KEY, GENERATION_KEY, HOT_KEY, build_entry
+from app.models import Article, User
+from app.profile_cache import HOT_PROFILES, PROFILE_KEY
+from app.routes.article_routes import (
+    ARTICLE_DETAIL_KEY, ARTICLE_FIELDS, ARTICLE_NAMESPACE, ARTICLES_NAMESPACE, AUTHOR_EMAIL_ONLY, HOT_ARTICLE_PAGES,
+    HOT_ARTICLES, article_detail, article_page, article_page_key, article_page_query, parse_article_page_key
+)
+from app.schemas import ProfileSchema, encode
+
+# Held by the process running the startup warm-up, so concurrently starting workers do not
+# all rebuild the same entries; the others wait for it to finish
+WARMUP_LOCK_KEY = 'warmup:lock'
+
+
+class CacheWarmer:
+    """
+    Precomputes the most read cache entries, e.g. after a deploy or a cold start, so the
+    first wave of traffic does not fall through to Postgres.
+
+    Entries are ranked by the read counts recorded in `HOT_KEY` sorted sets, and stored
+    with the TTL their counts earn (see `CacheStats.ttl`). The first article list page is
+    always warmed, even without any counts. Missing articles and profiles are loaded with
+    one query and stored with one Redis pipeline per batch; list pages are built one by one
+    through the read-through cache. Entries already cached are left alone.
+
+    Read counts are aged and trimmed by `CacheStats` as they are flushed, not here, so
+    they stay bounded whether or not warm-ups run.
+    """
+
+    def __init__(self, cache, profile_cache, pages=20, articles=500, profiles=1000, batch_size=100):
+        """
+        Args:
+            cache (ReadThroughCache): The cache storing article pages and articles.
+            profile_cache (ProfileCache): The profile cache.
+            pages (int): Number of article list pages to warm.
+            articles (int): Number of single articles to warm.
+            profiles (int): Number of profiles to warm.
+            batch_size (int): Articles or profiles loaded per query and pipeline.
+        """
+        self.cache = cache
+        self.profile_cache = profile_cache
+        self.redis = cache.redis
+        self.limits = {HOT_ARTICLE_PAGES: pages, HOT_ARTICLES: articles, HOT_PROFILES: profiles}
+        self.batch_size = batch_size
+
+    def run(self, deadline):
+        """
+        Warms the hottest entries, stopping between batches once `deadline` seconds have passed.
+
+        Args:
+            deadline (float): Seconds the warm-up may take.
+
+        Returns:
+            dict: Numbers of entries built per kind, entries found already cached, whether
+            every ranked entry was handled and the elapsed seconds.
+        """
+        started = time.monotonic()
+        stop_at = started + deadline
+        report = {"pages": 0, "articles": 0, "profiles": 0, "cached": 0, "complete": False}
+        ranked = self.ranked()
+
+        steps = [
+            (self._warm_pages, ranked[HOT_ARTICLE_PAGES]),
+            (self._warm_articles, [(int(member), reads) for member, reads in ranked[HOT_ARTICLES] if member.isdigit()]),
+            (self._warm_profiles, ranked[HOT_PROFILES]),
+        ]
+        complete = True
+        for warm, members in steps:
+            for start in range(0, len(members), self.batch_size):
+                if time.monotonic() >= stop_at:
+                    complete = False
+                    break
+                warm(members[start:start + self.batch_size], report)
+            if not complete:
+                break
+            # Release the connections used by this step (e.g. outside of a request)
+            db.session.remove()
+
+        report["complete"] = complete
+        report["seconds"] = round(time.monotonic() - started, 3)
+        return report
+
+    def ranked(self):
+        """
+        Returns the most read members of each family, most read first.
+
+        Returns:
+            dict: Family -> list of (member (str), reads (float)).
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for family, limit in self.limits.items():
+            pipe.zrevrange(HOT_KEY.format(family=family), 0, limit - 1, withscores=True)
+        ranked = {family: [(member.decode(), reads) for member, reads in found]
+                  for family, found in zip(self.limits, pipe.execute())}
+
+        # The default first page is the hottest entry of all, counted or not
+        first_page = article_page_key(None, current_app.config['ARTICLES_PAGE_SIZE'], ARTICLE_FIELDS)
+        pages = ranked[HOT_ARTICLE_PAGES]
+        first_reads = next((reads for key, reads in pages if key == first_page), 0)
+        ranked[HOT_ARTICLE_PAGES] = [(first_page, first_reads)] + [page for page in pages if page[0] != first_page]
+        return ranked
+
+    def _warm_pages(self, pages, report):
+        for page_key, reads in pages:
+            try:
+                limit, fields, cursor, position = parse_article_page_key(page_key)
+            except ValueError:
+                continue
+            built = []
+
+            def build():
+                built.append(page_key)
+                articles = db.session.execute(article_page_query(fields, position, limit)).scalars().all()
+                return article_page(articles, fields, limit)
+
+            self.cache.get_entry(ARTICLES_NAMESPACE, page_key, build, ttl=self.cache.stats.ttl(reads))
+            report["pages" if built else "cached"] += 1
+
+    def _warm_articles(self, articles, report):
+        reads = dict(articles)
+        article_ids = list(reads)
+        namespaces = [ARTICLE_NAMESPACE.format(article_id=article_id) for article_id in article_ids]
+        pipe = self.redis.pipeline(transaction=False)
+        for namespace in namespaces:
+            pipe.get(GENERATION_KEY.format(namespace=namespace))
+        entry_keys = {
+            article_id: ENTRY_KEY.format(namespace=namespace, generation=int(generation) if generation else 0,
+                                         key=ARTICLE_DETAIL_KEY)
+            for article_id, namespace, generation in zip(article_ids, namespaces, pipe.execute())
+        }
+        missing = self._missing(entry_keys, report)
+        if not missing:
+            return
+
+        articles = db.session.execute(
+            select(Article).options(AUTHOR_EMAIL_ONLY).where(Article.id.in_(missing))
+        ).scalars().all()
+        entries = []
+        for article in articles:
+            entry = build_entry(article_detail(article))
+            ttl = self.cache.stats.ttl(reads[article.id])
+            entries.append((entry_keys[article.id], entry, self.cache.compress(entry), ttl))
+        self.cache.store_many(entries)
+        report["articles"] += len(entries)
+
+        # Stop counting reads of articles that no longer exist
+        deleted = set(missing) - {article.id for article in articles}
+        if deleted:
+            self.redis.zrem(HOT_KEY.format(family=HOT_ARTICLES), *deleted)
+
+    def _warm_profiles(self, profiles, report):
+        reads = dict(profiles)
+        missing = self._missing({email: PROFILE_KEY.format(email=email) for email in reads}, report)
+        if not missing:
+            return
+
+        users = db.session.execute(
+            select(User.email, User.role, User.role_version).where(User.email.in_(missing))
+        ).all()
+        pipe = self.redis.pipeline(transaction=False)
+        for email, role, role_version in users:
+            self.profile_cache.queue_set(pipe, email, encode(ProfileSchema(email=email, role=role)), role_version,
+                                         self.profile_cache.ttl_for(reads[email]))
+        pipe.execute()
+        report["profiles"] += len(users)
+
+    def _missing(self, keys, report):
+        # Members whose Redis key does not exist, checked in one round trip
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys.values():
+            pipe.exists(key)
+        missing = [member for member, exists in zip(keys, pipe.execute()) if not exists]
+        report["cached"] += len(keys) - len(missing)
+        return missing
+
+
+class StartupWarmup:
+    """
+    Runs the cache warm-up once per worker process in a background thread, and tells
+    whether the worker is ready for traffic (see GET /readyz).
+
+    The warm-up starts with the first request (usually the platform's readiness probe)
+    rather than at import time, since threads do not survive a preloading server's
+    `fork()`. Only one process across the deployment warms the cache at a time (holding
+    `WARMUP_LOCK_KEY`); the others wait for it. A worker becomes ready once the warm-up
+    finished or failed, or after `deadline` seconds at the latest.
+    """
+
+    def __init__(self, app, enabled=False, deadline=30):
+        """
+        Args:
+            app (Flask): The Flask app instance.
+            enabled (bool): Whether to warm up; if not, the worker is ready immediately.
+            deadline (float): Seconds after which the worker is ready even if the warm-up is not done.
+        """
+        self.app = app
+        self.enabled = enabled
+        self.deadline = deadline
+        self.report = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started_at = None
+        self._thread = None
+        if not enabled:
+            self._done.set()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def start(self):
+        """
+        Starts the warm-up unless it already started in this process (or is disabled).
+        """
+        if self._thread is not None or self._done.is_set():
+            return
+        with self._lock:
+            if self._thread is not None or self._done.is_set():
+                return
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name='cache-warmup', daemon=True)
+            self._thread.start()
+
+    def ready(self):
+        """
+        Returns:
+            bool: True once the warm-up is over or has exceeded its deadline.
+        """
+        if self._done.is_set():
+            return True
+        return self._started_at is not None and time.monotonic() - self._started_at >= self.deadline
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the warm-up is over.
+
+        Returns:
+            bool: True if it is over.
+        """
+        return self._done.wait(timeout)
+
+    def _run(self):
+        try:
+            with self.app.app_context():
+                redis_client = self.app.extensions['redis']
+                if redis_client.set(WARMUP_LOCK_KEY, os.getpid(), nx=True, ex=int(self.deadline) + 1):
+                    try:
+                        self.report = create_cache_warmer(self.app).run(self.deadline)
+                    finally:
+                        redis_client.delete(WARMUP_LOCK_KEY)
+                    self.app.logger.info("Cache warm-up finished: %s", self.report)
+                else:
+                    # Another worker is warming the shared cache
+                    while redis_client.exists(WARMUP_LOCK_KEY) and not self.ready():
+                        time.sleep(0.1)
+        except Exception:
+            self.app.logger.exception("Cache warm-up failed")
+        finally:
+            self._done.set()
+
+    def _reset_after_fork(self):
+        # The warm-up thread was not copied into the child; it runs its own
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started_at = None
+        self._thread = None
+        if not self.enabled:
+            self._done.set()
+
+
+def create_cache_warmer(app):
+    """
+    Creates a warmer for the app's caches from the `CACHE_WARMUP_*` settings.
+
+    Args:
+        app (Flask): The Flask app instance.
+
+    Returns:
+        CacheWarmer: The warmer.
+    """
+    return CacheWarmer(
+        app.extensions['cache'],
+        app.extensions['profile_cache'],
+        pages=app.config['CACHE_WARMUP_PAGES'],
+        articles=app.config['CACHE_WARMUP_ARTICLES'],
+        profiles=app.config['CACHE_WARMUP_PROFILES'],
+    )
+
+
+def init_warmup(app):
+    """
+    Sets up the per-process startup warm-up (if `CACHE_WARMUP_ON_STARTUP`), started by the
+    first request.
+
+    Args:
+        app (Flask): The Flask app instance.
+    """
+    app.extensions['warmup'] = StartupWarmup(
+        app,
+        enabled=app.config['CACHE_WARMUP_ON_STARTUP'],
+        deadline=app.config['CACHE_WARMUP_DEADLINE'],
+    )
+
+    @app.before_request
+    def start_warmup():
+        app.extensions['warmup'].start()
+
+
+def get_warmup():
+    """
+    Returns the startup warm-up of the current Flask app.
+
+    Returns:
+        StartupWarmup: The app's warm-up.
+    """
+    return current_app.extensions['warmup']
@@ -0,0 +1,8 @@
+"""
+ASGI entry point: the async read path in front of the Flask app (see app/asgi.py), e.g.:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
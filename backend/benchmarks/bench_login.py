@@ -0,0 +1,80 @@
+"""
+Login throughput benchmark at realistic password hash costs.
+
+For each hashing method, a user is created with a hash of that cost and `--threads`
+client threads log in concurrently through the Flask test client. Reports logins/sec
+and latency percentiles for each number of hashing workers. Requires the same Postgres
+and Redis services as the test suite.
+
+Usage:
+    python -m benchmarks.bench_login [--logins 200] [--threads 8] [--workers 1 2 4]
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app, db
+from app.models import User
+from app.passwords import PasswordHasher
+
+BENCH_EMAIL = 'bench-login@example.com'
+BENCH_PASSWORD = 'bench-password'
+DEFAULT_METHODS = ['scrypt:32768:8:1', 'pbkdf2:sha256:600000']
+
+
+def run(app, logins, threads):
+    """
+    Performs `logins` concurrent logins and returns (logins/sec, latencies in ms).
+    """
+    credentials = {"email": BENCH_EMAIL, "password": BENCH_PASSWORD}
+
+    def login(_):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/auth/login', json=credentials)
+        assert response.status_code == 200, response.data
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(login, range(logins)))
+    return logins / (time.perf_counter() - start), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--logins', type=int, default=200, help='Logins per configuration')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Hashing pool sizes to compare')
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS, help='werkzeug hashing methods')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    print(f"{'method':<24} {'workers':>7} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for method in args.methods:
+        for workers in args.workers:
+            app.extensions['password_hasher'] = PasswordHasher(
+                method, workers=workers, max_pending=args.threads, timeout=60)
+            with app.app_context():
+                User.query.filter_by(email=BENCH_EMAIL).delete()
+                user = User(email=BENCH_EMAIL)
+                user.set_password(BENCH_PASSWORD)
+                db.session.add(user)
+                db.session.commit()
+
+            run(app, args.threads, args.threads)  # Warm up
+            throughput, latencies = run(app, args.logins, args.threads)
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{method:<24} {workers:>7} {throughput:>9.1f} {statistics.median(latencies):>8.1f} {p95:>8.1f}")
+
+    with app.app_context():
+        User.query.filter_by(email=BENCH_EMAIL).delete()
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark comparing the two `role_required` authorization modes.
+
+Runs a protected no-op route through the Flask test client with a valid admin token and
+reports requests/sec for the claims-based mode and the per-request database lookup mode.
+Requires the same Postgres and Redis services as the test suite.
+
+Usage:
+    python -m benchmarks.bench_rbac [--requests 2000]
+"""
+import argparse
+import time
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.models import User
+from app.utils import role_required
+
+BENCH_EMAIL = 'bench-admin@example.com'
+
+
+def run(client, token, requests):
+    """
+    Sends `requests` GETs to the protected route and returns the achieved requests/sec.
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get('/_bench/protected', headers=headers)
+        assert response.status_code == 200, response.data
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per mode')
+    args = parser.parse_args()
+
+    app = create_app()
+
+    @role_required('admin')
+    def protected():
+        return jsonify({}), 200
+
+    app.add_url_rule('/_bench/protected', 'bench_protected', protected)
+
+    with app.app_context():
+        db.create_all()
+        user = User.query.filter_by(email=BENCH_EMAIL).first()
+        if not user:
+            user = User(email=BENCH_EMAIL, role='admin')
+            db.session.add(user)
+            db.session.commit()
+        token = create_access_token(identity=user)
+
+    client = app.test_client()
+    results = {}
+    for mode in ('database', 'claims'):
+        app.config['RBAC_AUTHZ_MODE'] = mode
+        run(client, token, min(200, args.requests))  # Warm up connections and caches
+        results[mode] = run(client, token, args.requests)
+        print(f"{mode:>8}: {results[mode]:8.0f} req/s")
+
+    print(f" speedup: {results['claims'] / results['database']:.2f}x")
+
+    with app.app_context():
+        User.query.filter_by(email=BENCH_EMAIL).delete()
+        db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of article page serialization: stdlib json + jsonify versus msgspec.
+
+Measures, for a page of articles, the cost of building the cache entry on a miss
+(json.dumps of dicts vs. msgspec encoding of Structs) and of serving a cache hit
+(json.loads + jsonify vs. sending the cached bytes as is). No services are required.
+
+Usage:
+    python -m benchmarks.bench_serialization [--articles 100] [--content-size 2000]
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+from flask import Flask, jsonify
+
+from app.schemas import ArticlePageSchema, ArticleSchema, MsgspecJSONProvider, encode, json_bytes_response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--articles', type=int, default=100, help='Articles per page')
+    parser.add_argument('--content-size', type=int, default=2000, help='Characters of content per article')
+    parser.add_argument('--number', type=int, default=2000, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    dict_page = {
+        "articles": [
+            {"id": i, "title": f"Article {i}", "content": "x" * args.content_size,
+             "author": "editor@example.com", "created_at": now.isoformat()}
+            for i in range(args.articles)
+        ],
+        "next_cursor": None
+    }
+    struct_page = ArticlePageSchema(
+        articles=[ArticleSchema(id=i, title=f"Article {i}", content="x" * args.content_size,
+                                author="editor@example.com", created_at=now)
+                  for i in range(args.articles)]
+    )
+    cached_str = json.dumps(dict_page)
+    cached_bytes = encode(struct_page)
+
+    legacy_app = Flask('legacy')  # Default (stdlib json) provider
+    msgspec_app = Flask('msgspec')
+    msgspec_app.json = MsgspecJSONProvider(msgspec_app)
+
+    cases = {}
+    with legacy_app.test_request_context():
+        cases['miss  json.dumps'] = lambda: json.dumps(dict_page)
+        cases['hit   json.loads + jsonify'] = lambda: jsonify(json.loads(cached_str)).get_data()
+        timings = {name: timeit.timeit(case, number=args.number) for name, case in cases.items()}
+    cases = {}
+    with msgspec_app.test_request_context():
+        cases['miss  msgspec encode'] = lambda: encode(struct_page)
+        cases['hit   cached bytes'] = lambda: json_bytes_response(cached_bytes).get_data()
+        timings.update({name: timeit.timeit(case, number=args.number) for name, case in cases.items()})
+
+    print(f"page of {args.articles} articles, {len(cached_bytes)} bytes")
+    for name, seconds in timings.items():
+        print(f"{name:<28} {args.number / seconds:10.0f} ops/s")
+
+
+if __name__ == '__main__':
+    main()
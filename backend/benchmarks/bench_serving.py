@@ -0,0 +1,141 @@
+"""
+Throughput of the production server (gunicorn, see gunicorn.conf.py) by worker count.
+
+For each worker count, gunicorn is started on a free local port and `--connections`
+keep-alive client connections (one per thread) read cached article pages and articles
+for `--duration` seconds. Reports requests/sec and latency percentiles, which shows how
+far throughput scales with processes on the current machine. Requires the same Postgres
+and Redis services as the test suite, and gunicorn.
+
+Usage:
+    python -m benchmarks.bench_serving [--workers 1 2 4] [--threads 4] [--connections 32] [--duration 10]
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from app import create_app, db
+from app.models import Article, User
+
+BENCH_EMAIL = 'bench-serving@example.com'
+BENCH_ARTICLES = 200
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed():
+    """
+    Creates the articles read by the benchmark and returns their IDs.
+    """
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        User.query.filter_by(email=BENCH_EMAIL).delete()
+        author = User(email=BENCH_EMAIL, role='editor')
+        db.session.add(author)
+        db.session.flush()
+        articles = [Article(title=f"Bench {i}", content="Lorem ipsum dolor sit amet. " * 40, author_id=author.id)
+                    for i in range(BENCH_ARTICLES)]
+        db.session.add_all(articles)
+        db.session.commit()
+        return [article.id for article in articles]
+
+
+def cleanup():
+    app = create_app()
+    with app.app_context():
+        author = User.query.filter_by(email=BENCH_EMAIL).first()
+        if author:
+            Article.query.filter_by(author_id=author.id).delete()
+            db.session.delete(author)
+            db.session.commit()
+
+
+def start_server(port, workers, threads):
+    env = dict(os.environ, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers),
+               GUNICORN_THREADS=str(threads), GUNICORN_ACCESS_LOG='', GUNICORN_LOG_LEVEL='warning')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'], env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline and server.poll() is None:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/articles')
+            connection.getresponse().read()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("gunicorn did not start")
+
+
+def run(port, paths, connections, duration):
+    """
+    Reads `paths` round-robin over `connections` keep-alive connections for `duration`
+    seconds and returns (requests/sec, latencies in ms).
+    """
+    latencies = [[] for _ in range(connections)]
+    deadline = time.monotonic() + duration
+
+    def client(n):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        i = n
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            connection.request('GET', paths[i % len(paths)], headers={'Accept-Encoding': 'gzip'})
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            latencies[n].append((time.perf_counter() - start) * 1000)
+            i += connections
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(connections)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = [latency for per_connection in latencies for latency in per_connection]
+    return len(latencies) / elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker counts to compare')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per worker')
+    parser.add_argument('--connections', type=int, default=32, help='Concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds measured per worker count')
+    args = parser.parse_args()
+
+    article_ids = seed()
+    paths = ['/articles'] + [f'/articles/{article_id}' for article_id in article_ids]
+    print(f"{'workers':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    try:
+        for workers in args.workers:
+            port = free_port()
+            server = start_server(port, workers, args.threads)
+            try:
+                run(port, paths, args.connections, min(args.duration, 2))  # Warm up the cache and connections
+                throughput, latencies = run(port, paths, args.connections, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(f"{workers:>7} {args.threads:>7} {throughput:>9.1f} {statistics.median(latencies):>8.1f} {p95:>8.1f}")
+    finally:
+        cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Gunicorn settings for serving `wsgi:app` in production, read from `GUNICORN_*` environment variables.
+
+Each worker process serves `GUNICORN_THREADS` requests at once (gthread workers), so a container handles
+up to workers x threads concurrent requests. Every thread may hold a database and a Redis connection, so
+keep `GUNICORN_THREADS` within `DB_POOL_SIZE + DB_MAX_OVERFLOW` and `REDIS_MAX_CONNECTIONS`.
+See `benchmarks/bench_serving.py` to measure how throughput scales with the worker count.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Workers: CPU-bound work (JSON encoding, compression, password hashing) scales with processes,
+# I/O waits (Postgres, Redis) are overlapped by the threads of each process
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.getenv('GUNICORN_WORKERS', str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Connections
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))  # Seconds an idle keep-alive connection is kept open
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))  # Max open connections per worker
+backlog = int(os.getenv('GUNICORN_BACKLOG', '2048'))  # Pending connections queued by the kernel
+
+# Timeouts and recycling
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))  # Seconds before a silent worker is killed and restarted
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))  # Seconds in-flight requests get on shutdown
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '0'))  # Restart a worker after this many requests (0 = never)
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '0'))  # Random extra requests, to stagger restarts
+
+# Create the app once in the master so workers start faster and share its memory pages.
+# Connections opened while creating it are dropped in every worker by `post_fork`
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Logging ('-' is stdout/stderr, an empty access log disables it)
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # `callable` is only set in the master when the app was preloaded
+    if worker.app.callable is not None:
+        from app.serving import reset_after_fork
+        reset_after_fork(worker.app.callable)
+
+
+def worker_exit(server, worker):
+    # Runs in the worker once it has stopped accepting requests and the in-flight ones are done
+    flask_app = getattr(worker, 'wsgi', None)
+    if flask_app is not None:
+        from app.serving import shutdown
+        shutdown(flask_app)
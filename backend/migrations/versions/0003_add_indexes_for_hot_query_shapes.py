@@ -0,0 +1,36 @@
+"""add indexes for hot query shapes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 21:17:52.271937
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The indexes are built concurrently, without blocking writes to the populated tables, which
+    # cannot happen inside a transaction. Should a build fail, it leaves an INVALID index behind
+    # that has to be dropped before running this revision again.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_article_author_id', 'article', ['author_id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_article_created_at_id', 'article', ['created_at', 'id'], unique=False,
+                        postgresql_concurrently=True)
+        op.create_index('ix_users_role_id', 'users', ['role', 'id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_role_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_article_created_at_id', table_name='article', postgresql_concurrently=True)
+        op.drop_index('ix_article_author_id', table_name='article', postgresql_concurrently=True)
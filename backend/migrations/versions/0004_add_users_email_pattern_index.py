@@ -0,0 +1,30 @@
+"""add users email pattern index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 23:02:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Built concurrently, without blocking writes to users, which cannot happen inside a
+    # transaction. Should the build fail, it leaves an INVALID index behind that has to be
+    # dropped before running this revision again.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_email_pattern', 'users', ['email'], unique=False,
+                        postgresql_ops={'email': 'varchar_pattern_ops'}, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_email_pattern', table_name='users', postgresql_concurrently=True)
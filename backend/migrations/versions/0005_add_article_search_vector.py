@@ -0,0 +1,41 @@
+"""add article search vector
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:14:09.837412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Adding a STORED generated column rewrites the whole article table to compute it, under
+    # an ACCESS EXCLUSIVE lock: reads and writes of articles block until the rewrite is done,
+    # which takes time proportional to the table size. Run this revision in a maintenance window.
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', coalesce(title, '')), 'A') || setweight(to_tsvector('english', coalesce(content, '')), 'B')", persisted=True), nullable=True))
+
+    # The GIN index is built concurrently, without blocking writes, which cannot happen inside
+    # a transaction: the column above is committed first. Should the build fail, it leaves an
+    # INVALID index behind that has to be dropped before running this revision again.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_article_search_vector', 'article', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_article_search_vector', table_name='article', postgresql_using='gin',
+                      postgresql_concurrently=True)
+
+    with op.batch_alter_table('article', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
@@ -1,5 +1,8 @@
 import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app, db
+from app.redis_client import get_redis_client
 
 @pytest.fixture(scope='module')
 def app():
@@ -8,6 +11,7 @@ def app():
     
     This fixture uses the app factory pattern to create a Flask app configured for testing. 
     The database tables are created before running the tests and dropped afterward to ensure a clean test environment.
+    The Redis database is flushed as well, since cached entries refer to rows of the dropped tables.
 
     Yields:
         Flask app instance for testing.
@@ -20,12 +24,16 @@ def app():
         'TESTING': True,  # Enable testing mode
         'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'],  # Use the database URL from the environment
         'JWT_SECRET_KEY': 'test_secret_key',  # Set a secret key for JWT in tests
-        'SQLALCHEMY_TRACK_MODIFICATIONS': False  # Disable modification tracking to improve performance
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,  # Disable modification tracking to improve performance
+        'BOOTSTRAP_FIRST_ADMIN': True,  # Each module's first registered user administers it
+        'AUTH_LOGIN_RATE_LIMIT': 1000,  # Every test client logs in from the same address
+        'AUTH_REGISTER_RATE_LIMIT': 1000,
     })
 
-    # Create all database tables within the app context
+    # Create all database tables and start from an empty cache within the app context
     with app.app_context():
         db.create_all()
+        get_redis_client().flushdb()
 
     # Provide the app instance for the test cases
     yield app
@@ -63,3 +71,39 @@ def runner(app):
         Flask CLI test runner.
     """
     return app.test_cli_runner()
+
+@pytest.fixture
+def assert_max_queries(app):
+    """
+    Fixture providing a context manager that fails the test if the wrapped block issues
+    more SQL statements than allowed. Use it to guard endpoints against N+1 query regressions.
+
+    Example:
+        with assert_max_queries(1):
+            client.get('/articles')
+
+    Args:
+        app: The Flask app instance from the `app` fixture.
+
+    Returns:
+        Function: Context manager factory taking the maximum number of statements.
+    """
+    @contextmanager
+    def counter(max_queries):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert len(statements) <= max_queries, (
+            f"Expected at most {max_queries} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+
+    return counter
@@ -68,3 +68,222 @@ def test_list_users(client):
     assert response.status_code == 200
     assert b'admin@example.com' in response.data
     assert b'user@example.com' in response.data
+
+# Test that a role change invalidates tokens carrying the previous role
+def test_role_change_rejects_stale_token(client):
+    """
+    Test case for the role version stamp embedded in JWTs.
+
+    Steps:
+    1. Log in as the admin and as the user promoted to 'editor' in `test_promote_user`.
+    2. Demote the user back to 'user' with the admin token.
+    3. Use the user's editor token to create an article.
+
+    Asserts:
+    - The editor token is rejected with a 401 because its role version is stale.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    admin_token = json.loads(login_response.data)["access_token"]
+    login_response = client.post('/auth/login', json={
+        "email": "user@example.com",
+        "password": "userpassword"
+    })
+    editor_token = json.loads(login_response.data)["access_token"]
+
+    # Demote the user, bumping their role version
+    client.post('/admin/promote', json={
+        "email": "user@example.com",
+        "role": "user"
+    }, headers={"Authorization": f"Bearer {admin_token}"})
+
+    # The token issued while the user was an editor must no longer be accepted
+    response = client.post('/articles', json={
+        "title": "Stale",
+        "content": "Should not be created"
+    }, headers={"Authorization": f"Bearer {editor_token}"})
+    assert response.status_code == 401
+
+# Test the Redis connection pool statistics (requires admin privileges)
+def test_redis_pool_stats(client):
+    """
+    Test case for the shared Redis connection pool statistics route.
+
+    Steps:
+    1. Log in as an admin to get a JWT token.
+    2. Request the Redis pool statistics.
+
+    Asserts:
+    - Status code should be 200.
+    - The pool has been reused: at least one connection is open and none exceed the configured maximum.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    admin_token = json.loads(login_response.data)["access_token"]
+
+    response = client.get('/admin/redis/pool', headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.status_code == 200
+    stats = response.json
+    assert 0 < stats["open"] <= stats["max_connections"]
+    assert stats["in_use"] + stats["idle"] == stats["open"]
+
+# Test the connection pool metrics endpoint (requires admin privileges)
+def test_metrics(client):
+    """
+    Test case for the Prometheus metrics route.
+
+    Steps:
+    1. Log in as an admin to get a JWT token.
+    2. Read the first page of articles twice, then request the metrics.
+
+    Asserts:
+    - Status code should be 200 with a text response.
+    - Database and Redis pool metrics are reported, with at least one database checkout recorded.
+    - Cache reads are reported per key family and outcome, with the hit ratio.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    admin_token = json.loads(login_response.data)["access_token"]
+    client.get('/articles')
+    client.get('/articles')
+
+    response = client.get('/admin/metrics', headers={"Authorization": f"Bearer {admin_token}"})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    metrics = dict(line.split(' ') for line in response.data.decode().splitlines() if not line.startswith('#'))
+    assert float(metrics['db_pool_checkouts_total']) > 0
+    assert 'db_pool_checkout_wait_seconds_total' in metrics
+    assert 'redis_pool_in_use' in metrics
+    assert int(metrics['cache_reads_total{family="article_pages",outcome="hits"}']) >= 1
+    assert 0 < float(metrics['cache_hit_ratio{family="article_pages"}']) < 1
+
+
+# Test the paginated and filtered user listing
+def test_list_users_pagination_and_filters(client):
+    """
+    Test case for the keyset pagination and filters of the user listing.
+
+    Steps:
+    1. Register three 'team-' users and log in as the admin.
+    2. Page through the 'team-' users two at a time, then filter by role and account type.
+
+    Asserts:
+    - The pages return every matching user once, in ID order, and the last page has no cursor.
+    - The role and `google` filters only return matching users.
+    - Invalid filters are rejected with a 400.
+    """
+    for i in range(3):
+        client.post('/auth/register', json={"email": f"team-{i}@example.com", "password": "teampassword"})
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+
+    emails, cursor = [], None
+    while True:
+        query = {"email_prefix": "team-", "limit": 2}
+        if cursor:
+            query["cursor"] = cursor
+        page = client.get('/admin/users', query_string=query, headers=headers).json
+        emails += [user["email"] for user in page["users"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert emails == [f"team-{i}@example.com" for i in range(3)]
+
+    admins = client.get('/admin/users?role=admin', headers=headers).json["users"]
+    assert [user["email"] for user in admins] == ["admin@example.com"]
+    assert client.get('/admin/users?google=true', headers=headers).json["users"] == []
+
+    assert client.get('/admin/users?role=owner', headers=headers).status_code == 400
+    assert client.get('/admin/users?cursor=abc', headers=headers).status_code == 400
+
+
+# Test the streamed user export
+def test_export_users(client):
+    """
+    Test case for the CSV and NDJSON user exports.
+
+    Asserts:
+    - The CSV export starts with a header row followed by one row per matching user.
+    - The NDJSON export has one JSON object per matching user.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+
+    response = client.get('/admin/users/export?email_prefix=team-', headers=headers)
+    assert response.status_code == 200
+    lines = response.data.decode().splitlines()
+    assert lines[0] == "id,email,role,is_google_user"
+    assert [line.split(',')[1] for line in lines[1:]] == [f"team-{i}@example.com" for i in range(3)]
+
+    response = client.get('/admin/users/export?format=ndjson&email_prefix=team-', headers=headers)
+    users = [json.loads(line) for line in response.data.splitlines()]
+    assert [user["email"] for user in users] == [f"team-{i}@example.com" for i in range(3)]
+
+
+# Test the bulk role assignment
+def test_promote_users_bulk(client):
+    """
+    Test case for assigning roles to many users in one request.
+
+    Steps:
+    1. Log in as the 'team-' users registered in `test_list_users_pagination_and_filters` and as the admin.
+    2. Promote them with a JSON list containing invalid (including non-string values), duplicate and unknown rows.
+    3. Demote one of them again with a CSV upload.
+
+    Asserts:
+    - Every row gets its own status and only valid rows are applied.
+    - The user listing reflects the new roles.
+    - Tokens issued before the change are rejected.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "admin@example.com",
+        "password": "adminpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    old_token = client.post('/auth/login', json={
+        "email": "team-0@example.com",
+        "password": "teampassword"
+    }).json["access_token"]
+
+    response = client.post('/admin/promote/bulk', json=[
+        {"email": "team-0@example.com", "role": "editor"},
+        {"email": "team-1@example.com", "role": "editor"},
+        {"email": "team-1@example.com", "role": "admin"},
+        {"email": "team-2@example.com", "role": "owner"},
+        {"email": "nobody@example.com", "role": "editor"},
+        {"email": 42, "role": "editor"},
+        {"email": "team-2@example.com", "role": ["admin"]},
+    ], headers=headers)
+    assert response.status_code == 200
+    assert response.json["updated"] == 2
+    assert [result["status"] for result in response.json["results"]] == [
+        "updated", "updated", "duplicate", "invalid", "not_found", "invalid", "invalid"
+    ]
+
+    editors = client.get('/admin/users?role=editor&email_prefix=team-', headers=headers).json["users"]
+    assert [user["email"] for user in editors] == ["team-0@example.com", "team-1@example.com"]
+
+    response = client.post('/admin/promote/bulk', data="email,role\nteam-1@example.com,user\n",
+                           content_type='text/csv', headers=headers)
+    assert response.json["updated"] == 1
+    editors = client.get('/admin/users?role=editor&email_prefix=team-', headers=headers).json["users"]
+    assert [user["email"] for user in editors] == ["team-0@example.com"]
+
+    # A token issued before the role change is stale
+    response = client.post('/articles', json={"title": "Stale", "content": "Stale"},
+                           headers={"Authorization": f"Bearer {old_token}"})
+    assert response.status_code == 401
@@ -1,5 +1,8 @@
+import gzip
 import json
 
+import pytest
+
 # Test creating an article (this requires an authenticated user with 'editor' or 'admin' role)
 def test_create_article(client):
     """
@@ -91,3 +94,380 @@ def test_update_article(client):
     # Assert that the article was updated successfully
     assert update_response.status_code == 200
     assert b'Article updated successfully!' in update_response.data
+
+
+# Test paging through articles with a cursor and a field projection
+def test_get_articles_pagination(client):
+    """
+    Test case for keyset pagination and the `fields` projection of the article list.
+
+    Steps:
+    1. Log in as the editor and create three articles.
+    2. Fetch the first page with `limit=2` and only the id and title fields.
+    3. Follow `next_cursor` to fetch the following page.
+
+    Asserts:
+    - Pages contain at most `limit` articles, newest first, without the omitted fields.
+    - The pages do not overlap and the following page continues where the first ended.
+    - An invalid cursor is rejected with a 400.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    token = json.loads(login_response.data)["access_token"]
+    created_ids = []
+    for i in range(3):
+        response = client.post('/articles', json={
+            "title": f"Paged Article {i}",
+            "content": "Paged content"
+        }, headers={"Authorization": f"Bearer {token}"})
+        created_ids.append(response.json['id'])
+
+    first_page = client.get('/articles?limit=2&fields=id,title').json
+    assert [article['id'] for article in first_page['articles']] == created_ids[::-1][:2]
+    assert set(first_page['articles'][0]) == {'id', 'title'}
+    assert first_page['next_cursor']
+
+    second_page = client.get(f"/articles?limit=2&fields=id,title&cursor={first_page['next_cursor']}").json
+    assert second_page['articles'][0]['id'] == created_ids[0]
+
+    assert client.get('/articles?cursor=not-a-cursor').status_code == 400
+
+
+# Test that listing and reading articles does not lazy-load authors one by one
+def test_articles_no_n_plus_one(client, assert_max_queries):
+    """
+    Test case guarding the article read paths against N+1 author lookups.
+
+    Steps:
+    1. Request an uncached page of articles including the author field.
+    2. Request an uncached single article.
+
+    Asserts:
+    - Each request issues a single SQL query no matter how many articles are listed.
+    """
+    with assert_max_queries(1):
+        response = client.get('/articles?limit=50&fields=id,author')
+    assert response.status_code == 200
+    assert len(response.json['articles']) > 1
+
+    with assert_max_queries(1):
+        response = client.get(f"/articles/{response.json['articles'][-1]['id']}")
+    assert response.status_code == 200
+
+
+# Test exporting all articles as a stream (requires authentication)
+def test_export_articles(client):
+    """
+    Test case for the streamed article export in both output formats.
+
+    Steps:
+    1. Log in as the editor to get a JWT token.
+    2. Export the articles as a JSON array, then as NDJSON with a field projection.
+
+    Asserts:
+    - Both exports succeed and contain every article, in id order.
+    - NDJSON lines only contain the requested fields.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+
+    response = client.get('/articles/export', headers=headers)
+    assert response.status_code == 200
+    articles = json.loads(response.data)
+    ids = [article['id'] for article in articles]
+    assert ids and ids == sorted(ids)
+    assert articles[0]['author'] == 'editor@example.com'
+
+    response = client.get('/articles/export?format=ndjson&fields=id,title', headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert [line['id'] for line in lines] == ids
+    assert set(lines[0]) == {'id', 'title'}
+
+
+# Test that cache hits serve the stored JSON bytes unchanged
+def test_get_article_cache_hit_bytes(client):
+    """
+    Test case for serving cached article payloads without re-encoding.
+
+    Steps:
+    1. Fetch the same article twice (a cache miss, then a hit).
+
+    Asserts:
+    - Both responses are JSON and byte-for-byte identical.
+    """
+    article_id = client.get('/articles?limit=1&fields=id').json['articles'][0]['id']
+
+    miss = client.get(f'/articles/{article_id}')
+    hit = client.get(f'/articles/{article_id}')
+
+    assert miss.status_code == hit.status_code == 200
+    assert hit.mimetype == 'application/json'
+    assert hit.data == miss.data
+
+
+# Test the batched NDJSON import endpoint
+def test_import_articles(client):
+    """
+    Test case for importing articles from an NDJSON body.
+
+    Steps:
+    1. Log in as the editor and fetch the first page of articles (caching it).
+    2. Import five lines, two of them invalid, in batches of two.
+    3. Fetch the first page of articles again.
+
+    Asserts:
+    - The valid articles are imported and the invalid lines are reported with their line numbers.
+    - The cached article list is invalidated by the import.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    client.get('/articles?fields=title')
+
+    client.application.config['ARTICLES_IMPORT_BATCH_SIZE'] = 2
+    body = "\n".join([
+        json.dumps({"title": "Imported 1", "content": "Body"}),
+        json.dumps({"title": "", "content": "Body"}),
+        "not json",
+        json.dumps({"title": "Imported 2", "content": "Body", "created_at": "2030-01-01T00:00:00Z"}),
+        json.dumps({"title": "Imported 3", "content": "Body", "author": "editor@example.com"}),
+    ])
+    response = client.post('/articles/bulk', data=body, content_type='application/x-ndjson', headers=headers)
+
+    assert response.status_code == 200
+    assert response.json['imported'] == 3
+    assert response.json['failed'] == 2
+    assert sorted(error['line'] for error in response.json['errors']) == [2, 3]
+
+    titles = [article['title'] for article in client.get('/articles?fields=title').json['articles']]
+    assert titles[0] == 'Imported 2'
+    assert {'Imported 1', 'Imported 3'} <= set(titles)
+
+
+# Test the `flask articles import` command
+def test_import_articles_command(runner, tmp_path):
+    """
+    Test case for importing articles from an NDJSON file with the CLI.
+
+    Asserts:
+    - Articles are imported for the given author and unknown authors are reported.
+    - The command exits with an error status when some records failed.
+    """
+    source = tmp_path / "articles.ndjson"
+    source.write_text("\n".join([
+        json.dumps({"title": "From CLI", "content": "Body"}),
+        json.dumps({"title": "Unknown author", "content": "Body", "author": "ghost@example.com"}),
+    ]))
+
+    result = runner.invoke(args=['articles', 'import', str(source), '--author', 'editor@example.com'])
+
+    assert result.exit_code == 1
+    assert "1 imported, 1 failed" in result.output
+    assert "Unknown author ghost@example.com" in result.output
+
+
+# Test the ranked full-text search
+def test_search_articles(client):
+    """
+    Test case for the full-text article search.
+
+    Steps:
+    1. Create three articles mentioning 'zeppelin', one of them in its title, and one unrelated article.
+    2. Search for 'Zeppelins' one result per page, following the cursors.
+
+    Asserts:
+    - Only the matching articles are returned (stemmed, case-insensitive), each once.
+    - The title match ranks first.
+    - A missing query is rejected with a 400.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    for title, content in [
+        ("Airship history", "The zeppelin was a rigid airship."),
+        ("Zeppelin", "A rigid airship named after its inventor."),
+        ("Travel", "Crossing the Atlantic by zeppelin took days."),
+        ("Gardening", "Tomatoes need sun."),
+    ]:
+        client.post('/articles', json={"title": title, "content": content}, headers=headers)
+
+    titles, cursor = [], None
+    while True:
+        query = {"q": "Zeppelins", "limit": 1, "fields": "title"}
+        if cursor:
+            query["cursor"] = cursor
+        page = client.get('/articles/search', query_string=query).json
+        titles += [article["title"] for article in page["articles"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert titles[0] == "Zeppelin"
+    assert sorted(titles) == ["Airship history", "Travel", "Zeppelin"]
+    assert client.get('/articles/search').status_code == 400
+
+
+# Test conditional GETs of an article
+def test_get_article_conditional(client, assert_max_queries):
+    """
+    Test case for the ETag and Last-Modified validators of article reads.
+
+    Steps:
+    1. Create an article and fetch it.
+    2. Fetch it again with `If-None-Match`, then with `If-Modified-Since`.
+    3. Update the article and fetch it with the old ETag.
+
+    Asserts:
+    - The first response carries an ETag and a Last-Modified time.
+    - Both conditional requests get an empty 304 without any database query.
+    - After the update the article is sent again with a new ETag.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    article_id = client.post('/articles', json={"title": "Polled", "content": "Original"}, headers=headers).json['id']
+
+    response = client.get(f'/articles/{article_id}')
+    etag, last_modified = response.headers['ETag'], response.headers['Last-Modified']
+    assert response.status_code == 200
+
+    with assert_max_queries(0):
+        response = client.get(f'/articles/{article_id}', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        response = client.get(f'/articles/{article_id}', headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+    client.put(f'/articles/{article_id}', json={"title": "Polled", "content": "Changed"}, headers=headers)
+    response = client.get(f'/articles/{article_id}', headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+    # The list supports the same validators
+    response = client.get('/articles')
+    assert client.get('/articles', headers={"If-None-Match": response.headers['ETag']}).status_code == 304
+
+# Test compressed article responses
+def test_get_article_compressed(client, assert_max_queries):
+    """
+    Test case for content negotiation of cached article payloads.
+
+    Steps:
+    1. Create a large and a small article.
+    2. Fetch the large one with `Accept-Encoding: gzip`, then revalidate it.
+    3. Fetch it without `Accept-Encoding`, and fetch the small one with gzip accepted.
+
+    Asserts:
+    - The large article is sent gzip-compressed from the cache, with an ETag of its own.
+    - The compressed variant revalidates with a 304 without any database query.
+    - Uncompressed clients and payloads below `COMPRESS_MIN_SIZE` get the plain JSON.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    content = "All work and no play makes Jack a dull boy. " * 100
+    article_id = client.post('/articles', json={"title": "Long", "content": content}, headers=headers).json['id']
+    small_id = client.post('/articles', json={"title": "Short", "content": "Tiny"}, headers=headers).json['id']
+
+    client.get(f'/articles/{article_id}')  # Populate the cache
+    with assert_max_queries(0):
+        response = client.get(f'/articles/{article_id}', headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert json.loads(gzip.decompress(response.data))['content'] == content
+        gzip_etag = response.headers['ETag']
+        assert gzip_etag.endswith('-gzip"')
+
+        response = client.get(f'/articles/{article_id}', headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        assert response.status_code == 304
+
+        response = client.get(f'/articles/{article_id}')
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['ETag'] != gzip_etag
+        assert response.json['content'] == content
+
+    response = client.get(f'/articles/{small_id}', headers={"Accept-Encoding": "gzip"})
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['content'] == "Tiny"
+
+
+# Test brotli-compressed article responses
+def test_get_article_brotli(client):
+    """
+    Test case for brotli negotiation, when the brotli package is installed.
+
+    Asserts:
+    - Brotli is preferred over gzip when the client accepts both.
+    """
+    brotli = pytest.importorskip('brotli')
+    login_response = client.post('/auth/login', json={
+        "email": "editor@example.com",
+        "password": "editorpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+    content = "All work and no play makes Jack a dull boy. " * 100
+    article_id = client.post('/articles', json={"title": "Long", "content": content}, headers=headers).json['id']
+
+    response = client.get(f'/articles/{article_id}', headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data))['content'] == content
+
+
+# Test that cache invalidations wait for the transaction to commit
+def test_invalidation_after_commit(app, client):
+    """
+    Test case for the cache invalidations collected per unit of work.
+
+    Steps:
+    1. Change an article and flush it, then roll back.
+    2. Change it again and commit.
+
+    Asserts:
+    - Nothing is invalidated by a flush or a rolled back transaction, so the cached copy is kept.
+    - The commit invalidates the article and the article list once each, and the new
+      title is served.
+    """
+    from app import db
+    from app.cache import get_cache
+    from app.models import Article
+
+    article_id = client.get('/articles?limit=1&fields=id').json['articles'][0]['id']
+    title = client.get(f'/articles/{article_id}').json['title']
+    namespaces = [f'article:{article_id}', 'articles']
+
+    with app.app_context():
+        cache = get_cache()
+        generations = [cache.generation(namespace) for namespace in namespaces]
+
+        article = db.session.get(Article, article_id)
+        article.title = "Rolled back"
+        db.session.flush()
+        assert [cache.generation(namespace) for namespace in namespaces] == generations
+        db.session.rollback()
+        assert [cache.generation(namespace) for namespace in namespaces] == generations
+
+        article = db.session.get(Article, article_id)
+        article.title = "Committed"
+        article.content = "Changed twice in one transaction"
+        db.session.flush()
+        article.content = "Committed"
+        db.session.commit()
+        assert [cache.generation(namespace) for namespace in namespaces] == [g + 1 for g in generations]
+
+    assert title != "Committed"
+    assert client.get(f'/articles/{article_id}').json['title'] == "Committed"
@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from sqlalchemy import event
+
+from app.asgi import AsyncReadApp
+
+
+def run_async(app, scenario):
+    """
+    Runs `scenario(asgi_app, http_client)` on a new event loop against an `AsyncReadApp`
+    wrapping the test app, closing its pools afterwards.
+    """
+    async def main():
+        asgi_app = AsyncReadApp(app)
+        try:
+            transport = httpx.ASGITransport(app=asgi_app)
+            # Uncompressed unless a test asks otherwise, like the Flask test client
+            headers = {"Accept-Encoding": "identity"}
+            async with httpx.AsyncClient(transport=transport, base_url='http://test', headers=headers) as http:
+                return await scenario(asgi_app, http)
+        finally:
+            await asgi_app.aclose()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(scope='module')
+def admin_headers(client):
+    """
+    Registers the module's first user (an admin) and returns its authorization headers.
+    """
+    client.post('/auth/register', json={"email": "asyncadmin@example.com", "password": "testpassword"})
+    response = client.post('/auth/login', json={"email": "asyncadmin@example.com", "password": "testpassword"})
+    return {"Authorization": f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+# Test that the async article reads match the Flask routes
+def test_async_articles(app, client, admin_headers):
+    """
+    Test case for `GET /articles` and `GET /articles/<id>` on the async read path.
+
+    Steps:
+    1. Create articles through the Flask app and read them through both apps.
+    2. Revalidate and request compressed and missing articles through the async app.
+
+    Asserts:
+    - Both apps serve the same bytes and validators from the shared cache entries.
+    - Conditional requests get a 304, gzip is negotiated and missing articles get a 404.
+    - Missing articles and invalid parameters are rejected with the same status and body
+      as by the Flask route.
+    """
+    content = "Async reads hold no thread while waiting. " * 50
+    article_id = client.post('/articles', json={"title": "Async", "content": content}, headers=admin_headers).json['id']
+    flask_list = client.get('/articles')
+    flask_article = client.get(f'/articles/{article_id}')
+
+    async def scenario(asgi_app, http):
+        response = await http.get('/articles')
+        assert response.status_code == 200
+        assert response.content == flask_list.data
+        assert response.headers['etag'] == flask_list.headers['ETag']
+
+        response = await http.get(f'/articles/{article_id}')
+        assert response.content == flask_article.data
+        assert response.headers['last-modified'] == flask_article.headers['Last-Modified']
+
+        response = await http.get(f'/articles/{article_id}', headers={"If-None-Match": flask_article.headers['ETag']})
+        assert response.status_code == 304
+        assert response.content == b''
+
+        response = await http.get(f'/articles/{article_id}', headers={"Accept-Encoding": "gzip"})
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['etag'].endswith('-gzip"')
+        assert response.json()['content'] == content  # Decompressed by httpx
+
+        for path in ('/articles/999999', '/articles?limit=0', '/articles?fields=nope'):
+            response, flask_response = await http.get(path), client.get(path)
+            assert response.status_code == flask_response.status_code
+            assert response.content == flask_response.data
+        assert response.status_code == 400
+
+    run_async(app, scenario)
+
+    # An update through the Flask app invalidates the entry read by the async app
+    client.put(f'/articles/{article_id}', json={"title": "Async", "content": "Changed"}, headers=admin_headers)
+
+    async def after_update(asgi_app, http):
+        return (await http.get(f'/articles/{article_id}')).json()
+
+    assert run_async(app, after_update)['content'] == "Changed"
+
+
+# Test the async profile read, including authentication
+def test_async_profile(app, client, admin_headers):
+    """
+    Test case for `GET /user/profile/<email>` on the async read path.
+
+    Asserts:
+    - Requests without a valid token are rejected.
+    - The profile is served like by the Flask route, and revalidated with a 304.
+    - A revoked token is rejected.
+    """
+    response = client.post('/auth/login', json={"email": "asyncadmin@example.com", "password": "testpassword"})
+    tokens = json.loads(response.data)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    async def scenario(asgi_app, http):
+        assert (await http.get('/user/profile/asyncadmin@example.com')).status_code == 401
+        bad = {"Authorization": "Bearer not-a-token"}
+        assert (await http.get('/user/profile/asyncadmin@example.com', headers=bad)).status_code == 422
+
+        response = await http.get('/user/profile/asyncadmin@example.com', headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"email": "asyncadmin@example.com", "role": "admin"}
+        conditional = dict(headers, **{"If-None-Match": response.headers['etag']})
+        assert (await http.get('/user/profile/asyncadmin@example.com', headers=conditional)).status_code == 304
+        response = await http.get('/user/profile/nobody@example.com', headers=headers)
+        assert response.status_code == 404
+        assert response.content == client.get('/user/profile/nobody@example.com', headers=headers).data
+
+        # Other routes are served by the Flask app
+        response = await http.post('/auth/logout', headers=headers)
+        assert response.status_code == 200
+        return (await http.get('/user/profile/asyncadmin@example.com', headers=headers)).status_code
+
+    assert run_async(app, scenario) == 401
+
+
+# Test that concurrent misses are rebuilt once
+def test_async_single_flight(app, client, admin_headers):
+    """
+    Test case for concurrent reads of an uncached page on the async read path.
+
+    Asserts:
+    - Hundreds of concurrent requests for the same missing page cause a single query,
+      and all of them get the page.
+    """
+    client.post('/articles', json={"title": "Burst", "content": "Burst"}, headers=admin_headers)
+
+    async def scenario(asgi_app, http):
+        statements = []
+        event.listen(asgi_app.engine.sync_engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        responses = await asyncio.gather(*[http.get('/articles', params={"limit": "7"}) for _ in range(300)])
+        return statements, responses
+
+    statements, responses = run_async(app, scenario)
+    assert len([statement for statement in statements if 'FROM article' in statement]) == 1
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.content for response in responses}) == 1
@@ -1,4 +1,5 @@
 import json
+import time
 import pytest
 
 pytest_plugins = "pytester"  # Include pytest plugin for running tests within pytest itself
@@ -56,3 +57,265 @@ def test_login(client):
     # Convert the response data from JSON and assert that the access token is present
     data = json.loads(response.data)
     assert "access_token" in data
+
+
+# Test concurrent registrations of the same email
+def test_register_concurrently(app):
+    """
+    Test case for parallel registrations of one email, racing between the existence check and the insert.
+
+    Asserts:
+    - Exactly one registration succeeds; the others get a 409 instead of a server error.
+    """
+    import threading
+
+    count = 8
+    barrier = threading.Barrier(count)
+    statuses = [None] * count
+
+    def register(index):
+        client = app.test_client()
+        barrier.wait()
+        statuses[index] = client.post('/auth/register', json={
+            "email": "racer@example.com",
+            "password": "testpassword"
+        }).status_code
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(statuses) == [201] + [409] * (count - 1)
+
+
+# Test that logins are shed when the hashing pool does not keep up
+def test_login_hasher_timeout(app, client):
+    """
+    Test case for a login whose password check does not get a hashing thread in time.
+
+    Steps:
+    1. Keep every thread of a hasher with a short timeout busy, then log in.
+
+    Asserts:
+    - The login is answered with a 503 and a Retry-After header instead of an error.
+    """
+    from app.passwords import PasswordHasher
+
+    client.post('/auth/register', json={"email": "slowhash@example.com", "password": "testpassword"})
+    default = app.extensions['password_hasher']
+    app.extensions['password_hasher'] = hasher = PasswordHasher(default.method, workers=1, timeout=0.05)
+    try:
+        hasher._executor.submit(time.sleep, 0.5)
+        response = client.post('/auth/login', json={"email": "slowhash@example.com", "password": "testpassword"})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+    finally:
+        hasher.shutdown()
+        app.extensions['password_hasher'] = default
+
+
+# Test refresh token rotation
+def test_refresh_token_rotation(client):
+    """
+    Test case for exchanging a refresh token for a new token pair.
+
+    Steps:
+    1. Log in as the user registered in `test_login` to get a refresh token.
+    2. Use the refresh token once, then try to use it again.
+
+    Asserts:
+    - The first refresh returns a new access token and a different refresh token.
+    - Reusing the refresh token is rejected with a 401.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "testuser@example.com",
+        "password": "testpassword"
+    })
+    refresh_token = login_response.json["refresh_token"]
+
+    response = client.post('/auth/refresh', headers={"Authorization": f"Bearer {refresh_token}"})
+    assert response.status_code == 200
+    assert "access_token" in response.json
+    assert response.json["refresh_token"] != refresh_token
+
+    response = client.post('/auth/refresh', headers={"Authorization": f"Bearer {refresh_token}"})
+    assert response.status_code == 401
+
+
+# Test that unknown emails are rejected from the negative lookup cache
+def test_login_unknown_email(app, client, assert_max_queries, monkeypatch):
+    """
+    Test case for the negative lookup cache of the login route.
+
+    Steps:
+    1. Log in with an unregistered email twice.
+    2. Register that email and log in again.
+
+    Asserts:
+    - Both failed logins return a 401, the second one without any database query.
+    - The first failed login checks the password against the dummy hash, like a wrong
+      password would; the cached one does not.
+    - Registering the email clears the cache so the login then succeeds.
+    """
+    hasher = app.extensions['password_hasher']
+    verified = []
+    verify = hasher.verify
+
+    def recording_verify(pwhash, password):
+        verified.append(pwhash)
+        return verify(pwhash, password)
+
+    monkeypatch.setattr(hasher, 'verify', recording_verify)
+
+    credentials = {"email": "nobody@example.com", "password": "whatever"}
+    assert client.post('/auth/login', json=credentials).status_code == 401
+    assert verified == [hasher._dummy_hash]
+    with assert_max_queries(0):
+        assert client.post('/auth/login', json=credentials).status_code == 401
+    assert len(verified) == 1
+
+    client.post('/auth/register', json=credentials)
+    assert client.post('/auth/login', json=credentials).status_code == 200
+
+
+# Test the per-address rate limits of the hashing routes
+def test_auth_rate_limits(app, client, monkeypatch):
+    """
+    Test case for the rate limits of `POST /auth/login` and `POST /auth/register`.
+
+    Steps:
+    1. Lower both limits to 2 requests, then exceed them from one client address.
+
+    Asserts:
+    - Requests beyond the limit get a 429 with Retry-After, before any password is hashed.
+    - Each route has its own limit, and other client addresses are not affected.
+    """
+    monkeypatch.setitem(app.config, 'AUTH_LOGIN_RATE_LIMIT', 2)
+    monkeypatch.setitem(app.config, 'AUTH_REGISTER_RATE_LIMIT', 2)
+    flooder = {'REMOTE_ADDR': '203.0.113.7'}
+    credentials = {"email": "flood@example.com", "password": "whatever"}
+
+    for _ in range(2):
+        assert client.post('/auth/login', json=credentials, environ_base=flooder).status_code == 401
+    response = client.post('/auth/login', json=credentials, environ_base=flooder)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+    assert client.post('/auth/register', json=credentials, environ_base=flooder).status_code == 201
+    assert client.post('/auth/register', json=credentials, environ_base=flooder).status_code == 409
+    assert client.post('/auth/register', json=credentials, environ_base=flooder).status_code == 429
+
+    response = client.post('/auth/login', json=credentials, environ_base={'REMOTE_ADDR': '203.0.113.8'})
+    assert response.status_code == 200
+
+
+# Test that outdated password hashes are upgraded on login
+def test_login_rehashes_outdated_hash(app, client):
+    """
+    Test case for the transparent rehash of password hashes created with an outdated method or cost.
+
+    Steps:
+    1. Create a user whose password was hashed with a cheap pbkdf2 setting.
+    2. Log in with that password.
+
+    Asserts:
+    - The login succeeds against the stored hash.
+    - The stored hash is upgraded to the configured method in the background.
+    """
+    from werkzeug.security import generate_password_hash
+    from app import db
+    from app.models import User
+    from app.passwords import get_password_hasher
+
+    with app.app_context():
+        db.session.add(User(email="legacy@example.com", password=generate_password_hash("legacypass", "pbkdf2:sha256:1000")))
+        db.session.commit()
+        configured_method = get_password_hasher().method
+
+    response = client.post('/auth/login', json={"email": "legacy@example.com", "password": "legacypass"})
+    assert response.status_code == 200
+
+    deadline = time.monotonic() + 10
+    while True:
+        with app.app_context():
+            stored_hash = db.session.scalar(db.select(User.password).filter_by(email="legacy@example.com"))
+        if stored_hash.startswith(configured_method + '$') or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert stored_hash.split('$', 1)[0] == configured_method
+
+    response = client.post('/auth/login', json={"email": "legacy@example.com", "password": "legacypass"})
+    assert response.status_code == 200
+
+
+# Test the hashing calibration command
+def test_calibrate_hash_command(runner):
+    """
+    Test case for the `flask auth calibrate-hash` command.
+
+    Asserts:
+    - The command prints a pbkdf2 method with at least the minimum iteration count.
+    """
+    result = runner.invoke(args=['auth', 'calibrate-hash', '--algorithm', 'pbkdf2', '--budget-ms', '1'])
+    assert result.exit_code == 0
+    method = result.output.strip().splitlines()[-1].split('=', 1)[1]
+    assert method.startswith('pbkdf2:sha256:')
+    assert int(method.rsplit(':', 1)[1]) >= 100000
+
+
+# Test seeding admins from the command line
+def test_create_admin_command(app, client, runner):
+    """
+    Test case for the `flask auth create-admin` command.
+
+    Asserts:
+    - Registrations only bootstrap an admin when `BOOTSTRAP_FIRST_ADMIN` is enabled.
+    - The command creates an admin who can log in, and promotes an existing user.
+    """
+    from app import db
+    from app.models import User
+
+    app.config['BOOTSTRAP_FIRST_ADMIN'] = False
+    try:
+        client.post('/auth/register', json={"email": "plain@example.com", "password": "plainpass"})
+    finally:
+        app.config['BOOTSTRAP_FIRST_ADMIN'] = True
+
+    result = runner.invoke(args=['auth', 'create-admin', 'seeded@example.com', '--password', 'seededpass'])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(args=['auth', 'create-admin', 'plain@example.com', '--password', 'unused'])
+    assert result.output.strip() == "Promoted plain@example.com to admin"
+
+    with app.app_context():
+        roles = dict(db.session.execute(db.select(User.email, User.role).where(
+            User.email.in_(['seeded@example.com', 'plain@example.com']))).all())
+    assert roles == {"seeded@example.com": "admin", "plain@example.com": "admin"}
+    assert client.post('/auth/login', json={"email": "seeded@example.com", "password": "seededpass"}).status_code == 200
+
+
+# Test that logging out revokes the access and refresh tokens
+def test_logout_revokes_tokens(client):
+    """
+    Test case for the logout route.
+
+    Steps:
+    1. Log in as the user registered in `test_login`, then log out with both tokens.
+    2. Use the access token and the refresh token again.
+
+    Asserts:
+    - The logout succeeds.
+    - Both tokens are rejected afterwards with a 401.
+    """
+    tokens = client.post('/auth/login', json={
+        "email": "testuser@example.com",
+        "password": "testpassword"
+    }).json
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post('/auth/logout', json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 200
+
+    assert client.get('/user/profile/testuser@example.com', headers=headers).status_code == 401
+    response = client.post('/auth/refresh', headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
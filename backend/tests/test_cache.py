@@ -0,0 +1,275 @@
+import json
+import threading
+import time
+
+import fakeredis
+
+from app.cache import HOT_KEY, LocalTTLCache, ReadThroughCache
+from app.cache_stats import CacheStats
+from app.profile_cache import ProfileCache
+from app.pubsub import PubSubListener
+
+
+def run_concurrently(target, count):
+    """
+    Runs `target` in `count` threads released at the same time and returns their results.
+    """
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def make_builder(calls, value):
+    """
+    Returns a slow builder that records how many times it ran (i.e. how many DB queries were made).
+    """
+    lock = threading.Lock()
+
+    def build():
+        with lock:
+            calls.append(1)
+        time.sleep(0.2)  # Simulate a slow database query
+        return value
+    return build
+
+
+# Test that a cold miss after a write costs a single rebuild under concurrency
+def test_cold_miss_single_flight():
+    """
+    Test case for the single-flight rebuild of the read-through cache.
+
+    Steps:
+    1. Warm an entry, then bump its namespace as a writer would.
+    2. Request the entry from 20 threads at the same time.
+
+    Asserts:
+    - The builder ran exactly once after the write.
+    - Every reader received the rebuilt value.
+    """
+    cache = ReadThroughCache(fakeredis.FakeRedis(), ttl=60, stale_ttl=60)
+    calls = []
+    cache.get_or_build('articles', 'all', make_builder(calls, ["old"]))
+
+    cache.bump('articles')
+    calls.clear()
+    results = run_concurrently(lambda: cache.get_or_build('articles', 'all', make_builder(calls, ["new"])), 20)
+
+    assert len(calls) == 1
+    assert all(json.loads(result) == ["new"] for result in results)
+
+
+# Test that stale entries are served while a single request refreshes them
+def test_stale_while_revalidate():
+    """
+    Test case for the stale-while-revalidate window of the read-through cache.
+
+    Steps:
+    1. Cache an entry with a 1 second freshness and let it go stale.
+    2. Request the entry from 20 threads at the same time.
+
+    Asserts:
+    - The builder ran exactly once.
+    - Readers that did not rebuild received the stale value instead of waiting.
+    """
+    cache = ReadThroughCache(fakeredis.FakeRedis(), ttl=1, stale_ttl=60)
+    calls = []
+    cache.get_or_build('articles', 'all', make_builder(calls, ["old"]))
+    time.sleep(1.1)
+
+    calls.clear()
+    results = [json.loads(result) for result in
+               run_concurrently(lambda: cache.get_or_build('articles', 'all', make_builder(calls, ["new"])), 20)]
+
+    assert len(calls) == 1
+    assert results.count(["new"]) == 1
+    assert results.count(["old"]) == 19
+
+
+# Test the eviction and expiry of the in-process cache tier
+def test_local_ttl_cache():
+    """
+    Test case for the bounded in-process cache.
+
+    Asserts:
+    - The least recently used entry is evicted beyond `maxsize`.
+    - Entries expire after `ttl` seconds.
+    """
+    cache = LocalTTLCache(maxsize=2, ttl=0.2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    time.sleep(0.25)
+    assert cache.get('a') is None
+
+
+# Test that profile invalidations reach the in-process tier of other workers
+def test_profile_cache_invalidation_across_workers():
+    """
+    Test case for the pub/sub invalidation of the two-tier profile cache.
+
+    Steps:
+    1. Cache a profile in one worker and read it into the local tier of a second worker.
+    2. Invalidate the profile from the first worker.
+
+    Asserts:
+    - The second worker serves the profile from memory before the invalidation.
+    - Both tiers of both workers drop the profile after the invalidation.
+    """
+    server = fakeredis.FakeServer()
+    workers = []
+    for _ in range(2):
+        redis_client = fakeredis.FakeRedis(server=server)
+        listener = PubSubListener(redis_client)
+        workers.append((ProfileCache(redis_client, listener, local_ttl=60), listener))
+    (first, first_listener), (second, second_listener) = workers
+    try:
+        for listener in (first_listener, second_listener):
+            listener.start()
+            assert listener.wait_connected(5)
+
+        first.set('a@example.com', b'{"role":"user"}', 0)
+        assert second.get('a@example.com').body == b'{"role":"user"}'
+        assert second.local.get('a@example.com').body == b'{"role":"user"}'
+
+        first.invalidate({'a@example.com': 1})
+        deadline = time.monotonic() + 5
+        while second.local.get('a@example.com') is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert second.get('a@example.com') is None
+        assert first.get('a@example.com') is None
+    finally:
+        first_listener.stop()
+        second_listener.stop()
+
+
+# Test that a rebuild racing a role change cannot cache the previous role
+def test_profile_rebuild_racing_invalidation():
+    """
+    Test case for a profile built before a role change committed and stored after its invalidation.
+
+    Asserts:
+    - The stale profile is returned to its reader but cached in neither tier.
+    - A profile built from the new role version is cached again.
+    """
+    redis_client = fakeredis.FakeRedis()
+    listener = PubSubListener(redis_client)
+    profiles = ProfileCache(redis_client, listener, local_ttl=60)
+
+    def build_during_role_change():
+        # The user is read with role version 0, then the promotion to version 1 commits
+        profiles.invalidate({'a@example.com': 1})
+        return b'{"role":"user"}', 0
+
+    try:
+        assert profiles.get_or_build('a@example.com', build_during_role_change).body == b'{"role":"user"}'
+        assert profiles.get('a@example.com') is None
+
+        profiles.get_or_build('a@example.com', lambda: (b'{"role":"admin"}', 1))
+        assert redis_client.get('profile:a@example.com') == b'{"role":"admin"}'
+        assert profiles.local.get('a@example.com').body == b'{"role":"admin"}'
+    finally:
+        listener.stop()
+
+
+# Test that reads are counted in batches and size the TTL of rebuilt entries
+def test_adaptive_ttl():
+    """
+    Test case for the batched read counts, adaptive TTLs and outcome counters.
+
+    Steps:
+    1. Read a tracked entry 5 times, then flush the buffered counts.
+    2. Bump its namespace and read it again.
+
+    Asserts:
+    - Reads reach Redis only when flushed, as one count per entry.
+    - A rebuilt entry is fresh for `min_ttl` seconds plus as much again per recent read.
+    - Hits and misses are counted per family.
+    """
+    redis_client = fakeredis.FakeRedis()
+    stats = CacheStats(redis_client, min_ttl=10, max_ttl=100, flush_interval=3600)
+    cache = ReadThroughCache(redis_client, stats=stats)
+    for _ in range(5):
+        cache.get_entry('article:1', 'detail', lambda: {"id": 1}, track=('articles', 1))
+
+    assert redis_client.zscore(HOT_KEY.format(family='articles'), '1') is None
+    stats.flush()
+    assert redis_client.zscore(HOT_KEY.format(family='articles'), '1') == 5
+
+    cache.bump('article:1')
+    cache.get_entry('article:1', 'detail', lambda: {"id": 1}, track=('articles', 1))
+    entry_key = cache.entry_key('article:1', 'detail')
+    assert float(redis_client.hget(entry_key, 'ttl')) == 60
+    assert 50 < redis_client.ttl(entry_key) - cache.stale_ttl <= 60
+
+    assert stats.totals()['articles'] == {"hits": 4, "stale": 0, "misses": 2, "refreshes": 0}
+
+
+# Test that read counts are aged and trimmed as they are flushed
+def test_read_counts_decay_on_flush():
+    """
+    Test case for the decay of the read counts.
+
+    Steps:
+    1. Count a read on top of existing counts and flush, twice.
+
+    Asserts:
+    - Counts are halved and trimmed to the `max_tracked` most read members before a flush
+      adds its reads, at most once per decay interval.
+    """
+    redis_client = fakeredis.FakeRedis()
+    stats = CacheStats(redis_client, flush_interval=3600, decay_interval=3600, max_tracked=2)
+    key = HOT_KEY.format(family='articles')
+    redis_client.zadd(key, {'a': 8, 'b': 4, 'c': 2, 'd': 1})
+
+    for expected in ({b'a': 4, b'b': 2, b'c': 1}, {b'a': 4, b'b': 2, b'c': 2}):
+        pipe = redis_client.pipeline(transaction=False)
+        stats.queue_read(pipe, 'articles', 'c')
+        pipe.execute()
+        stats.flush()
+        assert dict(redis_client.zrange(key, 0, -1, withscores=True)) == expected
+
+
+# Test that hot entries are refreshed in the background before going stale
+def test_refresh_ahead():
+    """
+    Test case for refreshing hot entries ahead of their expiry.
+
+    Steps:
+    1. Cache a hot entry (fresh for 2 seconds) and a cold one, then read them within the
+       last 90% of their freshness.
+
+    Asserts:
+    - The reader gets the current entry at once, while the entry is rebuilt in the background.
+    - Cold entries are not refreshed ahead.
+    """
+    redis_client = fakeredis.FakeRedis()
+    stats = CacheStats(redis_client, min_ttl=1, max_ttl=2, flush_interval=3600)
+    cache = ReadThroughCache(redis_client, stats=stats, refresh_ahead=0.9, refresh_min_reads=3)
+    redis_client.zincrby(HOT_KEY.format(family='articles'), 5, 'hot')
+    calls = []
+    for member in ('hot', 'cold'):
+        cache.get_entry('articles', member, make_builder(calls, ["old"]), track=('articles', member))
+    time.sleep(0.3)
+
+    calls.clear()
+    for member in ('hot', 'cold'):
+        entry = cache.get_entry('articles', member, make_builder(calls, ["new"]), track=('articles', member))
+        assert json.loads(entry.body) == ["old"]
+    cache.shutdown(wait=True)
+
+    assert len(calls) == 1
+    assert json.loads(cache.get_or_build('articles', 'hot', make_builder(calls, ["newer"]))) == ["new"]
+    assert stats.totals()['articles']["refreshes"] == 1
@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import pytest
+from flask import current_app
+from sqlalchemy import select, text
+from werkzeug.datastructures import MultiDict
+
+from app import db
+from app.models import Article
+from app.routes.admin_routes import parse_user_filters, user_page_query
+from app.routes.article_routes import (
+    ARTICLE_FIELDS, article_page_query, article_search_query, encode_cursor, parse_page_args
+)
+
+
+def explain(query):
+    """
+    Returns the Postgres query plan of a query as text.
+
+    Sequential scans are disabled for the transaction: the test tables are tiny, so the
+    planner would otherwise never pick an index even when a suitable one exists.
+    """
+    statement = query.compile(db.engine)
+    db.session.execute(text("SET LOCAL enable_seqscan = off"))
+    # The driver inlines the parameters, so the plan is the one of the actual values
+    plan = db.session.connection().exec_driver_sql(f"EXPLAIN {statement}", statement.params).scalars().all()
+    db.session.rollback()
+    return "\n".join(plan)
+
+
+def page_query(args):
+    """
+    Returns the query `GET /articles` runs for the given query parameters.
+    """
+    limit, fields, _, position = parse_page_args(MultiDict(args), current_app.config)
+    return article_page_query(fields, position, limit)
+
+
+def user_listing_query(args, cursor=None):
+    """
+    Returns the query `GET /admin/users` runs for the given query parameters.
+    """
+    return user_page_query(parse_user_filters(MultiDict(args)), cursor, current_app.config['USERS_PAGE_SIZE'])
+
+
+@pytest.mark.parametrize("build_query, index", [
+    # GET /articles: first page and following pages of the keyset pagination
+    (lambda: page_query({}), 'ix_article_created_at_id'),
+    (lambda: page_query({'cursor': encode_cursor(Article(id=10, created_at=datetime.utcnow()))}),
+     'ix_article_created_at_id'),
+    # GET /articles/search: first page and following pages
+    (lambda: article_search_query('zeppelin', ARTICLE_FIELDS, None, 20), 'ix_article_search_vector'),
+    (lambda: article_search_query('zeppelin', ARTICLE_FIELDS, (0.1, 10), 20), 'ix_article_search_vector'),
+    # Articles of an author (foreign key lookups, deleting users)
+    (lambda: select(Article).where(Article.author_id == 1), 'ix_article_author_id'),
+    # GET /admin/users filtered by role, on a following page
+    (lambda: user_listing_query({'role': 'editor'}, cursor=0), 'ix_users_role_id'),
+    # GET /admin/users filtered by email prefix
+    (lambda: user_listing_query({'email_prefix': 'team-'}), 'ix_users_email_pattern'),
+])
+def test_hot_queries_use_indexes(app, build_query, index):
+    """
+    Test case checking that the main endpoint queries, built by the routes' own query
+    builders, are served by their indexes.
+
+    Asserts:
+    - The EXPLAIN plan of each query references the expected index.
+    """
+    with app.app_context():
+        plan = explain(build_query())
+    assert index in plan, plan
@@ -0,0 +1,101 @@
+import time
+
+import fakeredis
+from flask import Flask
+
+from app.rate_limit import RateLimiter, get_identity
+from app.serving import init_proxy_fix
+
+
+# Test the sliding log algorithm
+def test_sliding_log_limit():
+    """
+    Test case for the sliding log rate limit algorithm.
+
+    Steps:
+    1. Send three requests against a limit of two per second, then wait for the window to pass.
+
+    Asserts:
+    - The first two requests are allowed with decreasing remaining quota.
+    - The third request is denied with a reset time within the window.
+    - Requests are allowed again once the window has passed.
+    """
+    limiter = RateLimiter(fakeredis.FakeRedis(), prefilter_size=0)
+
+    first = limiter.hit('rl:test', 2, 1)
+    second = limiter.hit('rl:test', 2, 1)
+    third = limiter.hit('rl:test', 2, 1)
+
+    assert (first.allowed, first.remaining) == (True, 1)
+    assert (second.allowed, second.remaining) == (True, 0)
+    assert not third.allowed
+    assert 0 < third.reset <= 1
+
+    time.sleep(1.05)
+    assert limiter.hit('rl:test', 2, 1).allowed
+
+
+# Test the token bucket algorithm
+def test_token_bucket_refill():
+    """
+    Test case for the token bucket rate limit algorithm.
+
+    Steps:
+    1. Drain a bucket of two tokens refilling over one second.
+    2. Wait for one token to be refilled.
+
+    Asserts:
+    - The bucket allows a burst of two requests, then denies.
+    - After half the period one more request is allowed.
+    """
+    limiter = RateLimiter(fakeredis.FakeRedis(), prefilter_size=0)
+
+    assert limiter.hit('rl:bucket', 2, 1, 'token_bucket').allowed
+    assert limiter.hit('rl:bucket', 2, 1, 'token_bucket').allowed
+    assert not limiter.hit('rl:bucket', 2, 1, 'token_bucket').allowed
+
+    time.sleep(0.55)
+    assert limiter.hit('rl:bucket', 2, 1, 'token_bucket').allowed
+
+
+# Test that the in-process pre-filter sheds denied clients without calling Redis
+def test_prefilter_skips_redis():
+    """
+    Test case for the in-process pre-filter of the rate limiter.
+
+    Steps:
+    1. Exceed a limit of one request per minute.
+    2. Flush Redis, then send another request for the same key.
+
+    Asserts:
+    - The request is still denied, so the decision was made in process.
+    """
+    redis_client = fakeredis.FakeRedis()
+    limiter = RateLimiter(redis_client)
+
+    limiter.hit('rl:prefilter', 1, 60)
+    assert not limiter.hit('rl:prefilter', 1, 60).allowed
+
+    redis_client.flushall()
+    assert not limiter.hit('rl:prefilter', 1, 60).allowed
+
+
+# Test that clients behind a trusted proxy are identified by their own address
+def test_identity_behind_proxy():
+    """
+    Test case for the client address used by per-address rate limits behind a reverse proxy.
+
+    Asserts:
+    - Without trusted proxies, the forwarded header is ignored.
+    - With one trusted proxy, the address it appended is used, and values the client
+      prepended to spoof its address are ignored.
+    """
+    for trusted, expected in ((0, 'ip:10.0.0.1'), (1, 'ip:198.51.100.7')):
+        app = Flask(__name__)
+        app.config.update(PROXY_FIX_X_FOR=trusted, PROXY_FIX_X_PROTO=0)
+        init_proxy_fix(app)
+        app.add_url_rule('/identity', 'identity', lambda: get_identity('ip'))
+
+        response = app.test_client().get('/identity', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                                         headers={'X-Forwarded-For': '203.0.113.1, 198.51.100.7'})
+        assert response.get_data(as_text=True) == expected
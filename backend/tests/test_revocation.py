@@ -0,0 +1,129 @@
+import time
+
+import fakeredis
+
+from app.pubsub import PubSubListener
+from app.revocation import BloomFilter, TokenBlocklist
+
+
+def make_worker(server):
+    """
+    Returns the blocklist of a simulated worker process connected to a shared Redis server.
+    """
+    redis_client = fakeredis.FakeRedis(server=server)
+    listener = PubSubListener(redis_client, reconnect_delay=0.05)
+    return TokenBlocklist(redis_client, listener, capacity=1000, error_rate=0.01), listener
+
+
+def wait_for(condition, timeout=5):
+    """
+    Polls `condition` until it holds or the timeout expires.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+# Test the Bloom filter membership guarantees
+def test_bloom_filter():
+    """
+    Test case for the Bloom filter fronting the blocklist.
+
+    Asserts:
+    - Every added key is reported present.
+    - The false positive rate at capacity stays close to the configured rate.
+    """
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti:{i}")
+
+    assert all(f"jti:{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other:{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+# Test that revocations reach the other workers and that valid tokens are checked in process
+def test_revocation_syncs_across_workers():
+    """
+    Test case for the pub/sub synchronisation of the token blocklist.
+
+    Steps:
+    1. Start two workers sharing a Redis server, one revoking an entry before the other starts.
+    2. Revoke a second entry once both are running.
+
+    Asserts:
+    - Both entries are revoked in both workers.
+    - Checking an entry that was never revoked makes no Redis call.
+    """
+    server = fakeredis.FakeServer()
+    first, first_listener = make_worker(server)
+    first.revoke(['jti:before'], 60)
+
+    second, second_listener = make_worker(server)
+    try:
+        for listener in (first_listener, second_listener):
+            listener.start()
+            assert listener.wait_connected(5)
+
+        first.revoke(['jti:after'], 60)
+        assert wait_for(lambda: 'jti:after' in second._bloom)
+
+        for blocklist in (first, second):
+            assert blocklist.is_revoked('jti:before')
+            assert blocklist.is_revoked('jti:after')
+
+        second.redis = None  # Any Redis call would now fail
+        assert not second.is_revoked('jti:valid')
+    finally:
+        first_listener.stop()
+        second_listener.stop()
+
+
+# Test that revoked entries expire with the tokens
+def test_revocation_expires():
+    """
+    Test case for the expiry of revoked entries.
+
+    Asserts:
+    - An entry is no longer revoked once its TTL has passed, although the Bloom filter still contains it.
+    """
+    blocklist, listener = make_worker(fakeredis.FakeServer())
+    listener.start()
+    try:
+        assert listener.wait_connected(5)
+        blocklist.revoke(['jti:short'], 1)
+        assert blocklist.is_revoked('jti:short')
+
+        time.sleep(1.1)
+        assert 'jti:short' in blocklist._bloom
+        assert not blocklist.is_revoked('jti:short')
+    finally:
+        listener.stop()
+
+
+# Test that entries revoked while the filter is rebuilt are kept
+def test_reload_keeps_concurrent_revocations():
+    """
+    Test case for revocations arriving while the Bloom filter is rebuilt from Redis.
+
+    Steps:
+    1. Rebuild the filter, delivering a revocation from another worker in the middle of the scan.
+
+    Asserts:
+    - The rebuilt filter contains both the scanned entry and the one delivered during the scan.
+    """
+    blocklist, listener = make_worker(fakeredis.FakeServer())
+    blocklist.reload()
+    blocklist.redis.set('revoked:jti:scanned', 1, ex=60)
+    scan_iter = blocklist.redis.scan_iter
+
+    def scan_with_revocation(*args, **kwargs):
+        for key in scan_iter(*args, **kwargs):
+            blocklist._on_revoked(b'jti:during')
+            yield key
+
+    blocklist.redis.scan_iter = scan_with_revocation
+    blocklist.reload()
+    assert 'jti:scanned' in blocklist._bloom
+    assert 'jti:during' in blocklist._bloom
@@ -0,0 +1,51 @@
+import os
+
+from sqlalchemy import text
+
+from app import db
+from app.passwords import get_password_hasher
+from app.redis_client import get_redis_client
+from app.serving import reset_after_fork
+
+
+# Test that forked workers get their own connections
+def test_reset_after_fork(app):
+    """
+    Test case for `reset_after_fork`, as run by gunicorn in every worker of a preloaded app.
+
+    Steps:
+    1. Use the database and Redis pools, then fork.
+    2. In the child, reset the pools and use them (and the password hasher) again.
+    3. Use the pools in the parent.
+
+    Asserts:
+    - The child starts without any of the parent's connections and can query both services.
+    - The parent's connections are left open by the child.
+    """
+    with app.app_context():
+        assert db.session.execute(text('SELECT 1')).scalar() == 1
+        db.session.remove()
+        assert get_redis_client().ping()
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            reset_after_fork(app)
+            with app.app_context():
+                assert db.engine.pool.checkedin() == 0
+                assert get_redis_client().connection_pool.stats()['open'] == 0
+                assert db.session.execute(text('SELECT 1')).scalar() == 1
+                assert get_redis_client().ping()
+                hasher = get_password_hasher()
+                assert hasher.verify(hasher.hash('password'), 'password')
+            status = 0
+        finally:
+            os._exit(status)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    with app.app_context():
+        assert db.session.execute(text('SELECT 1')).scalar() == 1
+        assert get_redis_client().ping()
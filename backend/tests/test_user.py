@@ -39,3 +39,57 @@ def test_get_profile(client):
 
     # Assert that the profile contains the correct email
     assert b'profileuser@example.com' in response.data
+
+
+# Test that a role change invalidates the cached profile
+def test_profile_invalidated_on_role_change(client):
+    """
+    Test case for the invalidation of cached profiles.
+
+    Steps:
+    1. Register a second user and fetch their (now cached) profile as the admin registered in `test_get_profile`.
+    2. Promote the user to 'editor' and fetch the profile again.
+
+    Asserts:
+    - The profile reflects the new role instead of the cached one.
+    """
+    client.post('/auth/register', json={"email": "cacheduser@example.com", "password": "testpassword"})
+    login_response = client.post('/auth/login', json={
+        "email": "profileuser@example.com",
+        "password": "testpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+
+    response = client.get('/user/profile/cacheduser@example.com', headers=headers)
+    assert json.loads(response.data)["role"] == "user"
+
+    client.post('/admin/promote', json={"email": "cacheduser@example.com", "role": "editor"}, headers=headers)
+
+    response = client.get('/user/profile/cacheduser@example.com', headers=headers)
+    assert json.loads(response.data)["role"] == "editor"
+
+
+# Test conditional GETs of a profile
+def test_get_profile_conditional(client):
+    """
+    Test case for the ETag of profile reads.
+
+    Asserts:
+    - A profile request with the ETag of the previous response gets an empty 304.
+    - A different ETag gets the full profile.
+    """
+    login_response = client.post('/auth/login', json={
+        "email": "profileuser@example.com",
+        "password": "testpassword"
+    })
+    headers = {"Authorization": f"Bearer {json.loads(login_response.data)['access_token']}"}
+
+    response = client.get('/user/profile/profileuser@example.com', headers=headers)
+    etag = response.headers['ETag']
+
+    response = client.get('/user/profile/profileuser@example.com', headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert response.data == b''
+
+    response = client.get('/user/profile/profileuser@example.com', headers=dict(headers, **{"If-None-Match": '"other"'}))
+    assert response.status_code == 200
@@ -0,0 +1,127 @@
+import json
+
+from app.cache import HOT_KEY
+from app.redis_client import get_redis_client
+from app.warmup import StartupWarmup
+
+
+def login(client, email):
+    client.post('/auth/register', json={"email": email, "password": "testpassword"})
+    response = client.post('/auth/login', json={"email": email, "password": "testpassword"})
+    return {"Authorization": f"Bearer {json.loads(response.data)['access_token']}"}
+
+
+# Test that reads are counted for warm-up ranking
+def test_reads_are_counted(app, client):
+    """
+    Test case for the read counts of articles, article pages and profiles.
+
+    Asserts:
+    - Once flushed, every article and page read has incremented its count; profile reads
+      missing the worker's tier are counted too.
+    """
+    headers = login(client, "warmadmin@example.com")
+    article_id = client.post('/articles', json={"title": "Hot", "content": "Hot"}, headers=headers).json['id']
+    for _ in range(3):
+        client.get(f'/articles/{article_id}')
+    client.get('/articles?limit=5')
+    client.get('/user/profile/warmadmin@example.com', headers=headers)
+
+    app.extensions['cache_stats'].flush()
+    with app.app_context():
+        redis_client = get_redis_client()
+        assert redis_client.zscore(HOT_KEY.format(family='articles'), str(article_id)) == 3
+        assert redis_client.zscore(HOT_KEY.format(family='article_pages'), 'page:first:5:' + ','.join(
+            ('id', 'title', 'content', 'author', 'created_at'))) == 1
+        assert redis_client.zscore(HOT_KEY.format(family='profiles'), 'warmadmin@example.com') == 1
+
+
+# Test the warm-up command
+def test_warm_command(app, client, runner, assert_max_queries):
+    """
+    Test case for `flask cache warm`.
+
+    Steps:
+    1. Read an article and a profile, flush the read counts, then drop every cache entry.
+    2. Run the warm-up command, then read them again.
+
+    Asserts:
+    - The warm-up reports the rebuilt entries, and a second run finds them cached.
+    - After the warm-up the first page, the article and the profile are served without any query.
+    """
+    headers = login(client, "warmadmin@example.com")
+    article_id = client.post('/articles', json={"title": "Warm", "content": "Warm"}, headers=headers).json['id']
+    client.get(f'/articles/{article_id}')
+    client.get('/user/profile/warmadmin@example.com', headers=headers)
+    app.extensions['cache_stats'].flush()
+
+    with app.app_context():
+        redis_client = get_redis_client()
+        for key in redis_client.scan_iter(match='article*'):
+            redis_client.delete(key)
+        redis_client.delete('profile:warmadmin@example.com')
+    app.extensions['profile_cache'].local.clear()
+
+    result = runner.invoke(args=['cache', 'warm'])
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+    assert report["complete"] is True
+    assert report["pages"] >= 1 and report["articles"] >= 1 and report["profiles"] == 1
+
+    report = json.loads(runner.invoke(args=['cache', 'warm']).output)
+    assert report["pages"] == report["articles"] == report["profiles"] == 0
+
+    with assert_max_queries(0):
+        assert client.get('/articles').status_code == 200
+        assert client.get(f'/articles/{article_id}').json['title'] == "Warm"
+        assert client.get('/user/profile/warmadmin@example.com', headers=headers).status_code == 200
+
+
+# Test the readiness probe
+def test_readyz(app, client):
+    """
+    Test case for `GET /readyz` with and without a startup warm-up.
+
+    Asserts:
+    - Without warm-up the worker is ready at once.
+    - With warm-up, the first request starts it and the worker is ready once it is done.
+    """
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.json["status"] == "ready"
+
+    default = app.extensions['warmup']
+    app.extensions['warmup'] = warmup = StartupWarmup(app, enabled=True, deadline=10)
+    try:
+        client.get('/readyz')
+        assert warmup.wait(timeout=10)
+        response = client.get('/readyz')
+        assert response.status_code == 200
+        assert response.json["warmup"]["complete"] is True
+    finally:
+        app.extensions['warmup'] = default
+
+
+# Test that the readiness probe holds traffic back while warming
+def test_readyz_while_warming(app, client):
+    """
+    Test case for `GET /readyz` while another worker holds the warm-up lock.
+
+    Asserts:
+    - The worker reports "warming" until the lock is released.
+    """
+    default = app.extensions['warmup']
+    app.extensions['warmup'] = warmup = StartupWarmup(app, enabled=True, deadline=10)
+    with app.app_context():
+        get_redis_client().set('warmup:lock', 'other', ex=10)
+    try:
+        response = client.get('/readyz')
+        assert response.status_code == 503
+        assert response.json["status"] == "warming"
+
+        with app.app_context():
+            get_redis_client().delete('warmup:lock')
+        assert warmup.wait(timeout=5)
+        assert client.get('/readyz').status_code == 200
+    finally:
+        app.extensions['warmup'] = default